@@ -0,0 +1,65 @@
+"""Cold-start vs. warm-daemon latency for `mrs get` and `pipelines list`.
+
+Usage: python benchmarks/daemon_latency.py [--runs N] [--latency SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_gitlab import MockGitLab
+
+COMMANDS = {
+    "mrs get": ["--json", "-p", "g/p", "mrs", "get", "1"],
+    "pipelines list": ["--json", "-p", "g/p", "pipelines", "list"],
+}
+
+
+def _time_runs(argv: list[str], env: dict[str, str], runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "qodev_gitlab_cli", *argv], env=env, check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server latency per request")
+    args = parser.parse_args()
+
+    with MockGitLab(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "GITLAB_TOKEN": "bench", "GITLAB_URL": server.url}
+        env["QODEV_GITLAB_SOCKET"] = os.path.join(tmp, "daemon.sock")
+
+        cold = {
+            name: _time_runs(argv, {**env, "QODEV_GITLAB_NO_DAEMON": "1"}, args.runs) for name, argv in COMMANDS.items()
+        }
+
+        subprocess.run(
+            [sys.executable, "-m", "qodev_gitlab_cli", "daemon", "start", "--detach"],
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+        try:
+            warm = {name: _time_runs(argv, env, args.runs) for name, argv in COMMANDS.items()}
+        finally:
+            subprocess.run([sys.executable, "-m", "qodev_gitlab_cli", "daemon", "stop"], env=env, capture_output=True)
+
+    print(f"{'command':<16} {'cold p50 ms':>12} {'warm p50 ms':>12} {'speedup':>8}")
+    for name in COMMANDS:
+        c, w = statistics.median(cold[name]), statistics.median(warm[name])
+        print(f"{name:<16} {c:>12.1f} {w:>12.1f} {c / w:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
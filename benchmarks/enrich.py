@@ -0,0 +1,54 @@
+"""Requests needed for an enriched MR triage view: REST N+1 vs. `mrs list --enrich`.
+
+Usage: python benchmarks/enrich.py [--mrs N] [--latency SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from mock_gitlab import MockGitLab
+from qodev_gitlab_api import GitLabClient
+
+from qodev_gitlab_cli.api import MAX_PER_PAGE, iter_pages, project_endpoint
+from qodev_gitlab_cli.graphql import enrich_mr_pages
+
+PROJECT = "g/p"
+
+
+def _rest(client: GitLabClient) -> int:
+    count = 0
+    for page in iter_pages(client, project_endpoint(PROJECT, "merge_requests")):
+        for mr in page.items:
+            for resource in ("pipelines", "approvals", "discussions"):
+                client.client.get(project_endpoint(PROJECT, "merge_requests", mr["iid"], resource)).raise_for_status()
+            count += 1
+    return count
+
+
+def _graphql(client: GitLabClient) -> int:
+    pages = iter_pages(client, project_endpoint(PROJECT, "merge_requests"))
+    return sum(len(page.items) for page in enrich_mr_pages(client, pages, project=PROJECT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mrs", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated server latency per request")
+    args = parser.parse_args()
+
+    print(f"{args.mrs} merge requests ({MAX_PER_PAGE} per page), {args.latency * 1000:.0f} ms latency")
+    print(f"{'mode':<24} {'requests':>9} {'ms':>8}")
+    for name, run in (("REST per MR", _rest), ("--enrich (GraphQL)", _graphql)):
+        with MockGitLab(latency=args.latency, collection_size=args.mrs) as server:
+            client = GitLabClient(token="bench", base_url=server.url)
+            before = server.requests
+            start = time.perf_counter()
+            assert run(client) == args.mrs
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name:<24} {server.requests - before:>9} {elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Microbenchmark: pure-Python git remote/branch detection vs. the git subprocess path.
+
+Usage: python benchmarks/git_detection.py [--runs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+
+from qodev_gitlab_cli import project
+
+
+def _bench(fn: Callable[[], object], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def _subprocess_branch() -> str | None:
+    result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True, timeout=5)
+    return result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        subprocess.run(["git", "init", "-q", tmp], check=True)
+        subprocess.run(["git", "remote", "add", "origin", "git@gitlab.com:group/project.git"], cwd=tmp, check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=b", "-c", "user.email=b@b", "commit", "-q", "--allow-empty", "-m", "init"],
+            cwd=tmp,
+            check=True,
+        )
+        nested = os.path.join(tmp, "a", "b", "c")
+        os.makedirs(nested)
+        os.chdir(nested)
+
+        def subprocess_remote() -> str | None:
+            root = project._find_git_root(nested)
+            return project._get_remote_url(root) if root else None
+
+        def pure_remote() -> str | None:
+            return project._read_remote_url(nested, "origin")
+
+        def pure_remote_cold() -> str | None:
+            project._config_cache.clear()
+            return project._read_remote_url(nested, "origin")
+
+        assert subprocess_remote() == pure_remote()
+        assert _subprocess_branch() == project._read_current_branch(nested)
+
+        rows = [
+            ("remote (subprocess)", _bench(subprocess_remote, args.runs)),
+            ("remote (pure, cold cache)", _bench(pure_remote_cold, args.runs)),
+            ("remote (pure, warm cache)", _bench(pure_remote, args.runs)),
+            ("branch (subprocess)", _bench(_subprocess_branch, args.runs)),
+            ("branch (pure)", _bench(lambda: project._read_current_branch(nested), args.runs)),
+        ]
+
+    print(f"{'path':<28} {'p50 us':>10}")
+    for name, value in rows:
+        print(f"{name:<28} {value:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
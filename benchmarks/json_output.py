@@ -0,0 +1,126 @@
+"""`--json` output of large payloads: the previous serialize + json.dumps path vs. the encoder backends.
+
+Payloads mimic `mrs changes` (a few large diffs) and `pipelines jobs --all`
+(many small job objects). Output goes to /dev/null; peak memory is measured
+separately with tracemalloc.
+
+Usage: python benchmarks/json_output.py [--files N] [--jobs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import redirect_stdout
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from qodev_gitlab_cli import encoding
+from qodev_gitlab_cli.output import serialize
+
+
+def make_changes(files: int) -> dict[str, Any]:
+    hunk = "".join(f'-old line {i}\n+new line {i} with "quotes" and ünïcode\n' for i in range(400))
+    return {
+        "iid": 1,
+        "title": "Large refactoring",
+        "created_at": datetime(2024, 1, 1, tzinfo=UTC),
+        "changes": [
+            {
+                "old_path": f"src/module_{i}.py",
+                "new_path": f"src/module_{i}.py",
+                "a_mode": "100644",
+                "b_mode": "100644",
+                "new_file": False,
+                "renamed_file": False,
+                "deleted_file": False,
+                "diff": f"@@ -1,400 +1,400 @@\n{hunk}",
+            }
+            for i in range(files)
+        ],
+    }
+
+
+def make_jobs(count: int) -> dict[str, Any]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    items = [
+        {
+            "id": i,
+            "name": f"test {i % 50}",
+            "stage": ("build", "test", "deploy")[i % 3],
+            "status": "success",
+            "ref": "main",
+            "allow_failure": False,
+            "duration": 12.5 + i % 7,
+            "created_at": start + timedelta(seconds=i),
+            "started_at": start + timedelta(seconds=i + 1),
+            "finished_at": start + timedelta(seconds=i + 14),
+            "user": {"id": 1, "username": "dev", "name": "Dev"},
+            "pipeline": {"id": 77, "ref": "main", "status": "success"},
+            "web_url": f"https://gitlab.example.com/g/p/-/jobs/{i}",
+        }
+        for i in range(count)
+    ]
+    return {"items": items, "total": count, "page": 1, "limit": count}
+
+
+def _previous(data: Any, compact: bool) -> None:
+    print(json.dumps(serialize(data), indent=None if compact else 2, default=str))
+
+
+def _backend(name: str) -> Callable[[Any, bool], None]:
+    def run(data: Any, compact: bool) -> None:
+        os.environ[encoding.BACKEND_ENV] = name
+        encoding._backend = None
+        encoding.write_json(data, compact=compact)
+
+    return run
+
+
+def _measure(fn: Callable[[Any, bool], None], data: Any, compact: bool) -> tuple[float, float]:
+    with open(os.devnull, "w", encoding="utf-8") as sink, redirect_stdout(sink):
+        fn(data, compact)  # warm-up (backend import)
+        start = time.perf_counter()
+        fn(data, compact)
+        elapsed = (time.perf_counter() - start) * 1000
+        tracemalloc.start()
+        fn(data, compact)
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200, help="Changed files in the `mrs changes` payload")
+    parser.add_argument("--jobs", type=int, default=20_000, help="Jobs in the `pipelines jobs` payload")
+    args = parser.parse_args()
+
+    variants: list[tuple[str, Callable[[Any, bool], None]]] = [("previous", _previous), ("json", _backend("json"))]
+    try:
+        import orjson  # noqa: F401
+
+        variants.append(("orjson", _backend("orjson")))
+    except ImportError:
+        print("orjson not installed; skipping its backend", file=sys.stderr)
+
+    payloads = {
+        f"mrs changes ({args.files} files)": make_changes(args.files),
+        f"pipelines jobs ({args.jobs})": make_jobs(args.jobs),
+    }
+    print(f"{'payload':<28} {'encoder':<10} {'mode':<8} {'ms':>8} {'peak MiB':>9}")
+    for label, data in payloads.items():
+        for name, fn in variants:
+            for compact in (False, True):
+                elapsed, peak = _measure(fn, data, compact)
+                mode = "compact" if compact else "indent"
+                print(f"{label:<28} {name:<10} {mode:<8} {elapsed:>8.0f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Minimal in-process mock of the GitLab REST (and a little GraphQL) API for benchmarks."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def make_mr(iid: int, project: str = "g/p") -> dict[str, Any]:
+    return {
+        "id": 1000 + iid,
+        "iid": iid,
+        "title": f"Merge request {iid}",
+        "state": "opened",
+        "source_branch": f"feature-{iid}",
+        "target_branch": "main",
+        "author": {"id": 1, "username": "dev", "name": "Dev"},
+        "web_url": f"https://gitlab.example.com/{project}/-/merge_requests/{iid}",
+        "references": {"full": f"{project}!{iid}"},
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+    }
+
+
+def make_project(path: str, index: int) -> dict[str, Any]:
+    return {
+        "id": index,
+        "name": path.rsplit("/", 1)[-1],
+        "path_with_namespace": path,
+        "web_url": f"https://gitlab.example.com/{path}",
+    }
+
+
+def make_pipeline(pid: int, status: str = "success") -> dict[str, Any]:
+    return {
+        "id": pid,
+        "status": status,
+        "ref": "main",
+        "sha": f"{pid:040x}",
+        "source": "push",
+        "web_url": f"https://gitlab.example.com/g/p/-/pipelines/{pid}",
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def make_job(job_id: int, status: str = "success", duration: float | None = 30.0) -> dict[str, Any]:
+    return {
+        "id": job_id,
+        "name": f"job-{job_id % 10}",
+        "stage": "test",
+        "status": status,
+        "duration": duration,
+        "allow_failure": False,
+        "web_url": f"https://gitlab.example.com/g/p/-/jobs/{job_id}",
+    }
+
+
+class MockGitLab:
+    """Serve a fake GitLab API on localhost.
+
+    Args:
+        latency: Seconds to sleep before answering each request.
+        collection_size: Number of items in each list endpoint.
+        omit_totals: Leave out X-Total/X-Total-Pages, as GitLab does for very large collections.
+        projects: Project paths served by `/projects`; other projects answer 404. Defaults to any project.
+        max_per_page: Largest page served, whatever `per_page` asks for (GitLab caps it at 100).
+        item_padding: Extra bytes of `description` in every list item.
+        diff_size: Total bytes of diff text in `merge_requests/:iid/changes`.
+        log_size: Bytes of every job trace, streamed in chunks.
+        pipeline_duration: Seconds a pipeline runs after it is first requested.
+        rate_limit: Requests allowed per `rate_window` seconds; further requests get `429`. Unlimited when None.
+        rate_window: Length of the rate-limit window in seconds.
+        flaky: Fraction of GET requests answered with a `502`, as from a struggling load balancer.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        collection_size: int = 100,
+        omit_totals: bool = False,
+        projects: list[str] | None = None,
+        max_per_page: int = 100,
+        item_padding: int = 0,
+        diff_size: int = 1 << 20,
+        log_size: int = 1 << 20,
+        pipeline_duration: float = 0.0,
+        rate_limit: int | None = None,
+        rate_window: float = 60.0,
+        flaky: float = 0.0,
+    ) -> None:
+        self.latency = latency
+        self.collection_size = collection_size
+        self.omit_totals = omit_totals
+        self.projects = projects
+        self.max_per_page = max_per_page
+        self.item_padding = item_padding
+        self.diff_size = diff_size
+        self.log_size = log_size
+        self.pipeline_duration = pipeline_duration
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.flaky = flaky
+        self._random = random.Random(0)
+        self.requests = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.bytes_sent = 0
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        self._pipelines_started: dict[int, float] = {}
+        self._changes: dict[int, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> MockGitLab:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        """Zero the counters and restart pipelines and the rate-limit window, e.g. between runs."""
+        with self._lock:
+            self.requests = self.not_modified = self.rate_limited = self.failed = self.bytes_sent = 0
+            self._window_start, self._window_used = time.monotonic(), 0
+            self._pipelines_started.clear()
+
+    def admit(self) -> tuple[bool, dict[str, str]]:
+        """Count a request against the rate limit: whether to serve it, and the RateLimit-* headers."""
+        if self.rate_limit is None:
+            return True, {}
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window:
+                self._window_start, self._window_used = now, 0
+            reset_in = self._window_start + self.rate_window - now
+            allowed = self._window_used < self.rate_limit
+            if allowed:
+                self._window_used += 1
+            else:
+                self.rate_limited += 1
+            headers = {
+                "RateLimit-Limit": str(self.rate_limit),
+                "RateLimit-Remaining": str(self.rate_limit - self._window_used),
+                "RateLimit-Reset": str(math.ceil(time.time() + reset_in)),
+            }
+        if not allowed:
+            headers["Retry-After"] = str(math.ceil(reset_in))
+        return allowed, headers
+
+    def pipeline_status(self, pid: int) -> tuple[str, list[dict[str, Any]]]:
+        """A pipeline that runs for `pipeline_duration` seconds from its first request, and its jobs.
+
+        Its three jobs finish one after another over that time.
+        """
+        with self._lock:
+            started = self._pipelines_started.setdefault(pid, time.monotonic())
+        progress = (time.monotonic() - started) / self.pipeline_duration if self.pipeline_duration else 1.0
+        jobs = [
+            make_job(pid * 10 + n, "success" if progress >= (n + 1) / 3 else "running", 10.0 * (n + 1))
+            for n in range(3)
+        ]
+        return ("success" if progress >= 1 else "running"), jobs
+
+    def changes(self, iid: int) -> bytes:
+        """The encoded `changes` response: `diff_size` bytes of diff, spread over files of up to 1 MB."""
+        if iid not in self._changes:
+            line = "+" + "x" * 78 + "\n"
+            file_size = min(self.diff_size, 1 << 20) or 1
+            files = []
+            for n in range(max(1, math.ceil(self.diff_size / file_size))):
+                size = min(file_size, self.diff_size - n * file_size)
+                diff = (line * (size // len(line) + 1))[:size]
+                files.append({"old_path": f"src/f{n}.py", "new_path": f"src/f{n}.py", "diff": diff})
+            self._changes[iid] = json.dumps({**make_mr(iid), "changes": files}).encode()
+        return self._changes[iid]
+
+    def route(self, path: str, query: dict[str, list[str]]) -> tuple[Any, dict[str, str]] | None:
+        if path == "/api/v4/version":
+            return {"version": "17.0.0"}, {}
+        if path == "/api/v4/projects":
+            projects = self.projects or []
+            return self._paginate(lambda i: make_project(projects[i - 1], i), query, len(projects))
+        if m := re.fullmatch(r"/api/v4/groups/([^/]+)/merge_requests", path):
+            group = unquote(m.group(1))
+            members = [p for p in self.projects or [] if p.startswith(group + "/")]
+            return self._paginate(lambda i: make_mr(i, members[(i - 1) % len(members)]), query, len(members) * 2)
+        scoped = re.match(r"/api/v4/projects/([^/]+)/", path)
+        if scoped and self.projects is not None and unquote(scoped.group(1)) not in self.projects:
+            return None
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/merge_requests/(\d+)", path):
+            iid = int(m.group(1))
+            return (make_mr(iid), {}) if iid <= self.collection_size else None
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/merge_requests/(\d+)/changes", path):
+            return self.changes(int(m.group(1))), {}
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/merge_requests/(\d+)/approvals", path):
+            return {"approved": True, "approved_by": [{"user": {"name": "Dev"}}] * (int(m.group(1)) % 3)}, {}
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/merge_requests/(\d+)/discussions", path):
+            return [{"id": str(i), "notes": [{"resolvable": True, "resolved": i % 2 == 0}]} for i in range(4)], {}
+        if re.fullmatch(r"/api/v4/projects/[^/]+/merge_requests/\d+/pipelines", path):
+            return [make_pipeline(1)], {}
+        if re.fullmatch(r"/api/v4/projects/[^/]+/merge_requests", path):
+            return self._paginate(make_mr, query)
+        if re.fullmatch(r"/api/v4/projects/[^/]+/pipelines", path):
+            return self._paginate(make_pipeline, query)
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/pipelines/(\d+)", path):
+            return make_pipeline(int(m.group(1)), self.pipeline_status(int(m.group(1)))[0]), {}
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/pipelines/(\d+)/jobs", path):
+            jobs = self.pipeline_status(int(m.group(1)))[1]
+            return self._paginate(lambda i: jobs[i - 1], query, len(jobs))
+        if re.fullmatch(r"/api/v4/projects/[^/]+/jobs", path):
+            return self._paginate(make_job, query)
+        if m := re.fullmatch(r"/api/v4/projects/[^/]+/jobs/(\d+)", path):
+            return make_job(int(m.group(1))), {}
+        return None
+
+    def graphql(self, document: str) -> dict[str, Any]:
+        """Answer `graphql.enrich_mrs`-shaped queries: aliased projects selecting MRs by IID."""
+        data: dict[str, Any] = {}
+        pattern = r'(\w+): project\(fullPath: "([^"]+)"\) \{\s*mergeRequests\(iids: (\[[^\]]*\])'
+        for alias, _project, iids in re.findall(pattern, document):
+            nodes = [
+                {
+                    "iid": iid,
+                    "conflicts": int(iid) % 5 == 0,
+                    "resolvableDiscussionsCount": 4,
+                    "resolvedDiscussionsCount": 2,
+                    "approvedBy": {"count": int(iid) % 3},
+                    "headPipeline": {"status": "SUCCESS"},
+                }
+                for iid in json.loads(iids)
+            ]
+            data[alias] = {"mergeRequests": {"nodes": nodes}}
+        return {"data": data}
+
+    def _paginate(
+        self, factory: Any, query: dict[str, list[str]], total: int | None = None
+    ) -> tuple[Any, dict[str, str]]:
+        page = int(query.get("page", ["1"])[0])
+        per_page = min(int(query.get("per_page", ["20"])[0]), self.max_per_page)
+        total = self.collection_size if total is None else total
+        total_pages = max(1, -(-total // per_page))
+        start = (page - 1) * per_page
+        items = [factory(i + 1) for i in range(start, min(start + per_page, total))]
+        if self.item_padding:
+            items = [{**item, "description": "x" * self.item_padding} for item in items]
+        headers = {
+            "X-Page": str(page),
+            "X-Per-Page": str(per_page),
+            "X-Total": str(total),
+            "X-Total-Pages": str(total_pages),
+            "X-Next-Page": str(page + 1) if page < total_pages else "",
+        }
+        if self.omit_totals:
+            del headers["X-Total"], headers["X-Total-Pages"]
+        return items, headers
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                with mock._lock:
+                    mock.requests += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+                allowed, limits = mock.admit()
+                if not allowed:
+                    self._send(429, {"message": "429 Too Many Requests"}, limits)
+                    return
+                if mock.flaky:
+                    with mock._lock:
+                        failing = mock._random.random() < mock.flaky
+                        mock.failed += failing
+                    if failing:
+                        self._send(502, {"message": "502 Bad Gateway"}, limits)
+                        return
+                parts = urlsplit(self.path)
+                if re.fullmatch(r"/api/v4/projects/[^/]+/jobs/\d+/trace", parts.path):
+                    self._send_log(limits)
+                    return
+                routed = mock.route(parts.path, parse_qs(parts.query))
+                if routed is None:
+                    self._send(404, {"message": "404 Not Found"}, {})
+                else:
+                    body, headers = routed
+                    self._send(200, body, {**headers, **limits})
+
+            def do_POST(self) -> None:
+                with mock._lock:
+                    mock.requests += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+                allowed, limits = mock.admit()
+                if not allowed:
+                    self._send(429, {"message": "429 Too Many Requests"}, limits)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))) or b"{}")
+                if urlsplit(self.path).path == "/api/graphql":
+                    self._send(200, mock.graphql(body.get("query", "")), {})
+                else:
+                    self._send(404, {"message": "404 Not Found"}, {})
+
+            def _send_log(self, headers: dict[str, str]) -> None:
+                line = b"".join(b"%06d Running step %s\n" % (n, b"." * 60) for n in range(1000))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(mock.log_size))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                remaining = mock.log_size
+                while remaining:
+                    chunk = line[:remaining]
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+                with mock._lock:
+                    mock.bytes_sent += mock.log_size
+
+            def _send(self, status: int, body: Any, headers: dict[str, str]) -> None:
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                etag = f'W/"{hashlib.sha1(payload).hexdigest()}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    with mock._lock:
+                        mock.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+                with mock._lock:
+                    mock.bytes_sent += len(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
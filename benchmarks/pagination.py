@@ -0,0 +1,52 @@
+"""Sequential vs. concurrent `--all` pagination over a 50-page listing.
+
+Usage: python benchmarks/pagination.py [--pages N] [--latency SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from mock_gitlab import MockGitLab
+from qodev_gitlab_api import GitLabClient
+
+from qodev_gitlab_cli.api import MAX_PER_PAGE, iter_pages, project_endpoint
+
+
+def _run(client: GitLabClient, concurrency: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    items = [
+        item
+        for page in iter_pages(client, project_endpoint("g/p", "merge_requests"), concurrency=concurrency)
+        for item in page.items
+    ]
+    return (time.perf_counter() - start) * 1000, len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency per request")
+    args = parser.parse_args()
+
+    rows = []
+    for omit_totals in (False, True):
+        with MockGitLab(
+            latency=args.latency, collection_size=args.pages * MAX_PER_PAGE, omit_totals=omit_totals
+        ) as server:
+            client = GitLabClient(token="bench", base_url=server.url)
+            for concurrency in (1, 4, 8, 16):
+                elapsed, count = _run(client, concurrency)
+                assert count == args.pages * MAX_PER_PAGE
+                label = f"concurrency={concurrency}" + (" (no totals)" if omit_totals else "")
+                rows.append((label, elapsed))
+
+    print(f"{args.pages} pages x {MAX_PER_PAGE} items, {args.latency * 1000:.0f} ms latency")
+    print(f"{'mode':<32} {'ms':>8}")
+    for name, value in rows:
+        print(f"{name:<32} {value:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
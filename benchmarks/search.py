@@ -0,0 +1,85 @@
+"""`search` query latency on a mirror with many issues and notes.
+
+Builds a temporary mirror with N synthetic issues (each with a few notes)
+whose words follow a Zipf distribution, as natural text does: a few filler
+words are everywhere, domain words such as "pipeline" appear in roughly a
+quarter of the issues. Then times representative queries: a rare word, a
+common word, a phrase and a prefix, each as the median of several runs.
+
+Usage: python benchmarks/search.py [--issues N] [--notes N] [--runs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from qodev_gitlab_cli.mirror import Mirror
+from qodev_gitlab_cli.search import search
+
+WORDS = [
+    *("pipeline", "cache", "runner", "timeout", "merge", "conflict", "review", "deploy", "staging", "production"),
+    *("login", "proxy", "token", "database", "migration", "index", "query", "latency", "memory", "leak", "crash"),
+    *("flaky", "test", "docs", "release", "tag", "branch", "permission", "group", "project", "variable"),
+    *("secret", "artifact", "coverage", "lint", "format", "upgrade", "dependency"),
+]
+# Filler words first, so the domain words are common but not ubiquitous.
+VOCABULARY = [*(f"filler{i}" for i in range(50)), *WORDS, *(f"term{i}" for i in range(5000))]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+QUERIES = {
+    "rare word": "kubernetes",
+    "common word": "pipeline",
+    "phrase": '"memory leak"',
+    "prefix": "migrat*",
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=words))
+
+
+def build(mirror: Mirror, issues: int, notes: int) -> float:
+    rng = random.Random(0)
+    start = time.perf_counter()
+    with mirror.db:
+        for iid in range(1, issues + 1):
+            extra = " kubernetes" if iid % 1000 == 0 else ""
+            item = {
+                "iid": iid,
+                "title": _text(rng, 6) + extra,
+                "description": _text(rng, 60),
+                "state": "opened" if iid % 3 else "closed",
+                "updated_at": "2024-01-01T00:00:00Z",
+            }
+            mirror.upsert(1, "issues", [item])
+            mirror.index(1, "issues", item, [{"body": _text(rng, 30)} for _ in range(notes)])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=20_000, help="Issues in the mirror")
+    parser.add_argument("--notes", type=int, default=3, help="Notes per issue")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per query (median reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, Mirror(os.path.join(tmp, "mirror.sqlite")) as mirror:
+        elapsed = build(mirror, args.issues, args.notes)
+        print(f"indexed {args.issues} issues with {args.notes} notes each in {elapsed:.1f}s")
+        print(f"{'query':<14} {'matches':>8} {'median ms':>10}")
+        for label, text in QUERIES.items():
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                _, total = search(mirror, text, [1], limit=20)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{label:<14} {total:>8} {statistics.median(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""End-to-end benchmark suite: representative commands against a mock GitLab.
+
+Each scenario starts `MockGitLab` with its own latency, page size, payload
+sizes and rate limit, then runs the CLI several times as a fresh process (no
+daemon, empty cache, output to /dev/null) and records:
+
+- ``latency_ms``: median wall time of the process;
+- ``requests``: HTTP requests the server received, ``throttled`` of them answered ``429``;
+- ``peak_rss_mb``: the largest resident set of the CLI process over the runs;
+- ``throughput_mb_s``: response bytes served per second (and ``items_per_s`` for lists).
+
+Results are written to ``benchmarks/results/<version>-<commit>.json``, where
+the commit is that of the benchmarked package's tree (with ``-dirty`` for
+uncommitted changes); an existing file is only replaced when named with
+``--output``. To benchmark another tree, put its ``src`` first on
+``PYTHONPATH``. ``--compare``
+prints how each metric moved against an earlier results file and exits 1 when
+any got worse by more than ``--threshold``. Compare results taken on the same
+machine with the same options.
+
+Usage: python benchmarks/suite.py [--only NAME] [--runs N] [--scale F] [--latency S]
+                                  [--output FILE] [--compare FILE] [--threshold F]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from mock_gitlab import MockGitLab
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MB = 1 << 20
+# Metric -> whether a higher value is better.
+METRICS = {
+    "latency_ms": False,
+    "requests": False,
+    "throttled": False,
+    "peak_rss_mb": False,
+    "throughput_mb_s": True,
+    "items_per_s": True,
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    argv: list[str]
+    server: dict[str, Any] = field(default_factory=dict)
+    # Items the command outputs, for `items_per_s`.
+    items: int = 0
+
+
+def scenarios(scale: float) -> list[Scenario]:
+    """The benchmarked commands; `scale` shrinks (or grows) their data for quick runs."""
+    project_count = max(1, int(5000 * scale))
+    projects = ["g/p", *(f"g/p{i}" for i in range(1, project_count))]
+    return [
+        Scenario("projects list", ["--json", "--all", "projects", "list"], {"projects": projects}, project_count),
+        Scenario(
+            "projects list (rate limited)",
+            ["--json", "--all", "projects", "list"],
+            {"projects": projects, "rate_limit": 20, "rate_window": 1.0},
+            project_count,
+        ),
+        Scenario(
+            "projects list (flaky)",
+            ["--json", "--all", "projects", "list"],
+            {"projects": projects, "flaky": 0.05},
+            project_count,
+        ),
+        Scenario("mrs changes", ["--json", "-p", "g/p", "mrs", "changes", "1"], {"diff_size": int(50 * MB * scale)}),
+        Scenario("jobs log", ["-p", "g/p", "jobs", "log", "1", "--raw"], {"log_size": int(200 * MB * scale)}),
+        Scenario(
+            "pipelines wait",
+            ["--json", "-p", "g/p", "pipelines", "wait", "1"],
+            {"pipeline_duration": max(1.0, 8 * scale)},
+        ),
+    ]
+
+
+# Starts the CLI and reports its wall time and rusage as JSON. It runs as a separate,
+# small process because on Linux a child's ru_maxrss starts at its parent's peak RSS,
+# and this process holds the mock's payloads.
+_RUNNER = """
+import json, os, subprocess, sys, time
+start = time.perf_counter()
+process = subprocess.Popen(sys.argv[1:], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+stderr = process.stderr.read()
+_, status, usage = os.wait4(process.pid, 0)
+seconds = time.perf_counter() - start
+code = os.waitstatus_to_exitcode(status)
+print(json.dumps({"seconds": seconds, "maxrss": usage.ru_maxrss, "code": code, "stderr": stderr.decode()}))
+"""
+
+
+def run_once(argv: list[str], env: dict[str, str]) -> tuple[float, float]:
+    """Run the CLI once; return its wall time in seconds and peak RSS in MB."""
+    with tempfile.TemporaryDirectory() as cache:
+        result = subprocess.run(
+            [sys.executable, "-c", _RUNNER, sys.executable, "-m", "qodev_gitlab_cli", *argv],
+            env={**env, "QODEV_GITLAB_CACHE_DIR": cache},
+            capture_output=True,
+            check=True,
+        )
+    run = json.loads(result.stdout)
+    if run["code"]:
+        raise RuntimeError(f"{' '.join(argv)} exited with {run['code']}: {run['stderr']}")
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return run["seconds"], run["maxrss"] / (MB if sys.platform == "darwin" else 1024)
+
+
+def measure(scenario: Scenario, *, runs: int, latency: float) -> dict[str, float]:
+    timings, rss, requests, throttled, sent = [], [], [], [], []
+    with MockGitLab(latency=latency, **scenario.server) as server:
+        env = {**os.environ, "GITLAB_TOKEN": "bench", "GITLAB_URL": server.url, "QODEV_GITLAB_NO_DAEMON": "1"}
+        for _ in range(runs):
+            server.reset()
+            elapsed, peak = run_once(scenario.argv, env)
+            timings.append(elapsed)
+            rss.append(peak)
+            requests.append(server.requests)
+            throttled.append(server.rate_limited)
+            sent.append(server.bytes_sent)
+    seconds = statistics.median(timings)
+    metrics = {
+        "latency_ms": round(seconds * 1000, 1),
+        "requests": statistics.median(requests),
+        "throttled": statistics.median(throttled),
+        "peak_rss_mb": round(max(rss), 1),
+        "throughput_mb_s": round(statistics.median(sent) / MB / seconds, 2),
+    }
+    if scenario.items:
+        metrics["items_per_s"] = round(scenario.items / seconds)
+    return metrics
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Print the change of every metric against `baseline`; return the regressions."""
+    if current["config"] != baseline["config"]:
+        print(f"warning: baseline was run with {baseline['config']}, this run with {current['config']}")
+    regressions = []
+    print(f"\nvs. {baseline['version']} ({baseline.get('commit') or '?'}, {baseline['date']})")
+    print(f"{'scenario':<30} {'metric':<16} {'before':>10} {'after':>10} {'change':>8}")
+    for name, metrics in current["scenarios"].items():
+        before = baseline["scenarios"].get(name, {})
+        for metric, higher_is_better in METRICS.items():
+            if metric not in metrics or metric not in before:
+                continue
+            old, new = before[metric], metrics[metric]
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            if flag:
+                regressions.append(f"{name}: {metric}")
+            print(f"{name:<30} {metric:<16} {old:>10} {new:>10} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def _commit() -> str | None:
+    """Commit of the tree the benchmarked `qodev_gitlab_cli` is imported from."""
+    spec = importlib.util.find_spec("qodev_gitlab_cli")
+    if spec is None or spec.origin is None:
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty", "--abbrev=7"],
+            cwd=os.path.dirname(spec.origin),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Run only this scenario (repeatable)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply project counts and payload sizes")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated server latency per request")
+    parser.add_argument(
+        "--output", type=Path, help="Results file (default: benchmarks/results/<version>-<commit>.json)"
+    )
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change that counts as a regression")
+    args = parser.parse_args()
+
+    selected = [s for s in scenarios(args.scale) if not args.only or s.name in args.only]
+    if not selected:
+        parser.error(f"no scenario named {args.only}")
+    release, commit = version("qodev-gitlab-cli"), _commit()
+    output = args.output or RESULTS_DIR / (f"{release}-{commit}.json" if commit else f"{release}.json")
+    if output.exists() and not args.output:
+        parser.error(f"{output} exists; pass --output to replace it")
+    results: dict[str, Any] = {
+        "version": release,
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"runs": args.runs, "scale": args.scale, "latency": args.latency},
+        "scenarios": {},
+    }
+    print(f"{'scenario':<30} {'ms':>9} {'requests':>9} {'429s':>5} {'RSS MB':>7} {'MB/s':>7} {'items/s':>8}")
+    for scenario in selected:
+        metrics = measure(scenario, runs=args.runs, latency=args.latency)
+        results["scenarios"][scenario.name] = metrics
+        print(
+            f"{scenario.name:<30} {metrics['latency_ms']:>9} {metrics['requests']:>9} {metrics['throttled']:>5} "
+            f"{metrics['peak_rss_mb']:>7} {metrics['throughput_mb_s']:>7} {metrics.get('items_per_s', ''):>8}"
+        )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nwrote {output}")
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
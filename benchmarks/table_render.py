@@ -0,0 +1,45 @@
+"""Rendering a 10k-row MR list: rich markdown vs. `--format table` / `--format tsv`.
+
+Usage: python benchmarks/table_render.py [--rows N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+from mock_gitlab import make_mr
+
+import qodev_gitlab_cli.context as _ctx
+from qodev_gitlab_cli import output
+from qodev_gitlab_cli.formatters.mrs import format_mr_list
+
+
+def _render(items: list[dict], output_format: str) -> float:
+    _ctx.ctx.configure(
+        json_mode=False, token=None, base_url=None, project=None, limit=len(items), page=1, output_format=output_format
+    )
+    output._consoles.clear()
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        output.output_list(items=items, total=len(items), limit=len(items), ctx=_ctx.ctx, format_fn=format_mr_list)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    items = [make_mr(i) for i in range(1, args.rows + 1)]
+    print(f"{args.rows} rows")
+    print(f"{'format':<10} {'ms':>10}")
+    for output_format in ("markdown", "table", "tsv"):
+        print(f"{output_format:<10} {_render(items, output_format):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,20 @@
 """GitLab CLI — agent-friendly CLI for the GitLab API."""
+
+
+def main() -> None:
+    """Console-script entry point.
+
+    Forwards to a running daemon when there is one; otherwise imports the app
+    and runs in-process. Kept import-free so forwarding skips cyclopts startup.
+    """
+    import sys
+
+    from qodev_gitlab_cli.daemon import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from qodev_gitlab_cli.app import app
+
+    app.meta()
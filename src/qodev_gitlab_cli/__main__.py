@@ -1,5 +1,5 @@
 """Allow running as `python -m qodev_gitlab_cli`."""
 
-from qodev_gitlab_cli.app import main
+from qodev_gitlab_cli import main
 
 main()
@@ -0,0 +1,308 @@
+"""Page-level access to GitLab list endpoints.
+
+`GitLabClient`'s list methods always start at page 1 and return a flattened
+list, which hides the pagination headers. The helpers here issue the page
+requests directly through the client's httpx session so list commands can
+honour `--limit`/`--page`/`--all` and report `X-Total`/`X-Total-Pages`.
+
+For `--all`, the remaining pages are fetched concurrently once the first
+response reveals `X-Total-Pages`; GitLab omits the totals for very large
+collections, in which case pages are followed one by one via `X-Next-Page`.
+
+With `--fields`, each page is projected as soon as it is decoded, and list
+endpoints with a slimmer representation (`SLIM_VIEWS`) are asked for it when
+it contains every selected field.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
+
+from qodev_gitlab_cli.context import Context, executor
+from qodev_gitlab_cli.formatters.generic import select_fields
+from qodev_gitlab_cli.tracing import span
+
+if TYPE_CHECKING:
+    import httpx
+
+MAX_PER_PAGE = 100
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Resource -> (params selecting GitLab's slimmer representation, top-level fields it includes).
+SLIM_VIEWS: dict[str, tuple[dict[str, Any], frozenset[str]]] = {
+    "projects": (
+        {"simple": True},
+        frozenset(
+            {
+                "id",
+                "name",
+                "name_with_namespace",
+                "path",
+                "path_with_namespace",
+                "description",
+                "created_at",
+                "default_branch",
+                "tag_list",
+                "topics",
+                "ssh_url_to_repo",
+                "http_url_to_repo",
+                "web_url",
+                "readme_url",
+                "avatar_url",
+                "forks_count",
+                "star_count",
+                "last_activity_at",
+                "namespace",
+            }
+        ),
+    ),
+    "merge_requests": (
+        {"view": "simple"},
+        frozenset({"id", "iid", "project_id", "title", "description", "state", "created_at", "updated_at", "web_url"}),
+    ),
+}
+
+
+@dataclass
+class Page:
+    """One page of a list endpoint plus its pagination headers."""
+
+    items: list[Any]
+    page: int
+    per_page: int
+    total: int | None = None
+    total_pages: int | None = None
+    next_page: int | None = None
+
+
+def project_endpoint(project: str, *parts: object) -> str:
+    """Build `/projects/<url-encoded id>/<parts...>`."""
+    path = f"/projects/{quote(project, safe='')}"
+    return "/".join([path, *(str(p) for p in parts)])
+
+
+def raise_for_status(response: httpx.Response) -> None:
+    """Convert HTTP error responses into the client library's typed exceptions."""
+    status = response.status_code
+    if status < 400:
+        return
+    from qodev_gitlab_api import APIError, AuthenticationError, NotFoundError
+
+    body = response.text[:500] if response.text else ""
+    if status == 401:
+        raise AuthenticationError(f"Authentication failed: {body}")
+    if status == 404:
+        raise NotFoundError(f"Not found: {body}", status_code=status)
+    raise APIError(f"API error {status}: {body}", status_code=status, response_body=body)
+
+
+def _int_header(response: httpx.Response, name: str) -> int | None:
+    value = response.headers.get(name)
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+@contextmanager
+def stream(client: Any, endpoint: str) -> Iterator[httpx.Response]:
+    """GET an endpoint without buffering the body; iterate the yielded response."""
+    with client.client.stream("GET", endpoint) as response:
+        if response.status_code >= 400:
+            response.read()
+            raise_for_status(response)
+        yield response
+
+
+@dataclass
+class ByteRange:
+    """A slice of a raw (non-JSON) resource such as a job trace."""
+
+    data: bytes
+    start: int
+    total: int | None = None
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.data)
+
+
+def get_range(client: Any, endpoint: str, *, start: int | None = None, suffix: int | None = None) -> ByteRange:
+    """Fetch `bytes=<start>-` or the last `suffix` bytes of a raw endpoint.
+
+    Servers that ignore `Range` answer 200 with the whole body, which is then
+    sliced locally so callers always see the requested part.
+    """
+    header = f"bytes={start}-" if start is not None else f"bytes=-{suffix}"
+    response = client.client.get(endpoint, headers={"Range": header})
+    if response.status_code == 416:
+        # Nothing at or after `start` yet (or an empty resource).
+        total = _content_range(response)[1]
+        return ByteRange(b"", start if start is not None else total or 0, total)
+    raise_for_status(response)
+    data = response.content
+    if response.status_code == 206:
+        first, total = _content_range(response)
+        return ByteRange(data, first if first is not None else start or 0, total)
+
+    total = len(data)
+    begin = min(start, total) if start is not None else max(0, total - (suffix or 0))
+    return ByteRange(data[begin:], begin, total)
+
+
+def _content_range(response: httpx.Response) -> tuple[int | None, int | None]:
+    # "bytes 100-199/1000", "bytes 100-199/*" or "bytes */1000"
+    value = response.headers.get("content-range", "")
+    _, _, spec = value.partition(" ")
+    span, _, total = spec.partition("/")
+    first = span.split("-", 1)[0]
+    return (
+        int(first) if first.isdigit() else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+def get_page(
+    client: Any,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    *,
+    page: int = 1,
+    per_page: int = 20,
+    headers: dict[str, str] | None = None,
+    fields: Sequence[str] = (),
+) -> Page:
+    """Fetch a single page of a list endpoint, keeping only `fields` of each item if given."""
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    params = {**(params or {}), "page": page, "per_page": per_page}
+    response = client.client.get(endpoint, params=params, **({"headers": headers} if headers else {}))
+    raise_for_status(response)
+    with span("json.decode", bytes=len(response.content)):
+        items = select_fields(response.json(), fields)
+    return Page(
+        items=items,
+        page=page,
+        per_page=per_page,
+        total=_int_header(response, "x-total"),
+        total_pages=_int_header(response, "x-total-pages"),
+        next_page=_int_header(response, "x-next-page"),
+    )
+
+
+def iter_pages(
+    client: Any,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    *,
+    per_page: int = MAX_PER_PAGE,
+    concurrency: int = 1,
+    headers: dict[str, str] | None = None,
+    fields: Sequence[str] = (),
+) -> Iterator[Page]:
+    """Yield every page of a list endpoint in order.
+
+    Args:
+        concurrency: Maximum requests in flight once the page count is known.
+        fields: Keep only these fields of each item (see `get_page`).
+    """
+    first = get_page(client, endpoint, params, page=1, per_page=per_page, headers=headers, fields=fields)
+    yield first
+    if not first.items or not first.next_page:
+        return
+    if concurrency > 1 and first.total_pages:
+        yield from _fetch_parallel(client, endpoint, params, first, concurrency, headers, fields)
+        return
+
+    current = first
+    while current.items and current.next_page:
+        current = get_page(
+            client, endpoint, params, page=current.next_page, per_page=first.per_page, headers=headers, fields=fields
+        )
+        yield current
+
+
+def _fetch_parallel(
+    client: Any,
+    endpoint: str,
+    params: dict[str, Any] | None,
+    first: Page,
+    concurrency: int,
+    headers: dict[str, str] | None,
+    fields: Sequence[str],
+) -> Iterator[Page]:
+    # A sliding window keeps at most `concurrency` pages in flight (and in
+    # memory) while still yielding them in page order.
+    remaining = iter(range(first.page + 1, (first.total_pages or 0) + 1))
+    pending: deque[Future[Page]] = deque()
+    with executor(concurrency, thread_name_prefix="qodev-gitlab-page") as pool:
+        try:
+            while True:
+                for page in remaining:
+                    pending.append(
+                        pool.submit(
+                            get_page,
+                            client,
+                            endpoint,
+                            params,
+                            page=page,
+                            per_page=first.per_page,
+                            headers=headers,
+                            fields=fields,
+                        )
+                    )
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    return
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def paginate(
+    client: Any,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    *,
+    ctx: Context,
+    per_page: int | None = None,
+    concurrency: int | None = None,
+    keep: Sequence[str] = (),
+    defaults: dict[str, Any] | None = None,
+) -> Iterator[Page]:
+    """Yield the pages selected by the global `--limit`/`--page`/`--all`/`--fields` options.
+
+    Conditions of `--where` that GitLab supports for the endpoint are sent as
+    query parameters (see `qodev_gitlab_cli.query.PUSHDOWN`).
+
+    Args:
+        keep: Fields the caller needs besides `--fields` (e.g. to tag or enrich items).
+        defaults: Params of options the user left at their default; a `--where`
+            equality on the same parameter replaces them.
+    """
+    query = ctx.query
+    fields = (*ctx.fields, *keep, *(query.fields if query else ())) if ctx.fields else ()
+    params = {**(params or {}), **slim_params(endpoint, fields)}
+    if query is not None:
+        params.update(query.pushdown(endpoint, params))
+    params = {**(defaults or {}), **params}
+    if ctx.all_pages:
+        yield from iter_pages(client, endpoint, params, concurrency=concurrency or ctx.concurrency, fields=fields)
+    else:
+        yield get_page(client, endpoint, params, page=ctx.page, per_page=per_page or ctx.limit, fields=fields)
+
+
+def slim_params(endpoint: str, fields: Sequence[str]) -> dict[str, Any]:
+    """Params requesting the endpoint's slimmer representation, if it has every field in `fields`."""
+    view = SLIM_VIEWS.get(endpoint.rsplit("/", 1)[-1])
+    if not fields or view is None:
+        return {}
+    params, available = view
+    return params if all(field.split(".", 1)[0] in available for field in fields) else {}
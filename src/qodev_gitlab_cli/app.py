@@ -3,12 +3,20 @@
 from __future__ import annotations
 
 import sys
-from typing import Annotated
+from typing import Annotated, Literal
 
 from cyclopts import App, Group, Parameter
-from qodev_gitlab_api import APIError, AuthenticationError, ConfigurationError, NotFoundError
 
 import qodev_gitlab_cli.context as _ctx
+from qodev_gitlab_cli.errors import (
+    EXIT_API,
+    EXIT_AUTH,
+    EXIT_CONFIG,
+    EXIT_NOT_FOUND,
+    EXIT_VALIDATION,
+    classify_error,
+    error_message,
+)
 
 app = App(
     name="qodev-gitlab",
@@ -19,32 +27,42 @@ app = App(
 app.meta.group_parameters = Group("Global Options", sort_key=0)
 
 # ---------------------------------------------------------------------------
-# Import and register command groups
+# Register command groups (imported lazily when a group is invoked)
 # ---------------------------------------------------------------------------
-from qodev_gitlab_cli.commands.issues import issues_app  # noqa: E402
-from qodev_gitlab_cli.commands.jobs import jobs_app  # noqa: E402
-from qodev_gitlab_cli.commands.mrs import mrs_app  # noqa: E402
-from qodev_gitlab_cli.commands.pipelines import pipelines_app  # noqa: E402
-from qodev_gitlab_cli.commands.projects import projects_app  # noqa: E402
-from qodev_gitlab_cli.commands.releases import releases_app  # noqa: E402
-from qodev_gitlab_cli.commands.variables import variables_app  # noqa: E402
-
-app.command(projects_app)
-app.command(mrs_app)
-app.command(pipelines_app)
-app.command(jobs_app)
-app.command(issues_app)
-app.command(releases_app)
-app.command(variables_app)
+_COMMAND_GROUPS = [
+    ("projects", "Manage projects."),
+    ("mrs", "Manage merge requests."),
+    ("pipelines", "Manage pipelines."),
+    ("jobs", "Manage jobs."),
+    ("issues", "Manage issues."),
+    ("releases", "Manage releases."),
+    ("variables", "Manage CI/CD variables."),
+    ("daemon", "Run a background daemon that keeps the CLI warm."),
+]
+
+for _name, _help in _COMMAND_GROUPS:
+    app.command(f"qodev_gitlab_cli.commands.{_name}:{_name}_app", name=_name, help=_help)
+
+app.command(
+    "qodev_gitlab_cli.commands.status:status",
+    name="status",
+    help="Show merge request, pipeline and review state for the current branch.",
+)
+app.command(
+    "qodev_gitlab_cli.commands.sync:sync",
+    name="sync",
+    help="Mirror issues, merge requests, notes, pipelines and releases into a local database for --offline.",
+)
+app.command(
+    "qodev_gitlab_cli.commands.search:search",
+    name="search",
+    help="Ranked full-text search over issues, merge requests and their notes.",
+)
+app.command(
+    "qodev_gitlab_cli.commands.batch:batch", name="batch", help="Run NDJSON commands from stdin in one process."
+)
 
-# ---------------------------------------------------------------------------
-# Exit codes
-# ---------------------------------------------------------------------------
-EXIT_AUTH = 80
-EXIT_NOT_FOUND = 81
-EXIT_API = 82
-EXIT_VALIDATION = 83
-EXIT_CONFIG = 84
+__all__ = ["EXIT_API", "EXIT_AUTH", "EXIT_CONFIG", "EXIT_NOT_FOUND", "EXIT_VALIDATION", "app", "main"]
 
 
 # ---------------------------------------------------------------------------
@@ -54,33 +72,152 @@ EXIT_CONFIG = 84
 def launcher(
     *tokens: Annotated[str, Parameter(show=False, allow_leading_hyphen=True)],
     json: Annotated[bool, Parameter(name="--json", help="Output as JSON", negative="")] = False,
+    output_format: Annotated[
+        Literal["markdown", "json", "ndjson", "table", "tsv"] | None,
+        Parameter(
+            name="--format",
+            help="Output format (ndjson streams list results; table is the default when stdout is not a terminal)",
+        ),
+    ] = None,
+    compact: Annotated[bool, Parameter(name="--compact", help="Write JSON without indentation", negative="")] = False,
+    fields: Annotated[
+        str | None,
+        Parameter(
+            name="--fields", help="Comma-separated fields to keep, dot notation allowed (e.g. iid,author.username)"
+        ),
+    ] = None,
+    where: Annotated[
+        str | None,
+        Parameter(name="--where", help="Keep list items matching an expression, e.g. 'state == \"opened\"'"),
+    ] = None,
+    sort: Annotated[
+        str | None, Parameter(name="--sort", help="Sort list items by comma-separated fields ('-' for descending)")
+    ] = None,
+    top: Annotated[int | None, Parameter(name="--top", help="Output at most N list items")] = None,
     token: Annotated[
         str | None, Parameter(name="--token", help="GitLab token (overrides GITLAB_TOKEN)", show=False)
     ] = None,
     url: Annotated[str | None, Parameter(name="--url", help="GitLab URL (overrides GITLAB_URL)", show=False)] = None,
-    project: Annotated[str | None, Parameter(name=["--project", "-p"], help="Project ID or path")] = None,
-    limit: Annotated[int, Parameter(name="--limit", help="Results per page")] = 25,
+    project: Annotated[
+        str | None,
+        Parameter(name=["--project", "-p"], help="Project ID or path; list commands also take a,b,c or a glob"),
+    ] = None,
+    projects_from: Annotated[
+        str | None,
+        Parameter(
+            name="--projects-from", help="Read project paths from a file ('-' for stdin)", allow_leading_hyphen=True
+        ),
+    ] = None,
+    limit: Annotated[int, Parameter(name="--limit", help="Results per page (max 100)")] = 25,
     page: Annotated[int, Parameter(name="--page", help="Page number")] = 1,
+    all_pages: Annotated[
+        bool, Parameter(name="--all", help="Fetch every page (ignores --limit/--page)", negative="")
+    ] = False,
+    concurrency: Annotated[
+        int, Parameter(name="--concurrency", help="Parallel requests for --all and multi-ID get (1 = sequential)")
+    ] = 4,
+    no_cache: Annotated[bool, Parameter(name="--no-cache", help="Bypass the HTTP response cache", negative="")] = False,
+    cache_only: Annotated[
+        bool, Parameter(name="--cache-only", help="Answer GET requests from the cache only", negative="")
+    ] = False,
+    cache_ttl: Annotated[
+        float | None,
+        Parameter(
+            name="--cache-ttl", help="Serve cached responses younger than this many seconds without revalidating"
+        ),
+    ] = None,
+    offline: Annotated[
+        bool, Parameter(name="--offline", help="Answer from the local mirror built by `sync` (no network)", negative="")
+    ] = False,
+    retries: Annotated[
+        int, Parameter(name="--retries", help="Retries of connection errors, timeouts and 5xx (writes: unsent only)")
+    ] = 3,
+    hedge: Annotated[
+        bool,
+        Parameter(name="--hedge", help="Send a second GET when the first is slower than the p95 latency", negative=""),
+    ] = False,
+    trace: Annotated[
+        bool, Parameter(name="--trace", help="Print a timing report of phases and HTTP requests to stderr", negative="")
+    ] = False,
+    trace_file: Annotated[
+        str | None, Parameter(name="--trace-file", help="Also write the spans as a Chrome trace-event JSON file")
+    ] = None,
 ) -> None:
     """GitLab CLI — manage projects, merge requests, pipelines, and more."""
-    _ctx.ctx.configure(json_mode=json, token=token, base_url=url, project=project, limit=limit, page=page)
+    tracer = None
+    if trace or trace_file:
+        from qodev_gitlab_cli.tracing import Tracer
+
+        tracer = Tracer()
+    _ctx.ctx.configure(
+        json_mode=json,
+        token=token,
+        base_url=url,
+        project=project,
+        limit=limit,
+        page=page,
+        all_pages=all_pages,
+        concurrency=concurrency,
+        projects_from=projects_from,
+        cache_mode="off" if no_cache else "only" if cache_only else "default",
+        cache_ttl=cache_ttl,
+        output_format=output_format,
+        compact=compact,
+        fields=tuple(f.strip() for f in fields.split(",") if f.strip()) if fields else (),
+        offline=offline,
+        tracer=tracer,
+        retries=retries,
+        hedge=hedge,
+    )
+    if json and output_format not in (None, "json"):
+        _handle_error(f"--json conflicts with --format {output_format}.", code="validation", exit_code=EXIT_VALIDATION)
+    if no_cache and cache_only:
+        _handle_error(
+            "--no-cache and --cache-only are mutually exclusive.", code="validation", exit_code=EXIT_VALIDATION
+        )
+    if limit > 100 or limit < 1:
+        # GitLab caps `per_page` at 100; a larger page would be silently cut short.
+        _handle_error(
+            "--limit must be between 1 and 100; use --page or --all for more.",
+            code="validation",
+            exit_code=EXIT_VALIDATION,
+        )
+    if where is not None or sort is not None or top is not None:
+        from qodev_gitlab_cli.query import Query, QueryError
+
+        try:
+            _ctx.ctx.query = Query.parse(where, sort, top)
+        except QueryError as exc:
+            _handle_error(str(exc), code="validation", exit_code=EXIT_VALIDATION)
+
+    from qodev_gitlab_cli.tracing import span
 
     try:
-        app(tokens)
-    except AuthenticationError as exc:
-        _handle_error(str(exc), code="authentication", exit_code=EXIT_AUTH)
-    except NotFoundError as exc:
-        _handle_error(str(exc), code="not_found", exit_code=EXIT_NOT_FOUND)
-    except APIError as exc:
-        _handle_error(str(exc), code="api_error", exit_code=EXIT_API)
-    except ConfigurationError as exc:
-        _handle_error(str(exc), code="configuration", exit_code=EXIT_CONFIG)
+        with span("command"):
+            app(tokens)
     except SystemExit:
         raise
     except KeyboardInterrupt:
         sys.exit(130)
+    except BrokenPipeError:
+        # The reader closed the pipe (`... --format ndjson | head`); stop quietly.
+        from qodev_gitlab_cli.output import silence_stdout
+
+        silence_stdout()
+        sys.exit(141)
     except Exception as exc:
-        _handle_error(f"Unexpected error: {exc}", code="unknown", exit_code=1)
+        _handle_exception(exc)
+    finally:
+        if tracer is not None:
+            from qodev_gitlab_cli.tracing import report
+
+            # Errors exit through here too, so their report follows the error message.
+            report(tracer, ctx=_ctx.ctx, trace_file=trace_file)
+
+
+def _handle_exception(exc: Exception) -> None:
+    code, exit_code = classify_error(exc)
+    _handle_error(error_message(exc), code=code, exit_code=exit_code)
 
 
 def _handle_error(message: str, *, code: str, exit_code: int) -> None:
@@ -90,4 +227,6 @@ def _handle_error(message: str, *, code: str, exit_code: int) -> None:
 
 
 def main() -> None:
-    app.meta()
+    from qodev_gitlab_cli import main as _main
+
+    _main()
@@ -0,0 +1,292 @@
+"""Run many CLI invocations in one process (`qodev-gitlab batch`).
+
+Requests are NDJSON objects, one per line, e.g.
+``{"id": "a", "cmd": ["mrs", "get", "12"], "project": "g/p"}``. Each command
+runs through the regular app under its own `Context` (sharing the pooled
+clients of the batch) with stdin/stdout/stderr captured, and produces one
+result line tagged with the request's ``id``:
+
+- ``{"id", "code": 0, "result": ...}`` with the command's parsed JSON output;
+- ``{"id", "code": 81, "error": ..., "error_code": "not_found"}`` on failure.
+
+``code`` is the exit code the command would have exited with. Read-only
+commands run concurrently up to ``parallel``; any other command waits for the
+commands before it and runs alone, so side effects happen in input order.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import io
+import json
+import shlex
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, TextIO, cast
+
+import qodev_gitlab_cli.context as _ctx
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.errors import EXIT_VALIDATION
+
+# Subcommands that only read from GitLab; everything else runs exclusively.
+READ_COMMANDS = frozenset(
+    {
+        "list",
+        "get",
+        "log",
+        "jobs",
+        "wait",
+        "notes",
+        "discussions",
+        "changes",
+        "commits",
+        "approvals",
+        "pipelines",
+        "status",
+    }
+)
+GROUPS = frozenset({"projects", "mrs", "pipelines", "jobs", "issues", "releases", "variables"})
+
+
+@dataclass
+class _Streams:
+    stdin: TextIO
+    stdout: TextIO
+    stderr: TextIO
+
+
+_streams: contextvars.ContextVar[_Streams] = contextvars.ContextVar("qodev_gitlab_batch_streams")
+
+
+class _RoutedStream:
+    """Stand-in for sys.stdin/stdout/stderr that follows the running command."""
+
+    def __init__(self, name: str, fallback: Any) -> None:
+        self._name = name
+        self._fallback = fallback
+
+    def _target(self) -> Any:
+        streams = _streams.get(None)
+        return getattr(streams, self._name) if streams is not None else self._fallback
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+
+@dataclass
+class Request:
+    id: Any
+    argv: list[str]
+    stdin: str = ""
+    exclusive: bool = True
+
+
+class InvalidRequest(ValueError):
+    pass
+
+
+def parse_request(line: str, number: int, *, base: Context) -> Request:
+    """Parse one NDJSON request line into the argv to run.
+
+    Batch-level global options (project, token, URL, cache flags, `--offline`,
+    `--trace`, retry options, concurrency) apply unless the command sets them itself; output
+    defaults to JSON so results can be embedded. A traced request reports its
+    own trace in its ``stderr``.
+    """
+    try:
+        payload = json.loads(line)
+    except ValueError as exc:
+        raise InvalidRequest(f"Invalid JSON: {exc}") from None
+    if not isinstance(payload, dict):
+        raise InvalidRequest("Each request must be a JSON object.")
+    cmd = payload.get("cmd")
+    if isinstance(cmd, str):
+        cmd = shlex.split(cmd)
+    if not isinstance(cmd, list) or not cmd or not all(isinstance(token, str) for token in cmd):
+        raise InvalidRequest('"cmd" must be a non-empty list of strings.')
+    if cmd[0] in ("batch", "daemon"):
+        raise InvalidRequest(f"`{cmd[0]}` cannot run inside a batch.")
+
+    def given(*names: str) -> bool:
+        return any(token.split("=", 1)[0] in names for token in cmd)
+
+    options: list[str] = []
+    project = payload.get("project") or base.project
+    if project and not given("--project", "-p"):
+        options += ["--project", str(project)]
+    if base.token and not given("--token"):
+        options += ["--token", base.token]
+    if base.base_url and not given("--url"):
+        options += ["--url", base.base_url]
+    if base.cache_mode != "default" and not given("--no-cache", "--cache-only"):
+        options.append("--no-cache" if base.cache_mode == "off" else "--cache-only")
+    if base.offline and not given("--offline"):
+        options.append("--offline")
+    if base.tracer is not None and not given("--trace", "--trace-file"):
+        options.append("--trace")
+    if base.retries != Context.retries and not given("--retries"):
+        options += ["--retries", str(base.retries)]
+    if base.hedge and not given("--hedge"):
+        options.append("--hedge")
+    if base.cache_ttl and not given("--cache-ttl"):
+        options += ["--cache-ttl", str(base.cache_ttl)]
+    if not given("--concurrency"):
+        options += ["--concurrency", str(base.concurrency)]
+    if not given("--json", "--format"):
+        options += ["--format", "json"]
+
+    return Request(
+        id=payload.get("id", number),
+        argv=[*options, *cmd],
+        stdin=str(payload.get("stdin") or ""),
+        exclusive=_subcommand(cmd) not in READ_COMMANDS,
+    )
+
+
+def _subcommand(cmd: list[str]) -> str | None:
+    for i, token in enumerate(cmd):
+        if token == "status":
+            return token
+        if token in GROUPS:
+            return cmd[i + 1] if i + 1 < len(cmd) else None
+    return None
+
+
+def execute(request: Request, *, base: Context) -> dict[str, Any]:
+    """Run one request under its own context and return its result record."""
+    from qodev_gitlab_cli.app import app
+
+    out_bytes, err_bytes = io.BytesIO(), io.BytesIO()
+    streams = _Streams(
+        stdin=io.StringIO(request.stdin),
+        stdout=io.TextIOWrapper(out_bytes, encoding="utf-8", write_through=True),
+        stderr=io.TextIOWrapper(err_bytes, encoding="utf-8", write_through=True),
+    )
+    token = _streams.set(streams)
+    code = 0
+    try:
+        with _ctx.using(Context(_clients=base._clients)):
+            try:
+                app.meta(request.argv)
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+            except Exception as exc:
+                print(f"Error: {exc}", file=streams.stderr)
+                code = 1
+    finally:
+        _streams.reset(token)
+
+    out = out_bytes.getvalue().decode("utf-8", errors="replace")
+    err = err_bytes.getvalue().decode("utf-8", errors="replace")
+    return _record(request.id, code, out, err)
+
+
+def _record(request_id: Any, code: int, out: str, err: str) -> dict[str, Any]:
+    record: dict[str, Any] = {"id": request_id, "code": code}
+    parsed = _parse(out)
+    if code and isinstance(parsed, dict) and set(parsed) in ({"error", "code"}, {"error", "code", "rate_limit"}):
+        record.update(error=parsed["error"], error_code=parsed["code"])
+        if "rate_limit" in parsed:
+            record["rate_limit"] = parsed["rate_limit"]
+    elif parsed is not None:
+        record["result"] = parsed
+    elif out:
+        record["output"] = out
+    if err.strip():
+        record["stderr"] = err
+    if code and "error" not in record:
+        lines = err.strip().splitlines()
+        record["error"] = lines[-1] if lines else f"Command exited with code {code}."
+    return record
+
+
+def _parse(out: str) -> Any:
+    if not out.strip():
+        return None
+    try:
+        return json.loads(out)
+    except ValueError:
+        pass
+    # NDJSON output (`--format ndjson`) becomes a list of documents.
+    try:
+        return [json.loads(line) for line in out.splitlines() if line.strip()]
+    except ValueError:
+        return None
+
+
+def run_batch(
+    lines: Iterable[str],
+    *,
+    parallel: int = 1,
+    base: Context | None = None,
+    write: Callable[[dict[str, Any]], None],
+) -> dict[str, Any]:
+    """Execute every request in `lines`, calling `write` with each result as it completes.
+
+    Returns summary counts (``count``, ``failed``, ``elapsed``).
+    """
+    from rich.console import Console
+
+    from qodev_gitlab_cli import output
+
+    base = base or _ctx.current()
+    parallel = max(1, parallel)
+    lock = threading.Lock()
+    start = time.perf_counter()
+    count = failed = 0
+
+    def emit(record: dict[str, Any]) -> None:
+        nonlocal count, failed
+        with lock:
+            count += 1
+            failed += record["code"] != 0
+            write(record)
+
+    def run(request: Request) -> None:
+        emit(execute(request, base=base))
+
+    saved = sys.stdin, sys.stdout, sys.stderr
+    saved_consoles = dict(output._consoles)
+    sys.stdin = cast(TextIO, _RoutedStream("stdin", io.StringIO()))
+    sys.stdout = cast(TextIO, _RoutedStream("stdout", saved[1]))
+    sys.stderr = cast(TextIO, _RoutedStream("stderr", saved[2]))
+    output._consoles.clear()
+    output._consoles[False] = Console(file=sys.stdout)
+    output._consoles[True] = Console(file=sys.stderr, stderr=True)
+    try:
+        with _ctx.executor(parallel, thread_name_prefix="qodev-gitlab-batch") as pool:
+            in_flight: set[Future[None]] = set()
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    request = parse_request(line, number, base=base)
+                except InvalidRequest as exc:
+                    emit({"id": number, "code": EXIT_VALIDATION, "error": str(exc), "error_code": "validation"})
+                    continue
+                if request.exclusive or parallel == 1:
+                    wait(in_flight)
+                    in_flight.clear()
+                    run(request)
+                    continue
+                if len(in_flight) >= parallel:
+                    in_flight = wait(in_flight, return_when=FIRST_COMPLETED).not_done
+                in_flight.add(pool.submit(run, request))
+            for future in in_flight:
+                future.result()
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+        output._consoles.clear()
+        output._consoles.update(saved_consoles)
+
+    return {"count": count, "failed": failed, "elapsed": round(time.perf_counter() - start, 3)}
@@ -0,0 +1,124 @@
+"""Multi-ID `get`: concurrent fetches with per-ID errors reported inline."""
+
+from __future__ import annotations
+
+import re
+import sys
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+from qodev_gitlab_cli.context import Context, executor
+from qodev_gitlab_cli.errors import EXIT_VALIDATION, classify_error, error_message
+from qodev_gitlab_cli.formatters.generic import select_fields
+from qodev_gitlab_cli.output import PLAIN_FORMATS, error, output, output_json_line
+
+_ID_RE = re.compile(r"[!#]?(\d+)")
+
+
+def collect_ids(ids: Sequence[int] | None, ids_from: str | None, *, ctx: Context) -> list[int]:
+    """Combine positional IDs with IDs read from a file (``-`` for stdin).
+
+    IDs in the file may be separated by whitespace or commas and carry a
+    ``!``/``#`` prefix as copied from GitLab.
+    """
+    collected = list(ids or [])
+    if ids_from is not None:
+        try:
+            if ids_from == "-":
+                text = sys.stdin.read()
+            else:
+                with open(ids_from, encoding="utf-8") as f:
+                    text = f.read()
+        except OSError as exc:
+            error(f"Cannot read IDs from {ids_from}: {exc}", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+        for token in re.split(r"[\s,]+", text.strip()):
+            if not token:
+                continue
+            m = _ID_RE.fullmatch(token)
+            if not m:
+                error(f"Invalid ID in {ids_from}: {token!r}", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+            collected.append(int(m.group(1)))
+    if not collected:
+        error("No IDs given.", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+    return list(dict.fromkeys(collected))
+
+
+def fetch_many(
+    fetch: Callable[[Any], Any], ids: list[Any], *, key: str, concurrency: int
+) -> Iterator[tuple[Any, BaseException | None]]:
+    """Fetch every ID concurrently, yielding ``(record, exception)`` in input order.
+
+    A failed ID yields ``{key: id, "error": message, "code": error_code}``.
+    """
+
+    def one(item_id: Any) -> tuple[Any, BaseException | None]:
+        try:
+            return fetch(item_id), None
+        except Exception as exc:
+            code, _ = classify_error(exc)
+            return {key: item_id, "error": error_message(exc), "code": code}, exc
+
+    with executor(max(1, min(concurrency, len(ids)))) as pool:
+        yield from pool.map(one, ids)
+
+
+def output_many(
+    fetch: Callable[[int], Any],
+    ids: list[int],
+    *,
+    ctx: Context,
+    key: str,
+    format_fn: Any,
+    label: Callable[[int], str] = str,
+) -> None:
+    """Fetch and print several records as one list.
+
+    Records are in input order. In NDJSON mode each one is written as soon as
+    it and every record before it are fetched. When any ID failed the process
+    exits with the exit code of the first failure, after all output.
+    """
+    records: list[Any] = []
+    failures: list[tuple[dict[str, Any], BaseException]] = []
+    # Like `output()`, `--fields` projects JSON output; formatters get whole records.
+    # Each record is projected as it arrives so only the selected fields are kept.
+    project = ctx.json_mode and ctx.fields
+    fetch_selected = (lambda item_id: select_fields(fetch(item_id), ctx.fields)) if project else fetch
+    for record, exc in fetch_many(fetch_selected, ids, key=key, concurrency=ctx.concurrency):
+        if ctx.output_format == "ndjson":
+            output_json_line(record)
+            sys.stdout.flush()
+        elif exc is None or ctx.json_mode:
+            records.append(record)
+        if exc is not None:
+            failures.append((record, exc))
+
+    if ctx.output_format != "ndjson":
+        output(
+            records,
+            ctx=ctx,
+            format_fn=lambda items: _format_with_errors(items, failures, key, format_fn, label, ctx=ctx),
+        )
+    if failures:
+        sys.exit(classify_error(failures[0][1])[1])
+
+
+def _format_with_errors(
+    items: list[Any],
+    failures: list[tuple[dict[str, Any], BaseException]],
+    key: str,
+    format_fn: Any,
+    label: Callable[[int], str],
+    *,
+    ctx: Context,
+) -> str:
+    if ctx.output_format in PLAIN_FORMATS:
+        # Keep stdout to rows only; failed IDs are reported on stderr.
+        for record, _ in failures:
+            print(f"{label(record[key])}: {record['error']}", file=sys.stderr)
+        return format_fn(items, total=len(items))
+    parts = [format_fn(items, total=len(items))] if items else []
+    if failures:
+        lines = ["**Errors**", ""]
+        lines.extend(f"- {label(record[key])}: {record['error']}" for record, _ in failures)
+        parts.append("\n".join(lines))
+    return "\n\n".join(parts)
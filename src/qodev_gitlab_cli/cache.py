@@ -0,0 +1,330 @@
+"""On-disk HTTP response cache with ETag/Last-Modified revalidation.
+
+Entries live under the user cache directory, grouped by token fingerprint and
+by *scope* (``projects/<id>/<resource>``) so a mutation can drop every cached
+view of the affected resource with a single directory removal. Each entry file
+is one JSON metadata line followed by the raw (decoded) response body.
+
+Responses that may carry secrets are never written: CI/CD variables (whose
+values `variables get` prints) and anything marked ``Cache-Control: no-store``
+or ``private``. The whole tree is created readable by the owner only.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.context import Context
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "QODEV_GITLAB_CACHE_DIR"
+CACHE_TTL_ENV = "QODEV_GITLAB_CACHE_TTL"
+CACHE_SIZE_ENV = "QODEV_GITLAB_CACHE_SIZE"
+DEFAULT_MAX_MB = 200
+
+# Path segments of resources whose responses hold secrets.
+SECRET_RESOURCES = frozenset({"variables"})
+
+# Headers that describe the wire encoding rather than the cached (decoded) body.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def cache_dir() -> str:
+    """Return the user cache directory for the CLI."""
+    override = os.getenv(CACHE_DIR_ENV)
+    if override:
+        return override
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "qodev-gitlab")
+
+
+def default_ttl() -> float:
+    try:
+        return float(os.getenv(CACHE_TTL_ENV, "0"))
+    except ValueError:
+        return 0.0
+
+
+def _default_max_bytes() -> int:
+    try:
+        return int(float(os.getenv(CACHE_SIZE_ENV, str(DEFAULT_MAX_MB))) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+def _makedirs_private(path: str) -> None:
+    """`os.makedirs`, but every directory it creates (not just the leaf) is 0700."""
+    if os.path.isdir(path):
+        return
+    parent = os.path.dirname(path)
+    if parent and parent != path:
+        _makedirs_private(parent)
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(path, 0o700)
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def scope_of(path: str) -> str:
+    """Map an API path to its invalidation scope, e.g. ``projects/g%2Fp/merge_requests``."""
+    path = path.split("/api/v4/", 1)[-1].strip("/")
+    segments = path.split("/")
+    if segments[0] in ("projects", "groups") and len(segments) >= 3:
+        return "/".join(segments[:3])
+    return "/".join(segments[:2])
+
+
+def _raw_path(request: httpx.Request) -> str:
+    # `url.path` decodes ``%2F``, which would split a project path into segments.
+    return request.url.raw_path.decode("ascii").split("?", 1)[0]
+
+
+@dataclass
+class CacheEntry:
+    path: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    stored_at: float
+    body: bytes
+
+    @property
+    def etag(self) -> str | None:
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self._header("last-modified")
+
+    def _header(self, name: str) -> str | None:
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.body, request=request)
+
+
+class ResponseCache:
+    """Size-bounded, LRU-evicted store of GET responses."""
+
+    def __init__(self, root: str | None = None, *, max_bytes: int | None = None) -> None:
+        self.root = os.path.join(root or cache_dir(), "http")
+        self.max_bytes = _default_max_bytes() if max_bytes is None else max_bytes
+        # Bytes on disk as of the last scan plus what this instance wrote since;
+        # None until the first store scans the tree.
+        self._size: int | None = None
+
+    def _entry_path(self, request: httpx.Request) -> str:
+        token = request.headers.get("private-token", "")
+        return os.path.join(
+            self.root,
+            _hash(token)[:16],
+            _hash(scope_of(_raw_path(request)))[:16],
+            _hash(str(request.url)) + ".entry",
+        )
+
+    def load(self, request: httpx.Request) -> CacheEntry | None:
+        path = self._entry_path(request)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(
+            path=path,
+            status_code=meta["status_code"],
+            headers=[(k, v) for k, v in meta["headers"]],
+            stored_at=meta["stored_at"],
+            body=body,
+        )
+
+    def touch(self, entry: CacheEntry, *, revalidated: bool = False) -> None:
+        """Mark an entry as recently used (and, if revalidated, as fresh again)."""
+        if revalidated:
+            entry.stored_at = time.time()
+            self._write(entry)
+        else:
+            with contextlib.suppress(OSError):
+                os.utime(entry.path)
+
+    def store(self, request: httpx.Request, response: httpx.Response, body: bytes) -> CacheEntry:
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROP_HEADERS]
+        entry = CacheEntry(
+            path=self._entry_path(request),
+            status_code=response.status_code,
+            headers=headers,
+            stored_at=time.time(),
+            body=body,
+        )
+        self._write(entry)
+        self._evict()
+        return entry
+
+    def _write(self, entry: CacheEntry) -> None:
+        meta = {"status_code": entry.status_code, "headers": entry.headers, "stored_at": entry.stored_at}
+        header = json.dumps(meta).encode() + b"\n"
+        directory = os.path.dirname(entry.path)
+        try:
+            replaced = os.stat(entry.path).st_size
+        except OSError:
+            replaced = 0
+        try:
+            _makedirs_private(directory)
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(entry.body)
+            os.replace(tmp, entry.path)
+        except OSError as exc:
+            logger.debug(f"Could not write cache entry {entry.path}: {exc}")
+            return
+        if self._size is not None:
+            self._size += len(header) + len(entry.body) - replaced
+
+    def invalidate(self, path: str) -> None:
+        """Drop every cached response in the scope of an API path, for all tokens."""
+        scope_dir = _hash(scope_of(path))[:16]
+        try:
+            token_dirs = os.listdir(self.root)
+        except OSError:
+            return
+        for token_dir in token_dirs:
+            shutil.rmtree(os.path.join(self.root, token_dir, scope_dir), ignore_errors=True)
+        self._size = None
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._size = None
+
+    def _evict(self) -> None:
+        """Scan the tree once, then again only when the running size exceeds the budget."""
+        if self._size is not None and self._size <= self.max_bytes:
+            return
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, full))
+                total += st.st_size
+        self._size = total
+        if total <= self.max_bytes:
+            return
+        # Evict least recently used entries down to 90% of the budget.
+        target = self.max_bytes * 0.9
+        for _, size, full in sorted(entries):
+            if total <= target:
+                break
+            with contextlib.suppress(OSError):
+                os.unlink(full)
+                total -= size
+        self._size = total
+
+
+class CachingTransport(httpx.BaseTransport):
+    """httpx transport that serves GETs from a `ResponseCache`.
+
+    The cache mode and TTL are read from the context on every request, so a
+    pooled client honours per-invocation `--no-cache`/`--cache-only` flags.
+    """
+
+    def __init__(self, inner: httpx.BaseTransport, cache: ResponseCache, ctx: Context) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.ctx = ctx
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            response = self.inner.handle_request(request)
+            if response.status_code < 400:
+                self.cache.invalidate(_raw_path(request))
+            return response
+
+        mode = self.ctx.cache_mode
+        if mode == "off" or not self._cacheable(request):
+            return self.inner.handle_request(request)
+
+        entry = self.cache.load(request)
+        fresh = entry is not None and time.time() - entry.stored_at < self.ctx.cache_ttl
+        # `Cache-Control: no-cache` on the request forces revalidation of a fresh entry.
+        if fresh and "no-cache" in request.headers.get("cache-control", ""):
+            fresh = False
+        if entry is not None and (mode == "only" or fresh):
+            self.cache.touch(entry)
+            return _tagged(entry.to_response(request), "hit")
+        if mode == "only":
+            return _tagged(
+                httpx.Response(
+                    504, json={"message": f"{request.url.path} is not cached (--cache-only)"}, request=request
+                ),
+                "miss",
+            )
+
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.inner.handle_request(request)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.touch(entry, revalidated=True)
+            return _tagged(entry.to_response(request), "revalidated", response)
+        if response.status_code != 200 or not self._storable(response):
+            return _tagged(response, "miss")
+
+        body = response.read()
+        response.close()
+        return _tagged(self.cache.store(request, response, body).to_response(request), "miss", response)
+
+    @staticmethod
+    def _cacheable(request: httpx.Request) -> bool:
+        # Job traces are streamed and ranged; they never go through the cache.
+        if "range" in request.headers or request.url.path.endswith("/trace"):
+            return False
+        # Sent by callers whose responses would only evict useful entries (see `mirror.sync`).
+        if "no-store" in request.headers.get("cache-control", ""):
+            return False
+        return SECRET_RESOURCES.isdisjoint(_raw_path(request).split("/"))
+
+    def _storable(self, response: httpx.Response) -> bool:
+        directives = {d.strip().split("=", 1)[0].lower() for d in response.headers.get("cache-control", "").split(",")}
+        if directives & {"no-store", "private"}:
+            return False
+        if not (response.headers.get("etag") or response.headers.get("last-modified") or self.ctx.cache_ttl > 0):
+            return False
+        length = response.headers.get("content-length")
+        return length is None or int(length) <= self.cache.max_bytes // 10
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def _tagged(response: httpx.Response, outcome: str, origin: httpx.Response | None = None) -> httpx.Response:
+    """Record how the cache answered (for `--trace`), keeping the extensions of the network response."""
+    if origin is not None and origin is not response:
+        response.extensions.update(origin.extensions)
+    response.extensions["qodev_cache"] = outcome
+    return response
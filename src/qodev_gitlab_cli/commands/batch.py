@@ -0,0 +1,33 @@
+"""Batch command — many invocations in one process."""
+
+from __future__ import annotations
+
+import sys
+from typing import Annotated
+
+from cyclopts import Parameter
+
+from qodev_gitlab_cli.output import output_json_line
+
+
+def batch(
+    *,
+    parallel: Annotated[
+        int, Parameter(name="--parallel", help="Read-only commands to run at once (1 = one after another)")
+    ] = 1,
+) -> None:
+    """Run NDJSON commands from stdin, writing one NDJSON result per command.
+
+    Each line is an object such as {"id": "a", "cmd": ["mrs", "get", "12"], "project": "g/p"};
+    each result carries the request's id and the command's exit code as `code`.
+    """
+    from qodev_gitlab_cli.batch import run_batch
+
+    out = sys.stdout
+
+    def write(record: dict) -> None:
+        output_json_line(record)
+        out.flush()
+
+    summary = run_batch(sys.stdin, parallel=parallel, write=write)
+    output_json_line({"_meta": summary})
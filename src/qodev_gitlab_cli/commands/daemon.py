@@ -0,0 +1,71 @@
+"""Daemon management commands."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from typing import Annotated
+
+from cyclopts import App, Parameter
+
+from qodev_gitlab_cli import daemon as _daemon
+from qodev_gitlab_cli.context import ctx
+from qodev_gitlab_cli.output import error, output
+
+daemon_app = App(name="daemon", help="Run a background daemon that keeps the CLI warm.")
+
+
+@daemon_app.command
+def start(
+    *,
+    detach: Annotated[bool, Parameter(name="--detach", help="Run in the background", negative="")] = False,
+    idle_timeout: Annotated[
+        int, Parameter(name="--idle-timeout", help="Exit after this many idle seconds")
+    ] = _daemon.DEFAULT_IDLE_TIMEOUT,
+) -> None:
+    """Start the daemon (foreground unless --detach)."""
+    if not _daemon.supported():
+        error("The daemon requires Unix domain sockets.", ctx=ctx, code="configuration", exit_code=84)
+    path = _daemon.socket_path()
+    if _daemon.running(path):
+        error(f"Daemon already running on {path}.", ctx=ctx, code="configuration", exit_code=84)
+
+    if not detach:
+        _daemon.serve(path, idle_timeout=idle_timeout)
+        return
+
+    subprocess.Popen(
+        [sys.executable, "-m", "qodev_gitlab_cli", "daemon", "start", "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        result = _daemon.request({"op": "status"}, path)
+        if result is not None:
+            output(result, ctx=ctx)
+            return
+        time.sleep(0.05)
+    error("Daemon did not start within 10 seconds.", ctx=ctx)
+
+
+@daemon_app.command
+def stop() -> None:
+    """Stop the running daemon."""
+    # Wait for a command the daemon is running to finish.
+    result = _daemon.request({"op": "shutdown"}, ready_timeout=None)
+    if result is None:
+        error("Daemon is not running.", ctx=ctx, code="not_found", exit_code=81)
+    output(result, ctx=ctx)
+
+
+@daemon_app.command
+def status() -> None:
+    """Show daemon status."""
+    result = _daemon.request({"op": "status"}, ready_timeout=None)
+    if result is None:
+        error("Daemon is not running.", ctx=ctx, code="not_found", exit_code=81)
+    output(result, ctx=ctx)
@@ -2,40 +2,71 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Annotated
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.api import paginate, project_endpoint
+from qodev_gitlab_cli.bulk import collect_ids, output_many
 from qodev_gitlab_cli.context import ctx
 from qodev_gitlab_cli.formatters.issues import format_issue_detail, format_issue_list, format_note_list
-from qodev_gitlab_cli.output import output, output_list
+from qodev_gitlab_cli.output import output, output_pages
 
 issues_app = App(name="issues", help="Manage issues.")
 
+# Sent unless `--state` or a `--where` equality sets them.
+DEFAULT_PARAMS = {"state": "opened"}
+
 
 @issues_app.command
 def list(
     *,
-    state: Annotated[str, Parameter(name="--state", help="Filter: opened, closed, all")] = "opened",
+    state: Annotated[str | None, Parameter(name="--state", help="Filter: opened (default), closed, all")] = None,
     labels: Annotated[str | None, Parameter(name="--labels", help="Filter by labels")] = None,
     milestone: Annotated[str | None, Parameter(name="--milestone", help="Filter by milestone")] = None,
 ) -> None:
     """List issues."""
     client = ctx.client()
+    params = {"state": state} if state else {}
+    if labels:
+        params["labels"] = labels
+    if milestone:
+        params["milestone"] = milestone
+    if fanout.is_multi(ctx):
+        fanout.output_fanout(client, "issues", params, ctx=ctx, format_fn=format_issue_list, defaults=DEFAULT_PARAMS)
+        return
     project = ctx.resolve_project()
-    items = client.get_issues(project, state=state, labels=labels, milestone=milestone)
-    output_list(items=items, ctx=ctx, format_fn=format_issue_list)
+    pages = paginate(client, project_endpoint(project, "issues"), params, ctx=ctx, defaults=DEFAULT_PARAMS)
+    output_pages(pages, ctx=ctx, format_fn=format_issue_list)
 
 
 @issues_app.command
 def get(
-    iid: Annotated[int, Parameter(help="Issue IID")],
+    iid: Annotated[Sequence[int] | None, Parameter(help="Issue IID(s)")] = None,
+    *,
+    ids_from: Annotated[
+        str | None,
+        Parameter(name="--ids-from", help="Read more IIDs from a file ('-' for stdin)", allow_leading_hyphen=True),
+    ] = None,
 ) -> None:
-    """Get issue details."""
+    """Get issue details. Several IIDs are fetched concurrently into one list."""
+    ids = collect_ids(iid, ids_from, ctx=ctx)
     client = ctx.client()
     project = ctx.resolve_project()
-    result = client.get_issue(project, iid)
-    output(result, ctx=ctx, format_fn=format_issue_detail)
+    if len(ids) == 1 and ids_from is None:
+        result = client.get_issue(project, ids[0])
+        output(result, ctx=ctx, format_fn=format_issue_detail)
+        return
+    output_many(
+        lambda i: client.get_issue(project, i),
+        ids,
+        ctx=ctx,
+        key="iid",
+        format_fn=format_issue_list,
+        label=lambda i: f"#{i}",
+    )
 
 
 @issues_app.command
@@ -98,5 +129,5 @@ def notes(
     """List comments/notes on an issue."""
     client = ctx.client()
     project = ctx.resolve_project()
-    items = client.get_issue_notes(project, iid)
-    output_list(items=items, ctx=ctx, format_fn=format_note_list)
+    pages = paginate(client, project_endpoint(project, "issues", iid, "notes"), ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_note_list)
@@ -2,45 +2,125 @@
 
 from __future__ import annotations
 
-from typing import Annotated
+from collections.abc import Callable, Sequence
+from typing import Annotated, Any
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli.api import STREAM_CHUNK_SIZE, project_endpoint, stream
+from qodev_gitlab_cli.bulk import collect_ids, output_many
 from qodev_gitlab_cli.context import ctx
-from qodev_gitlab_cli.formatters.jobs import format_job_detail
-from qodev_gitlab_cli.output import output, output_markdown
+from qodev_gitlab_cli.formatters.jobs import format_job_detail, format_job_list, format_log_saved
+from qodev_gitlab_cli.output import output, output_json_stream, output_markdown, output_raw
 
 jobs_app = App(name="jobs", help="Manage jobs.")
 
 
 @jobs_app.command
 def get(
-    id: Annotated[int, Parameter(help="Job ID")],
+    id: Annotated[Sequence[int] | None, Parameter(help="Job ID(s)")] = None,
+    *,
+    ids_from: Annotated[
+        str | None,
+        Parameter(name="--ids-from", help="Read more IDs from a file ('-' for stdin)", allow_leading_hyphen=True),
+    ] = None,
 ) -> None:
-    """Get job details."""
+    """Get job details. Several IDs are fetched concurrently into one list."""
+    ids = collect_ids(id, ids_from, ctx=ctx)
     client = ctx.client()
     project = ctx.resolve_project()
-    result = client.get_job(project, id)
-    output(result, ctx=ctx, format_fn=format_job_detail)
+    if len(ids) == 1 and ids_from is None:
+        result = client.get_job(project, ids[0])
+        output(result, ctx=ctx, format_fn=format_job_detail)
+        return
+    output_many(
+        lambda i: client.get_job(project, i),
+        ids,
+        ctx=ctx,
+        key="id",
+        format_fn=format_job_list,
+        label=lambda i: f"#{i}",
+    )
 
 
 @jobs_app.command
 def log(
     id: Annotated[int, Parameter(help="Job ID")],
+    *,
+    tail: Annotated[int | None, Parameter(name="--tail", help="Only print the last N lines")] = None,
+    follow: Annotated[
+        bool, Parameter(name="--follow", help="Stream new output until the job finishes", negative="")
+    ] = False,
+    interval: Annotated[float, Parameter(name="--interval", help="Poll interval in seconds for --follow")] = 2.0,
+    raw: Annotated[bool, Parameter(name="--raw", help="Stream the raw trace to stdout", negative="")] = False,
+    output_file: Annotated[str | None, Parameter(name="--output", help="Stream the raw trace to a file")] = None,
 ) -> None:
-    """Get job log output."""
+    """Get job log output.
+
+    With --raw, --tail or --follow the raw trace is written straight to stdout
+    (no markdown or JSON wrapping); --output writes it to a file instead.
+    """
     client = ctx.client()
     project = ctx.resolve_project()
-    log_text = client.get_job_log(project, id)
+    endpoint = project_endpoint(project, "jobs", id, "trace")
 
-    if ctx.json_mode:
-        from qodev_gitlab_cli.output import output_json
-
-        output_json({"job_id": id, "log": log_text})
+    if output_file is not None:
+        with open(output_file, "wb") as f:
+            written = _write_log(client, project, id, endpoint, f.write, tail=tail, follow=follow, interval=interval)
+        output({"job_id": id, "path": output_file, "bytes": written}, ctx=ctx, format_fn=format_log_saved)
+    elif raw or tail is not None or follow:
+        _write_log(client, project, id, endpoint, output_raw, tail=tail, follow=follow, interval=interval)
+    elif ctx.json_mode:
+        with stream(client, endpoint) as response:
+            output_json_stream({"job_id": id}, "log", response.iter_text(STREAM_CHUNK_SIZE), ctx=ctx)
     else:
+        log_text = client.get_job_log(project, id)
         output_markdown(f"# Job #{id} Log\n\n```\n{log_text}\n```")
 
 
+def _write_log(
+    client: Any,
+    project: str,
+    job_id: int,
+    endpoint: str,
+    write: Callable[[bytes], Any],
+    *,
+    tail: int | None,
+    follow: bool,
+    interval: float,
+) -> int:
+    """Copy the raw trace (or its tail / live updates) to write; returns bytes written."""
+    written = 0
+
+    def sink(data: bytes) -> None:
+        nonlocal written
+        write(data)
+        written += len(data)
+
+    if tail is None and not follow:
+        with stream(client, endpoint) as response:
+            for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+                sink(chunk)
+        return written
+
+    from qodev_gitlab_cli import traces
+
+    offset = 0
+    if tail is not None:
+        data, offset = traces.tail(client, endpoint, tail)
+        sink(data)
+    if follow:
+        traces.follow(
+            client,
+            endpoint,
+            offset=offset,
+            is_finished=lambda: client.get_job(project, job_id).get("status") in traces.TERMINAL_JOB_STATUSES,
+            write=sink,
+            interval=interval,
+        )
+    return written
+
+
 @jobs_app.command
 def retry(
     id: Annotated[int, Parameter(help="Job ID")],
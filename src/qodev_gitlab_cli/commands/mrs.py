@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from functools import partial
 from typing import Annotated
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.api import paginate, project_endpoint
+from qodev_gitlab_cli.bulk import collect_ids, output_many
 from qodev_gitlab_cli.context import ctx
 from qodev_gitlab_cli.formatters.mrs import (
     format_approval_detail,
@@ -13,33 +18,83 @@ from qodev_gitlab_cli.formatters.mrs import (
     format_discussion_list,
     format_mr_detail,
     format_mr_list,
+    format_mr_list_enriched,
 )
-from qodev_gitlab_cli.output import output, output_list, output_markdown
+from qodev_gitlab_cli.graphql import enrich_mr_pages, enrich_mrs
+from qodev_gitlab_cli.output import output, output_markdown, output_pages
 
 mrs_app = App(name="mrs", help="Manage merge requests.")
 
+# Sent unless `--state` or a `--where` equality sets them.
+DEFAULT_PARAMS = {"state": "opened"}
+
 
 @mrs_app.command
 def list(
     *,
-    state: Annotated[str, Parameter(name="--state", help="Filter by state: opened, closed, merged, all")] = "opened",
+    state: Annotated[
+        str | None, Parameter(name="--state", help="Filter by state: opened (default), closed, merged, all")
+    ] = None,
+    enrich: Annotated[
+        bool,
+        Parameter(
+            name="--enrich",
+            help="Add pipeline status, approvals, unresolved discussions and conflicts (one GraphQL query per page)",
+            negative="",
+        ),
+    ] = False,
 ) -> None:
     """List merge requests."""
     client = ctx.client()
+    format_fn = format_mr_list_enriched if enrich else format_mr_list
+    params = {"state": state} if state else {}
+    if fanout.is_multi(ctx):
+        fanout.output_fanout(
+            client,
+            "merge_requests",
+            params,
+            ctx=ctx,
+            format_fn=format_fn,
+            enrich=partial(enrich_mrs, client) if enrich else None,
+            defaults=DEFAULT_PARAMS,
+        )
+        return
     project = ctx.resolve_project()
-    items = client.get_merge_requests(project, state=state)
-    output_list(items=items, ctx=ctx, format_fn=format_mr_list)
+    # Enrichment looks MRs up by project path and IID; `project` may be a numeric ID.
+    keep = ("iid", "references.full") if enrich else ()
+    pages = paginate(
+        client, project_endpoint(project, "merge_requests"), params, ctx=ctx, keep=keep, defaults=DEFAULT_PARAMS
+    )
+    if enrich:
+        pages = enrich_mr_pages(client, pages, project=project)
+    output_pages(pages, ctx=ctx, format_fn=format_fn, keep=keep)
 
 
 @mrs_app.command
 def get(
-    iid: Annotated[int, Parameter(help="Merge request IID")],
+    iid: Annotated[Sequence[int] | None, Parameter(help="Merge request IID(s)")] = None,
+    *,
+    ids_from: Annotated[
+        str | None,
+        Parameter(name="--ids-from", help="Read more IIDs from a file ('-' for stdin)", allow_leading_hyphen=True),
+    ] = None,
 ) -> None:
-    """Get merge request details."""
+    """Get merge request details. Several IIDs are fetched concurrently into one list."""
+    ids = collect_ids(iid, ids_from, ctx=ctx)
     client = ctx.client()
     project = ctx.resolve_project()
-    result = client.get_merge_request(project, iid)
-    output(result, ctx=ctx, format_fn=format_mr_detail)
+    if len(ids) == 1 and ids_from is None:
+        result = client.get_merge_request(project, ids[0])
+        output(result, ctx=ctx, format_fn=format_mr_detail)
+        return
+    output_many(
+        lambda i: client.get_merge_request(project, i),
+        ids,
+        ctx=ctx,
+        key="iid",
+        format_fn=format_mr_list,
+        label=lambda i: f"!{i}",
+    )
 
 
 @mrs_app.command
@@ -128,8 +183,8 @@ def discussions(
     """List discussions on a merge request."""
     client = ctx.client()
     project = ctx.resolve_project()
-    items = client.get_mr_discussions(project, iid)
-    output_list(items=items, ctx=ctx, format_fn=format_discussion_list)
+    pages = paginate(client, project_endpoint(project, "merge_requests", iid, "discussions"), ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_discussion_list)
 
 
 @mrs_app.command
@@ -142,9 +197,7 @@ def changes(
     result = client.get_mr_changes(project, iid)
 
     if ctx.json_mode:
-        from qodev_gitlab_cli.output import output_json
-
-        output_json(result)
+        output(result, ctx=ctx)
     else:
         diffs = result.get("changes", [])
         lines = [f"# Changes for !{iid}", ""]
@@ -162,8 +215,8 @@ def commits(
     """List commits in a merge request."""
     client = ctx.client()
     project = ctx.resolve_project()
-    items = client.get_mr_commits(project, iid)
-    output_list(items=items, ctx=ctx, format_fn=format_commit_list)
+    pages = paginate(client, project_endpoint(project, "merge_requests", iid, "commits"), ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_commit_list)
 
 
 @mrs_app.command
@@ -197,7 +250,7 @@ def pipelines(
     """List pipelines for a merge request."""
     client = ctx.client()
     project = ctx.resolve_project()
-    items = client.get_mr_pipelines(project, iid)
+    pages = paginate(client, project_endpoint(project, "merge_requests", iid, "pipelines"), ctx=ctx)
     from qodev_gitlab_cli.formatters.pipelines import format_pipeline_list
 
-    output_list(items=items, ctx=ctx, format_fn=format_pipeline_list)
+    output_pages(pages, ctx=ctx, format_fn=format_pipeline_list)
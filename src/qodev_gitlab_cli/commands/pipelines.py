@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Sequence
 from typing import Annotated
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.api import MAX_PER_PAGE, paginate, project_endpoint
+from qodev_gitlab_cli.bulk import collect_ids, output_many
 from qodev_gitlab_cli.context import ctx
+from qodev_gitlab_cli.errors import EXIT_VALIDATION
 from qodev_gitlab_cli.formatters.jobs import format_job_list
 from qodev_gitlab_cli.formatters.pipelines import format_pipeline_detail, format_pipeline_list, format_wait_result
-from qodev_gitlab_cli.output import output, output_list
+from qodev_gitlab_cli.output import error, output, output_json_line, output_pages
 
 pipelines_app = App(name="pipelines", help="Manage pipelines.")
 
@@ -18,24 +24,46 @@ pipelines_app = App(name="pipelines", help="Manage pipelines.")
 def list(
     *,
     ref: Annotated[str | None, Parameter(name="--ref", help="Filter by branch/tag")] = None,
-    limit: Annotated[int, Parameter(name="--limit", help="Max pipelines to return")] = 20,
+    limit: Annotated[int | None, Parameter(name="--limit", help="Max pipelines to return (max 100)")] = None,
 ) -> None:
     """List pipelines."""
+    if limit is not None and not 1 <= limit <= MAX_PER_PAGE:
+        error(f"--limit must be between 1 and {MAX_PER_PAGE}.", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
     client = ctx.client()
+    params = {"ref": ref} if ref else {}
+    if fanout.is_multi(ctx):
+        fanout.output_fanout(client, "pipelines", params, ctx=ctx, format_fn=format_pipeline_list, per_page=limit)
+        return
     project = ctx.resolve_project()
-    items = client.get_pipelines(project, ref=ref, per_page=limit, max_pages=1)
-    output_list(items=items, ctx=ctx, format_fn=format_pipeline_list)
+    pages = paginate(client, project_endpoint(project, "pipelines"), params, ctx=ctx, per_page=limit)
+    output_pages(pages, ctx=ctx, format_fn=format_pipeline_list)
 
 
 @pipelines_app.command
 def get(
-    id: Annotated[int, Parameter(help="Pipeline ID")],
+    id: Annotated[Sequence[int] | None, Parameter(help="Pipeline ID(s)")] = None,
+    *,
+    ids_from: Annotated[
+        str | None,
+        Parameter(name="--ids-from", help="Read more IDs from a file ('-' for stdin)", allow_leading_hyphen=True),
+    ] = None,
 ) -> None:
-    """Get pipeline details."""
+    """Get pipeline details. Several IDs are fetched concurrently into one list."""
+    ids = collect_ids(id, ids_from, ctx=ctx)
     client = ctx.client()
     project = ctx.resolve_project()
-    result = client.get_pipeline(project, id)
-    output(result, ctx=ctx, format_fn=format_pipeline_detail)
+    if len(ids) == 1 and ids_from is None:
+        result = client.get_pipeline(project, ids[0])
+        output(result, ctx=ctx, format_fn=format_pipeline_detail)
+        return
+    output_many(
+        lambda i: client.get_pipeline(project, i),
+        ids,
+        ctx=ctx,
+        key="id",
+        format_fn=format_pipeline_list,
+        label=lambda i: f"#{i}",
+    )
 
 
 @pipelines_app.command
@@ -45,19 +73,50 @@ def jobs(
     """List jobs for a pipeline."""
     client = ctx.client()
     project = ctx.resolve_project()
-    items = client.get_pipeline_jobs(project, id)
-    output_list(items=items, ctx=ctx, format_fn=format_job_list)
+    pages = paginate(client, project_endpoint(project, "pipelines", id, "jobs"), ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_job_list)
 
 
 @pipelines_app.command
 def wait(
-    id: Annotated[int, Parameter(help="Pipeline ID")],
+    id: Annotated[Sequence[int], Parameter(help="Pipeline ID(s)")],
     *,
     timeout: Annotated[int, Parameter(name="--timeout", help="Timeout in seconds")] = 3600,
-    interval: Annotated[int, Parameter(name="--interval", help="Check interval in seconds")] = 10,
+    interval: Annotated[
+        float | None, Parameter(name="--interval", help="Fixed check interval in seconds (default: adaptive)")
+    ] = None,
+    max_interval: Annotated[
+        float, Parameter(name="--max-interval", help="Upper bound for adaptive polling in seconds")
+    ] = 30,
+    fail_fast: Annotated[
+        bool, Parameter(name="--fail-fast", help="Return as soon as any job fails", negative="")
+    ] = False,
 ) -> None:
-    """Wait for a pipeline to complete."""
+    """Wait for one or more pipelines to complete."""
+    from qodev_gitlab_cli.waiting import wait_for_pipelines
+
     client = ctx.client()
     project = ctx.resolve_project()
-    result = client.wait_for_pipeline(project, id, timeout_seconds=timeout, check_interval=interval)
-    output(result, ctx=ctx, format_fn=format_wait_result)
+    streaming = ctx.output_format == "ndjson"
+
+    def emit(result: dict) -> None:
+        # NDJSON: one line per pipeline, in completion order.
+        output_json_line(result)
+        sys.stdout.flush()
+
+    results = wait_for_pipelines(
+        client,
+        project,
+        [*dict.fromkeys(id)],
+        timeout=timeout,
+        interval=interval,
+        fail_fast=fail_fast,
+        max_interval=max_interval,
+        on_result=emit if streaming else None,
+    )
+    if streaming:
+        return
+    if len(results) == 1:
+        output(results[0], ctx=ctx, format_fn=format_wait_result)
+    else:
+        output(results, ctx=ctx, format_fn=lambda items: "\n\n---\n\n".join(map(format_wait_result, items)))
@@ -6,9 +6,10 @@ from typing import Annotated
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli.api import paginate
 from qodev_gitlab_cli.context import ctx
 from qodev_gitlab_cli.formatters.projects import format_project_detail, format_project_list
-from qodev_gitlab_cli.output import output, output_list
+from qodev_gitlab_cli.output import output, output_pages
 
 projects_app = App(name="projects", help="Manage projects.")
 
@@ -20,8 +21,8 @@ def list(
 ) -> None:
     """List projects."""
     client = ctx.client()
-    items = client.get_projects(owned=owned)
-    output_list(items=items, ctx=ctx, format_fn=format_project_list)
+    pages = paginate(client, "/projects", {"membership": True, "owned": owned}, ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_project_list)
 
 
 @projects_app.command
@@ -6,9 +6,10 @@ from typing import Annotated
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli.api import paginate, project_endpoint
 from qodev_gitlab_cli.context import ctx
 from qodev_gitlab_cli.formatters.releases import format_release_detail, format_release_list
-from qodev_gitlab_cli.output import output, output_list
+from qodev_gitlab_cli.output import output, output_pages
 
 releases_app = App(name="releases", help="Manage releases.")
 
@@ -18,8 +19,9 @@ def list() -> None:
     """List releases."""
     client = ctx.client()
     project = ctx.resolve_project()
-    items = client.get_releases(project)
-    output_list(items=items, ctx=ctx, format_fn=format_release_list)
+    params = {"order_by": "released_at", "sort": "desc"}
+    pages = paginate(client, project_endpoint(project, "releases"), params, ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_release_list)
 
 
 @releases_app.command
@@ -0,0 +1,84 @@
+"""Search command — ranked full-text search over issues, MRs and their notes."""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Annotated, Literal
+
+from cyclopts import Parameter
+
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.api import Page
+from qodev_gitlab_cli.context import ctx
+from qodev_gitlab_cli.errors import EXIT_NOT_FOUND, EXIT_VALIDATION
+from qodev_gitlab_cli.formatters.generic import select_fields
+from qodev_gitlab_cli.formatters.search import format_search_results
+from qodev_gitlab_cli.output import error, output_pages
+
+# Seconds after which search points out that a project's mirror may be out of date.
+STALE_AFTER = 3600
+
+
+def search(
+    query: Annotated[str, Parameter(help='Words (prefix*), "exact phrases" and OR')],
+    *,
+    type: Annotated[
+        Literal["all", "issue", "mr"], Parameter(name="--type", help="Search only issues or merge requests")
+    ] = "all",
+    state: Annotated[str | None, Parameter(name="--state", help="Filter by state: opened, closed, merged")] = None,
+    sync: Annotated[
+        bool, Parameter(name="--sync", help="Bring the mirror up to date first (fetches only changes)", negative="")
+    ] = False,
+) -> None:
+    """Search titles, descriptions and notes of issues and MRs in the local mirror.
+
+    The mirror is searched as is; --sync fetches the changed issues and MRs first.
+    """
+    from qodev_gitlab_cli.mirror import NOTED, Mirror, client_mirror_path
+    from qodev_gitlab_cli.mirror import sync as sync_project
+    from qodev_gitlab_cli.search import TYPES, SearchError
+    from qodev_gitlab_cli.search import search as run_search
+
+    client = ctx.client()
+    projects = fanout.select_projects(client, ctx) if fanout.is_multi(ctx) else [ctx.resolve_project()]
+    if sync:
+        if ctx.offline:
+            error("--sync needs GitLab; drop --offline.", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+        for project in projects:
+            sync_project(client, project, ctx=ctx, kinds=NOTED, bypass_cache=ctx.cache_mode == "default")
+
+    with Mirror(client_mirror_path(client)) as mirror:
+        project_ids = []
+        for project in projects:
+            found = mirror.project(project)
+            if found is None:
+                error(
+                    f"{project} is not mirrored; run `qodev-gitlab sync -p {project}`.",
+                    ctx=ctx,
+                    code="not_found",
+                    exit_code=EXIT_NOT_FOUND,
+                )
+            project_ids.append(found[0])
+            synced_at = mirror.synced_at(found[0])
+            if not sync and synced_at is not None and time.time() - synced_at > STALE_AFTER:
+                hours = (time.time() - synced_at) / 3600
+                print(f"{project} was last synced {hours:.0f} h ago; pass --sync to refresh it.", file=sys.stderr)
+        try:
+            items, total = run_search(
+                mirror,
+                query,
+                project_ids,
+                kinds=tuple(TYPES.values()) if type == "all" else (TYPES[type],),
+                state=state,
+                limit=-1 if ctx.all_pages else ctx.limit,
+                offset=0 if ctx.all_pages else (ctx.page - 1) * ctx.limit,
+            )
+        except SearchError as exc:
+            error(str(exc), ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+
+    if ctx.fields:
+        items = select_fields(items, (*ctx.fields, *(ctx.query.fields if ctx.query else ())))
+    next_page = ctx.page + 1 if ctx.page * ctx.limit < total else None
+    page = Page(items=items, page=ctx.page, per_page=ctx.limit, total=total, next_page=next_page)
+    output_pages([page], ctx=ctx, format_fn=format_search_results)
@@ -0,0 +1,32 @@
+"""Status command — everything about the current branch in one call."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from cyclopts import Parameter
+
+from qodev_gitlab_cli.context import ctx
+from qodev_gitlab_cli.errors import EXIT_VALIDATION
+from qodev_gitlab_cli.formatters.status import format_branch_status
+from qodev_gitlab_cli.output import error, output
+
+
+def status(
+    *,
+    branch: Annotated[str | None, Parameter(name="--branch", help="Branch to report on (default: current)")] = None,
+) -> None:
+    """Show the merge request, pipeline, jobs, approvals and unresolved discussions for a branch."""
+    from qodev_gitlab_cli.status import branch_status
+
+    client = ctx.client()
+    project = ctx.resolve_project()
+    if branch is None:
+        from qodev_gitlab_cli.project import get_current_branch
+
+        branch = get_current_branch()
+        if not branch or branch == "HEAD":
+            error(
+                "Could not detect current branch. Use --branch.", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION
+            )
+    output(branch_status(client, project, branch), ctx=ctx, format_fn=format_branch_status)
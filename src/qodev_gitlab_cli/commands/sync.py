@@ -0,0 +1,31 @@
+"""Sync command — mirror projects into the local database used by --offline."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from cyclopts import Parameter
+
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.context import ctx
+from qodev_gitlab_cli.errors import EXIT_VALIDATION
+from qodev_gitlab_cli.formatters.sync import format_sync_list
+from qodev_gitlab_cli.output import error, output_list
+
+
+def sync(
+    *,
+    full: Annotated[
+        bool, Parameter(name="--full", help="Re-fetch everything and drop records deleted on GitLab", negative="")
+    ] = False,
+) -> None:
+    """Mirror issues, merge requests with their notes, pipelines and releases; later runs fetch only changes."""
+    from qodev_gitlab_cli.mirror import sync as sync_project
+
+    if ctx.offline:
+        error("sync needs GitLab; drop --offline.", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+    client = ctx.client()
+    projects = fanout.select_projects(client, ctx) if fanout.is_multi(ctx) else [ctx.resolve_project()]
+    bypass_cache = ctx.cache_mode == "default"
+    results = [sync_project(client, project, ctx=ctx, full=full, bypass_cache=bypass_cache) for project in projects]
+    output_list(items=results, limit=len(results), ctx=ctx, format_fn=format_sync_list)
@@ -2,24 +2,37 @@
 
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, Any
 
 from cyclopts import App, Parameter
 
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.api import paginate, project_endpoint
 from qodev_gitlab_cli.context import ctx
 from qodev_gitlab_cli.formatters.variables import format_variable_detail, format_variable_list
-from qodev_gitlab_cli.output import output, output_list
+from qodev_gitlab_cli.output import output, output_pages
 
 variables_app = App(name="variables", help="Manage CI/CD variables.")
 
+# Metadata `list` prints; values are never listed.
+LIST_FIELDS = ("key", "variable_type", "protected", "masked", "raw", "environment_scope", "description")
+
+
+def _sanitize(var: dict[str, Any]) -> dict[str, Any]:
+    # Only drops fields: `--fields` has already trimmed the item.
+    return {field: var[field] for field in LIST_FIELDS if field in var}
+
 
 @variables_app.command
 def list() -> None:
     """List CI/CD variables (values hidden)."""
     client = ctx.client()
+    if fanout.is_multi(ctx):
+        fanout.output_fanout(client, "variables", ctx=ctx, format_fn=format_variable_list, transform=_sanitize)
+        return
     project = ctx.resolve_project()
-    items = client.list_project_variables(project)
-    output_list(items=items, ctx=ctx, format_fn=format_variable_list)
+    pages = paginate(client, project_endpoint(project, "variables"), ctx=ctx)
+    output_pages(pages, ctx=ctx, format_fn=format_variable_list, transform=_sanitize)
 
 
 @variables_app.command
@@ -52,9 +65,7 @@ def set(
     var, action = client.set_project_variable(project, key, value, protected=protected, masked=masked)
 
     if ctx.json_mode:
-        from qodev_gitlab_cli.output import output_json
-
-        output_json({"variable": var, "action": action})
+        output({"variable": var, "action": action}, ctx=ctx)
     else:
         from qodev_gitlab_cli.output import output_markdown
 
@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import contextvars
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
 
-from qodev_gitlab_api import GitLabClient
+if TYPE_CHECKING:
+    from qodev_gitlab_api import GitLabClient
+
+    from qodev_gitlab_cli.query import Query
+    from qodev_gitlab_cli.tracing import Tracer
+
+
+_client_lock = threading.Lock()
 
 
 @dataclass
@@ -12,26 +26,81 @@ class Context:
     """Shared state passed from the meta launcher to every command."""
 
     json_mode: bool = False
+    output_format: str = "markdown"  # "markdown", "table", "tsv", "json" or "ndjson"
+    compact: bool = False  # JSON without indentation
+    fields: tuple[str, ...] = ()  # --fields projection (dot notation); empty keeps everything
+    query: Query | None = None  # compiled --where/--sort/--top
     token: str | None = None
     base_url: str | None = None
     project: str | None = None
+    projects_from: str | None = None
     limit: int = 25
     page: int = 1
+    all_pages: bool = False
+    concurrency: int = 4
+    cache_mode: str = "default"  # "default", "off" (--no-cache) or "only" (--cache-only)
+    cache_ttl: float = 0.0
+    offline: bool = False  # answer mirrored GETs from the local mirror (see `qodev_gitlab_cli.mirror`)
+    tracer: Tracer | None = None  # set by --trace
+    retries: int = 3  # retries of transient failures (see `qodev_gitlab_cli.retry`)
+    hedge: bool = False  # hedge slow GETs with a second request
+
+    # Clients are kept across invocations so a long-lived process
+    # (see `qodev_gitlab_cli.daemon`) reuses warm connections.
+    _clients: dict[tuple[str | None, str | None], GitLabClient] = field(default_factory=dict, repr=False)
 
     def client(self) -> GitLabClient:
+        token = self.token or os.getenv("GITLAB_TOKEN")
+        base_url = self.base_url or os.getenv("GITLAB_BASE_URL") or os.getenv("GITLAB_URL")
+        key = (token, base_url)
+        if key in self._clients:
+            return self._clients[key]
+        # Concurrent batch commands must not each create (and probe) a client.
+        with _client_lock:
+            if key not in self._clients:
+                from qodev_gitlab_cli.tracing import span
+
+                with span("client.init"):
+                    self._clients[key] = self._create_client()
+        return self._clients[key]
+
+    def _create_client(self) -> GitLabClient:
+        from qodev_gitlab_api import GitLabClient
+
         kwargs: dict = {}
         if self.token:
             kwargs["token"] = self.token
         if self.base_url:
             kwargs["base_url"] = self.base_url
-        return GitLabClient(**kwargs)
+        if self.cache_mode == "only" or self.offline:
+            # The connectivity probe would defeat offline use of the cache or mirror.
+            kwargs["validate"] = False
+        gl = GitLabClient(**kwargs)
+
+        from qodev_gitlab_cli.transport import install_transport
+
+        # Clients may be shared between contexts (see `qodev_gitlab_cli.batch`),
+        # so the transport consults whichever context is current.
+        install_transport(gl, ctx)
+        return gl
 
     def resolve_project(self) -> str:
+        from qodev_gitlab_cli.fanout import is_multi
+
+        if is_multi(self):
+            from qodev_gitlab_api.exceptions import ConfigurationError
+
+            raise ConfigurationError(
+                "This command works on a single project; multi-project selections are supported by "
+                "`mrs list`, `issues list`, `pipelines list` and `variables list`."
+            )
         if self.project:
             return self.project
         from qodev_gitlab_cli.project import detect_project_from_git
+        from qodev_gitlab_cli.tracing import span
 
-        path = detect_project_from_git(self.base_url)
+        with span("git.detect_project"):
+            path = detect_project_from_git(self.base_url)
         if not path:
             from qodev_gitlab_api.exceptions import ConfigurationError
 
@@ -49,14 +118,96 @@ class Context:
         project: str | None,
         limit: int,
         page: int,
+        all_pages: bool = False,
+        concurrency: int = 4,
+        projects_from: str | None = None,
+        cache_mode: str = "default",
+        cache_ttl: float | None = None,
+        output_format: str | None = None,
+        compact: bool = False,
+        fields: tuple[str, ...] = (),
+        query: Query | None = None,
+        offline: bool = False,
+        tracer: Tracer | None = None,
+        retries: int = 3,
+        hedge: bool = False,
     ) -> None:
-        self.json_mode = json_mode
+        self.output_format = output_format or ("json" if json_mode else "markdown")
+        # Every JSON flavour shares the JSON code paths (errors, single objects).
+        self.json_mode = json_mode or self.output_format in ("json", "ndjson")
+        self.compact = compact
+        self.fields = fields
+        self.query = query
         self.token = token
         self.base_url = base_url
         self.project = project
         self.limit = limit
         self.page = page
+        self.all_pages = all_pages
+        self.concurrency = max(1, concurrency)
+        self.projects_from = projects_from
+        self.cache_mode = cache_mode
+        self.offline = offline
+        self.tracer = tracer
+        self.retries = max(0, retries)
+        self.hedge = hedge
+        if cache_ttl is None:
+            from qodev_gitlab_cli.cache import default_ttl
+
+            cache_ttl = default_ttl()
+        self.cache_ttl = cache_ttl
+
+
+# ---------------------------------------------------------------------------
+# Current context
+# ---------------------------------------------------------------------------
+# Commands use the module-level `ctx`, which forwards to the context that is
+# current for the running thread. Outside `batch` that is always `root`; batch
+# runs each command under its own context so commands can run concurrently.
+
+root = Context()
+_current: contextvars.ContextVar[Context] = contextvars.ContextVar("qodev_gitlab_context")
+
+
+def current() -> Context:
+    """Return the context commands in this thread are using."""
+    return _current.get(root)
+
+
+@contextmanager
+def using(context: Context) -> Iterator[Context]:
+    """Make `context` current for the duration of the block."""
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+
+
+def executor(max_workers: int, **kwargs: Any) -> ThreadPoolExecutor:
+    """A thread pool whose workers see the caller's current context (and output)."""
+    snapshot = contextvars.copy_context()
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=_adopt, initargs=(snapshot,), **kwargs)
+
+
+def _adopt(snapshot: contextvars.Context) -> None:
+    for var, value in snapshot.items():
+        var.set(value)
+
+
+class _ContextProxy:
+    def __getattr__(self, name: str) -> Any:
+        return getattr(current(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(current(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(current(), name)
+
+    def __repr__(self) -> str:
+        return repr(current())
 
 
 # Module-level singleton
-ctx = Context()
+ctx = cast(Context, _ContextProxy())
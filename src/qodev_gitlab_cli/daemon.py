@@ -0,0 +1,456 @@
+"""Background daemon that keeps the CLI warm between invocations.
+
+The daemon imports the app once, keeps pooled GitLab clients on the shared
+context (and parsed git configs in `qodev_gitlab_cli.project`), and serves CLI
+invocations over a per-user Unix socket. `forward()` is the thin client used by
+`main()`: it ships argv/env/cwd to the daemon and replays the output, or
+returns None so the caller can fall back to in-process execution.
+
+The daemon runs one command at a time. It greets each connection with a
+``{"ready": true}`` frame before reading the request; a client that gets no
+greeting within `READY_TIMEOUT` (the daemon is busy with another command)
+hangs up without sending anything and runs in-process. Commands that block
+for long (`pipelines wait`, `jobs log --follow`) are never forwarded, so they
+do not hold up other invocations.
+
+Replies are newline-delimited JSON frames. Clients that send ``"stream": true``
+receive stdout incrementally as ``{"chunk": <base64>}`` frames (so streamed
+output such as ``--format ndjson`` is not held back until the command ends),
+followed by the final ``{"code", "stdout", "stderr"}`` frame.
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "QODEV_GITLAB_SOCKET"
+DISABLE_ENV = "QODEV_GITLAB_NO_DAEMON"
+DEFAULT_IDLE_TIMEOUT = 1800
+STREAM_BUFFER_SIZE = 64 * 1024
+# Seconds a client waits for the daemon's greeting before running in-process.
+READY_TIMEOUT = 0.25
+
+# Environment forwarded from the client and applied per request in the daemon.
+_ENV_PREFIXES = ("GITLAB_", "QODEV_GITLAB_")
+_ENV_KEYS = ("NO_COLOR", "FORCE_COLOR", "COLUMNS", "TERM")
+# Top-level commands (kept here so forwarding does not import the app).
+_COMMANDS = (
+    "projects",
+    "mrs",
+    "pipelines",
+    "jobs",
+    "issues",
+    "releases",
+    "variables",
+    "status",
+    "sync",
+    "search",
+    "batch",
+    "daemon",
+)
+
+
+def socket_path() -> str:
+    """Return the per-user socket path (overridable via QODEV_GITLAB_SOCKET).
+
+    Without ``XDG_RUNTIME_DIR`` the socket goes into a private (0700)
+    directory under the shared temp dir, so other users cannot plant one.
+    """
+    override = os.getenv(SOCKET_ENV)
+    if override:
+        return override
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, f"qodev-gitlab-{os.getuid()}.sock")
+    private = os.path.join(tempfile.gettempdir(), f"qodev-gitlab-{os.getuid()}")
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(private, 0o700)
+    return os.path.join(private, "daemon.sock")
+
+
+def supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+def _connect(path: str, timeout: float | None = None) -> socket.socket | None:
+    """Connect to the daemon socket at `path`, if it is one of this user's."""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        logger.warning(f"Ignoring {path}: not a socket owned by the current user")
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # A daemon with a full backlog would otherwise block `connect`.
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    if not _peer_is_current_user(sock):
+        # The socket may have been swapped after the check above.
+        logger.warning(f"Ignoring {path}: the listening process belongs to another user")
+        sock.close()
+        return None
+    return sock
+
+
+def _peer_is_current_user(sock: socket.socket) -> bool:
+    """Whether the process at the other end runs as this user (where the OS can tell)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def running(path: str | None = None) -> bool:
+    """Whether a daemon of this user listens on `path`, busy or not."""
+    if not supported():
+        return False
+    sock = _connect(path or socket_path(), READY_TIMEOUT)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def request(
+    payload: dict[str, Any],
+    path: str | None = None,
+    *,
+    on_chunk: Callable[[bytes], None] | None = None,
+    ready_timeout: float | None = READY_TIMEOUT,
+) -> dict[str, Any] | None:
+    """Send one request to the daemon.
+
+    Returns None if no daemon is listening, or if it did not take the request
+    within `ready_timeout` seconds (None waits for its turn). The request is
+    only sent once the daemon is ready, so it never runs after a timeout.
+
+    Args:
+        on_chunk: Called with each streamed stdout chunk before the final frame.
+    """
+    if not supported():
+        return None
+    sock = _connect(path or socket_path(), ready_timeout)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as stream:
+        try:
+            ready = stream.readline()
+        except TimeoutError:
+            logger.info("Daemon is busy, running in-process")
+            return None
+        if not ready:
+            return None
+        sock.settimeout(None)
+        stream.write(json.dumps(payload).encode() + b"\n")
+        stream.flush()
+        while True:
+            line = stream.readline()
+            if not line:
+                raise ConnectionError("Daemon closed the connection without a response.")
+            frame = json.loads(line)
+            if "chunk" not in frame:
+                return frame
+            if on_chunk is not None:
+                on_chunk(base64.b64decode(frame["chunk"]))
+
+
+def _forwarded_env() -> dict[str, str]:
+    return {k: v for k, v in os.environ.items() if k.startswith(_ENV_PREFIXES) or k in _ENV_KEYS}
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run argv in a running daemon and replay its output.
+
+    Returns the exit code, or None when the command should run in-process
+    (daemon disabled, not running, or the command manages the daemon itself).
+    """
+    if os.getenv(DISABLE_ENV) or _command(argv) == "daemon" or _long_running(argv):
+        return None
+    payload: dict[str, Any] = {
+        "op": "run",
+        "argv": argv,
+        "env": _forwarded_env(),
+        "cwd": os.getcwd(),
+        "tty": sys.stdout.isatty(),
+        "columns": _terminal_columns(),
+        "stream": True,
+    }
+    if _reads_stdin(argv):
+        payload["stdin"] = sys.stdin.read()
+    try:
+        response = request(payload, on_chunk=_write_stdout)
+    except BrokenPipeError:
+        # Closing the socket makes the daemon abandon the command as well.
+        from qodev_gitlab_cli.output import silence_stdout
+
+        silence_stdout()
+        return 141
+    except ConnectionError as exc:
+        # The request may already have been executed, so never replay it in-process.
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if response is None:
+        return None
+
+    _write_stdout(base64.b64decode(response["stdout"]))
+    sys.stderr.buffer.write(base64.b64decode(response["stderr"]))
+    sys.stderr.buffer.flush()
+    return int(response["code"])
+
+
+def _command(argv: list[str]) -> str | None:
+    return next((arg for arg in argv if arg in _COMMANDS), None)
+
+
+def _long_running(argv: list[str]) -> bool:
+    # The daemon serves one command at a time; these would hold it for minutes.
+    command = _command(argv)
+    rest = argv[argv.index(command) + 1 :] if command else []
+    return (command == "pipelines" and "wait" in rest) or (command == "jobs" and "--follow" in rest)
+
+
+def _reads_stdin(argv: list[str]) -> bool:
+    # Only ship stdin when the command asks for it; reading an idle inherited
+    # stdin would block.
+    if _command(argv) == "batch":
+        return True
+    return "-" in argv or any(arg.endswith("=-") for arg in argv)
+
+
+def _write_stdout(data: bytes) -> None:
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+
+def _terminal_columns() -> int | None:
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        try:
+            self.wfile.write(b'{"ready": true}\n')
+        except OSError:
+            return  # the client gave up waiting
+        line = self.rfile.readline()
+        if not line:
+            return
+        self.server.last_activity = time.time()
+        payload = json.loads(line)
+        op = payload.get("op", "run")
+        if op == "run":
+            response = self.server.run(payload, self._send_chunk if payload.get("stream") else None)
+        elif op == "status":
+            response = self.server.status()
+        elif op == "shutdown":
+            self.server.shutdown_requested = True
+            response = {"stopped": True}
+        else:
+            response = {"error": f"Unknown op: {op}"}
+        # The client may have hung up mid-stream (e.g. piped into `head`).
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    def _send_chunk(self, data: bytes) -> None:
+        frame = {"chunk": base64.b64encode(data).decode("ascii")}
+        self.wfile.write(json.dumps(frame).encode() + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serial Unix-socket server executing CLI invocations in this process.
+
+    Requests are handled one at a time: the CLI context and stdout are
+    process-global, and serial handling keeps pooled connections warm.
+    Clients that find it busy run in-process instead of queueing (see `request`).
+    """
+
+    def __init__(self, path: str, *, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.last_activity = self.started_at
+        self.requests_served = 0
+        self.shutdown_requested = False
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def serve(self) -> None:
+        """Serve until shutdown is requested or the daemon has been idle too long."""
+        self.timeout = self.idle_timeout
+        try:
+            while not self.shutdown_requested:
+                self.handle_request()
+                if time.time() - self.last_activity >= self.idle_timeout:
+                    logger.info(f"Daemon idle for {int(self.idle_timeout)}s, exiting")
+                    break
+        finally:
+            self.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    def status(self) -> dict[str, Any]:
+        import qodev_gitlab_cli.context as _ctx
+        from qodev_gitlab_cli import project
+
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime": round(time.time() - self.started_at, 1),
+            "requests_served": self.requests_served,
+            "clients": len(_ctx.ctx._clients),
+            "git_configs": len(project._config_cache),
+        }
+
+    def run(self, payload: dict[str, Any], on_chunk: Callable[[bytes], None] | None = None) -> dict[str, Any]:
+        self.requests_served += 1
+        code, out, err = execute(
+            payload["argv"],
+            env=payload.get("env", {}),
+            cwd=payload.get("cwd"),
+            tty=bool(payload.get("tty")),
+            columns=payload.get("columns"),
+            stdin=payload.get("stdin", ""),
+            on_chunk=on_chunk,
+        )
+        return {
+            "code": code,
+            "stdout": base64.b64encode(out).decode("ascii"),
+            "stderr": base64.b64encode(err).decode("ascii"),
+        }
+
+
+def execute(
+    argv: list[str],
+    *,
+    env: dict[str, str],
+    cwd: str | None = None,
+    tty: bool = False,
+    columns: int | None = None,
+    stdin: str = "",
+    on_chunk: Callable[[bytes], None] | None = None,
+) -> tuple[int, bytes, bytes]:
+    """Run one CLI invocation in-process, capturing stdout/stderr and the exit code.
+
+    With ``on_chunk``, stdout is handed over whenever the command flushes it (or
+    every `STREAM_BUFFER_SIZE` bytes) instead of being returned at the end.
+    """
+    from rich.console import Console
+
+    from qodev_gitlab_cli import output
+    from qodev_gitlab_cli.app import app
+
+    out_bytes, err_bytes = io.BytesIO(), io.BytesIO()
+    out: io.TextIOWrapper
+    if on_chunk is not None:
+        sink = io.BufferedWriter(_ChunkSink(on_chunk), STREAM_BUFFER_SIZE)
+        out = io.TextIOWrapper(sink, encoding="utf-8")
+    else:
+        out = io.TextIOWrapper(out_bytes, encoding="utf-8", write_through=True)
+    err = io.TextIOWrapper(err_bytes, encoding="utf-8", write_through=True)
+
+    saved_cwd = os.getcwd()
+    saved_env = {k: v for k, v in os.environ.items() if k.startswith(_ENV_PREFIXES) or k in _ENV_KEYS}
+    saved_consoles = dict(output._consoles)
+    saved_stdin = sys.stdin
+
+    _replace_env(env)
+    force_terminal = True if tty else None
+    output._consoles[True] = Console(file=err, stderr=True, force_terminal=force_terminal, width=columns)
+    output._consoles[False] = Console(file=out, force_terminal=force_terminal, width=columns)
+    sys.stdin = io.StringIO(stdin)
+    code = 0
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                app.meta(argv)
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+            except Exception as exc:
+                print(f"Error: {exc}", file=err)
+                code = 1
+        with contextlib.suppress(OSError):
+            out.flush()
+    finally:
+        os.chdir(saved_cwd)
+        _replace_env(saved_env)
+        output._consoles.clear()
+        output._consoles.update(saved_consoles)
+        sys.stdin = saved_stdin
+
+    return code, out_bytes.getvalue(), err_bytes.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self, on_chunk: Callable[[bytes], None]) -> None:
+        self.on_chunk = on_chunk
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.on_chunk(bytes(data))
+        return len(data)
+
+
+def _replace_env(env: dict[str, str]) -> None:
+    for key in [k for k in os.environ if k.startswith(_ENV_PREFIXES) or k in _ENV_KEYS]:
+        del os.environ[key]
+    os.environ.update(env)
+
+
+def serve(path: str | None = None, *, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Run the daemon in the foreground."""
+    path = path or socket_path()
+    if running(path):
+        raise RuntimeError(f"Daemon already running on {path}")
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+    # Warm the import graph before accepting requests.
+    import qodev_gitlab_cli.app  # noqa: F401
+
+    server = DaemonServer(path, idle_timeout=idle_timeout)
+    logger.info(f"Daemon listening on {path}")
+    server.serve()
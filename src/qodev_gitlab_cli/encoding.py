@@ -0,0 +1,139 @@
+"""JSON encoder backends for `--json` / `--format ndjson` output.
+
+`orjson` is used when it is installed (``pip install qodev-gitlab-cli[fast]``)
+and the standard library otherwise; ``QODEV_GITLAB_JSON_BACKEND=json`` forces
+the latter. Both produce the same documents: UTF-8 text, two-space indentation
+(or none with ``compact``) and datetimes as ISO 8601 strings. Values neither
+backend knows are written as ``str(value)``.
+
+`write_json` streams a document in pieces: the top-level container and the
+containers directly inside it (such as the ``items`` list of a page) are
+written element by element, so no copy of the data and no string of the whole
+document is ever built.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+BACKEND_ENV = "QODEV_GITLAB_JSON_BACKEND"
+WRITE_BUFFER_SIZE = 64 * 1024
+# Containers nested deeper than this are encoded in one call.
+STREAM_DEPTH = 2
+
+
+@dataclass(frozen=True)
+class Backend:
+    name: str
+    dumps: Callable[[Any, bool], bytes]  # (obj, indent) -> UTF-8 JSON
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return str(obj)
+
+
+_INDENTED = json.JSONEncoder(indent=2, ensure_ascii=False, default=_default)
+_COMPACT = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+def _stdlib_dumps(obj: Any, indent: bool) -> bytes:
+    return (_INDENTED if indent else _COMPACT).encode(obj).encode()
+
+
+STDLIB = Backend("json", _stdlib_dumps)
+
+
+def _orjson_backend() -> Backend | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    options = orjson.OPT_NON_STR_KEYS
+    indented = options | orjson.OPT_INDENT_2
+
+    def dumps(obj: Any, indent: bool) -> bytes:
+        try:
+            return orjson.dumps(obj, default=str, option=indented if indent else options)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library accepts.
+            return _stdlib_dumps(obj, indent)
+
+    return Backend("orjson", dumps)
+
+
+_backend: Backend | None = None
+
+
+def backend() -> Backend:
+    """The configured backend (resolved once per process)."""
+    global _backend
+    if _backend is None:
+        choice = os.getenv(BACKEND_ENV, "").lower()
+        _backend = (None if choice == "json" else _orjson_backend()) or STDLIB
+    return _backend
+
+
+def dumps(obj: Any, *, compact: bool = False) -> bytes:
+    """Encode `obj` in one call with the configured backend."""
+    return backend().dumps(obj, not compact)
+
+
+def write_json(data: Any, *, compact: bool = False, stream: Any = None) -> None:
+    """Write `data` and a trailing newline to `stream` (default: stdout) in pieces."""
+    stream = stream or sys.stdout
+    stream.flush()
+    sink = getattr(stream, "buffer", None)
+    write = sink.write if sink is not None else (lambda data: stream.write(data.decode()))
+
+    pending: list[bytes] = []
+    size = 0
+    for piece in _pieces(data, backend().dumps, not compact, 0, STREAM_DEPTH):
+        pending.append(piece)
+        size += len(piece)
+        if size >= WRITE_BUFFER_SIZE:
+            write(b"".join(pending))
+            pending, size = [], 0
+    pending.append(b"\n")
+    write(b"".join(pending))
+
+
+def _pieces(obj: Any, encode: Callable[[Any, bool], bytes], indent: bool, level: int, depth: int) -> Iterator[bytes]:
+    """Yield the encoding of `obj`, splitting the outer `depth` container levels into elements.
+
+    Matches ``json.dumps(obj, indent=2)`` (or the compact form) byte for byte.
+    """
+    if depth == 0 or not isinstance(obj, (dict, list)) or not obj:
+        data = encode(obj, indent)
+        # JSON strings never contain raw newlines, so re-indenting nested output is safe.
+        yield data.replace(b"\n", b"\n" + b"  " * level) if indent and level else data
+        return
+
+    inner = b"\n" + b"  " * (level + 1) if indent else b""
+    outer = b"\n" + b"  " * level if indent else b""
+    key_separator = b": " if indent else b":"
+    is_dict = isinstance(obj, dict)
+    elements: Iterable[Any] = obj.items() if isinstance(obj, dict) else obj
+    yield b"{" if is_dict else b"["
+    for i, element in enumerate(elements):
+        yield b"," + inner if i else inner
+        if is_dict:
+            key, element = element
+            yield encode(key if isinstance(key, str) else _key(key), False) + key_separator
+        yield from _pieces(element, encode, indent, level + 1, depth - 1)
+    yield outer + (b"}" if is_dict else b"]")
+
+
+def _key(key: Any) -> str:
+    # The standard library's conversions for non-string keys.
+    if key is None or isinstance(key, bool):
+        return json.dumps(key)
+    return str(key)
@@ -0,0 +1,39 @@
+"""Exit codes and the mapping from API exceptions to error codes."""
+
+from __future__ import annotations
+
+EXIT_AUTH = 80
+EXIT_NOT_FOUND = 81
+EXIT_API = 82
+EXIT_VALIDATION = 83
+EXIT_CONFIG = 84
+EXIT_RATE_LIMITED = 85
+
+
+class UsageError(ValueError):
+    """Options that contradict each other; reported with `EXIT_VALIDATION`."""
+
+
+def classify_error(exc: BaseException) -> tuple[str, int]:
+    """Return the (error code, exit code) pair used to report an exception."""
+    # Imported here so startup does not pay for the API client (and httpx).
+    from qodev_gitlab_api import APIError, AuthenticationError, ConfigurationError, NotFoundError
+
+    if isinstance(exc, AuthenticationError):
+        return "authentication", EXIT_AUTH
+    if isinstance(exc, NotFoundError):
+        return "not_found", EXIT_NOT_FOUND
+    if isinstance(exc, APIError) and getattr(exc, "status_code", None) == 429:
+        return "rate_limited", EXIT_RATE_LIMITED
+    if isinstance(exc, APIError):
+        return "api_error", EXIT_API
+    if isinstance(exc, ConfigurationError):
+        return "configuration", EXIT_CONFIG
+    if isinstance(exc, UsageError):
+        return "validation", EXIT_VALIDATION
+    return "unknown", 1
+
+
+def error_message(exc: BaseException) -> str:
+    code, _ = classify_error(exc)
+    return f"Unexpected error: {exc}" if code == "unknown" else str(exc)
@@ -0,0 +1,306 @@
+"""Run list commands across many projects at once.
+
+`--project` accepts a comma-separated list or a glob (``*`` stays within one
+path segment, ``**`` crosses them) matched against an on-disk index of the
+projects the token is a member of; `--projects-from FILE` reads paths from a
+file. Selections of the form ``<group>/**`` use GitLab's group-scoped
+endpoint when the resource has one instead of fanning out per project.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from typing import Any
+from urllib.parse import quote
+
+from qodev_gitlab_cli.api import iter_pages, paginate, project_endpoint
+from qodev_gitlab_cli.bulk import fetch_many
+from qodev_gitlab_cli.cache import cache_dir
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.errors import EXIT_VALIDATION, classify_error
+from qodev_gitlab_cli.output import PLAIN_FORMATS, error, output_json_line, output_list, output_pages
+
+logger = logging.getLogger(__name__)
+
+INDEX_TTL = 24 * 3600
+# Resources with a /groups/:id/<resource> equivalent.
+GROUP_RESOURCES = frozenset({"merge_requests", "issues"})
+
+_GLOB_CHARS = set("*?[")
+
+
+def is_multi(ctx: Context) -> bool:
+    """True when the project selection names more than one project."""
+    project = ctx.project or ""
+    return bool(ctx.projects_from) or "," in project or any(c in project for c in _GLOB_CHARS)
+
+
+def select_projects(client: Any, ctx: Context) -> list[str]:
+    """Expand --project/--projects-from into project paths (in selection order)."""
+    patterns = [p.strip() for p in (ctx.project or "").split(",") if p.strip()]
+    if ctx.projects_from:
+        patterns.extend(_read_projects_file(ctx.projects_from, ctx=ctx))
+
+    selected: list[str] = []
+    index: list[str] | None = None
+    for pattern in patterns:
+        if not any(c in pattern for c in _GLOB_CHARS):
+            selected.append(pattern)
+            continue
+        if index is None:
+            index = project_index(client, ctx)
+        regex = glob_to_regex(pattern)
+        selected.extend(path for path in index if regex.fullmatch(path))
+    return list(dict.fromkeys(selected))
+
+
+def group_of(ctx: Context) -> str | None:
+    """Return the group when the whole selection is ``<group>/**``."""
+    project = (ctx.project or "").strip()
+    if ctx.projects_from or "," in project or not project.endswith("/**"):
+        return None
+    group = project[: -len("/**")]
+    return None if not group or any(c in group for c in _GLOB_CHARS) else group
+
+
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out))
+
+
+def _read_projects_file(path: str, *, ctx: Context) -> list[str]:
+    try:
+        if path == "-":
+            text = sys.stdin.read()
+        else:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+    except OSError as exc:
+        error(f"Cannot read projects from {path}: {exc}", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+
+# ---------------------------------------------------------------------------
+# Project index
+# ---------------------------------------------------------------------------
+
+
+def _index_path(client: Any) -> str:
+    session = client.client
+    key = f"{session.base_url}\0{session.headers.get('private-token', '')}"
+    return os.path.join(cache_dir(), "projects", hashlib.sha256(key.encode()).hexdigest()[:16] + ".json")
+
+
+def project_index(client: Any, ctx: Context) -> list[str]:
+    """Paths of every project the token is a member of, cached on disk for a day.
+
+    `--no-cache` forces a refresh; `--cache-only` accepts a stale index.
+    """
+    path = _index_path(client)
+    if ctx.cache_mode != "off":
+        try:
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if ctx.cache_mode == "only" or time.time() - cached["fetched_at"] < INDEX_TTL:
+                return list(cached["projects"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    params = {"membership": True, "simple": True, "archived": False, "order_by": "path", "sort": "asc"}
+    projects = [
+        item["path_with_namespace"]
+        for page in iter_pages(client, "/projects", params, concurrency=ctx.concurrency)
+        for item in page.items
+    ]
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": time.time(), "projects": projects}, f)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug(f"Could not write project index {path}: {exc}")
+    return projects
+
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+
+def output_fanout(
+    client: Any,
+    resource: str,
+    params: dict[str, Any] | None = None,
+    *,
+    ctx: Context,
+    format_fn: Any,
+    transform: Any = None,
+    per_page: int | None = None,
+    enrich: Callable[[list[Any]], list[Any]] | None = None,
+    defaults: dict[str, Any] | None = None,
+) -> None:
+    """List `resource` across the selected projects and print one merged list.
+
+    Every item is tagged with a ``project`` field. Projects that fail are
+    reported inline as ``{"project", "error", "code"}`` records and the process
+    exits with the first failure's exit code after all output.
+
+    Args:
+        enrich: Optional function applied to each fetched batch of tagged items
+            (e.g. `graphql.enrich_mrs`), so it can make one request per batch.
+        defaults: Params of options left at their default (see `api.paginate`).
+    """
+    if ctx.query is not None:
+        # Reject a `--where` that contradicts the options before fetching any project.
+        ctx.query.pushdown(resource, params)
+    # Enrichment looks items up by IID, even when `--fields` leaves it out.
+    keep: tuple[str, ...] = ("iid",) if enrich is not None else ()
+    group = group_of(ctx)
+    if group is not None and resource in GROUP_RESOURCES:
+        keep = (*keep, "references.full", "project_id")
+        pages = paginate(
+            client,
+            f"/groups/{quote(group, safe='')}/{resource}",
+            params,
+            ctx=ctx,
+            per_page=per_page,
+            keep=keep,
+            defaults=defaults,
+        )
+        if enrich is not None:
+            pages = (replace(page, items=enrich(page.items)) for page in pages)
+        output_pages(
+            pages, ctx=ctx, format_fn=_sectioned(format_fn, ctx), transform=_tag_from_ref, keep=(*keep, "project")
+        )
+        return
+
+    projects = select_projects(client, ctx)
+    if not projects:
+        error("No projects match the selection.", ctx=ctx, code="validation", exit_code=EXIT_VALIDATION)
+
+    query = ctx.query
+    shown = (*ctx.fields, *keep, "project") if ctx.fields else ()
+
+    def fetch(project: str) -> list[Any]:
+        # Pages within one project are fetched sequentially; parallelism is across projects.
+        endpoint = project_endpoint(project, resource)
+        pages = paginate(
+            client, endpoint, params, ctx=ctx, per_page=per_page, concurrency=1, keep=keep, defaults=defaults
+        )
+        items = [_tag(transform(item) if transform else item, project) for page in pages for item in page.items]
+        if enrich is not None:
+            items = enrich(items)
+        if query is None:
+            return items
+        items = [item for item in items if query.matches(item)]
+        # With `--sort`, the query's fields are dropped once all items are sorted.
+        return items if query.sort else query.project(items, shown)
+
+    # `--sort` needs every project's items before the first line can be written.
+    stream = ctx.output_format == "ndjson" and not (query is not None and query.sort)
+    remaining = query.top if query is not None and stream else None
+    start = time.perf_counter()
+    items: list[Any] = []
+    count = 0
+    failures: list[tuple[dict[str, Any], BaseException]] = []
+    for result, exc in fetch_many(fetch, projects, key="project", concurrency=ctx.concurrency):
+        records = [result] if exc is not None else result
+        if exc is not None:
+            failures.append((result, exc))
+        elif remaining is not None:
+            records = records[:remaining]
+            remaining -= len(records)
+        if stream:
+            for record in records:
+                output_json_line(record)
+            sys.stdout.flush()
+        else:
+            items.extend(records)
+        count += len(records) - (exc is not None)
+
+    if query is not None and not stream:
+        ok = query.finish([item for item in items if "error" not in item])
+        if query.sort:
+            ok = query.project(ok, shown)
+        items = ok + [item for item in items if "error" in item]
+        count = len(ok)
+    if ctx.output_format == "ndjson":
+        if not stream:
+            for record in items:
+                output_json_line(record)
+        meta = {"count": count, "projects": len(projects), "failed": len(failures)}
+        output_json_line({"_meta": {**meta, "elapsed": round(time.perf_counter() - start, 3)}})
+    else:
+        output_list(
+            items=items,
+            total=len(items),
+            page=1,
+            limit=max(len(items), 1),
+            ctx=ctx,
+            format_fn=_sectioned(format_fn, ctx),
+        )
+    if failures:
+        sys.exit(classify_error(failures[0][1])[1])
+
+
+def _tag_from_ref(item: dict[str, Any]) -> dict[str, Any]:
+    # Group endpoints return items from many projects; `references.full` is
+    # "group/project!12" (MRs) or "group/project#12" (issues).
+    full = (item.get("references") or {}).get("full") or ""
+    project = re.split(r"[!#]", full, maxsplit=1)[0] or str(item.get("project_id", ""))
+    return _tag(item, project)
+
+
+def _tag(item: dict[str, Any], project: str) -> dict[str, Any]:
+    tagged = {"project": project, **item}
+    # `--fields` fills in None for a `project` that `--where`/`--sort` read.
+    tagged["project"] = project
+    return tagged
+
+
+def _sectioned(format_fn: Any, ctx: Context) -> Any:
+    """Wrap a list formatter to render one table per project."""
+
+    def render(items: list[Any], *, total: int = 0, page: int = 1) -> str:
+        if ctx.output_format in PLAIN_FORMATS:
+            # One table with a Project column; failed projects are reported on stderr.
+            for item in items:
+                if "error" in item:
+                    print(f"{item.get('project')}: {item['error']}", file=sys.stderr)
+            return format_fn([i for i in items if "error" not in i], total=total, page=page)
+        by_project: dict[str, list[Any]] = {}
+        for item in items:
+            by_project.setdefault(item.get("project", "?"), []).append(item)
+        sections = []
+        for project, group_items in by_project.items():
+            ok = [i for i in group_items if "error" not in i]
+            errors = [i["error"] for i in group_items if "error" in i]
+            body = f"**Error:** {errors[0]}" if errors else format_fn(ok, total=len(ok), page=1)
+            sections.append(f"**{project}**\n\n{body}")
+        return "\n\n---\n\n".join(sections) if sections else "_No results found._"
+
+    return render
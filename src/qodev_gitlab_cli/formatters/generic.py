@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
-from qodev_gitlab_cli.output import md_table
+from qodev_gitlab_cli.context import ctx
+from qodev_gitlab_cli.output import PLAIN_FORMATS, md_table, plain_table
 
 
 def detail_table(data: Any, fields: list[tuple[str, str]], *, title: str | None = None) -> str:
@@ -12,10 +14,16 @@ def detail_table(data: Any, fields: list[tuple[str, str]], *, title: str | None
 
     Args:
         data: dict
-        fields: List of (label, key) — key supports dot notation.
+        fields: List of (label, key) — key supports dot notation. `--fields` replaces them.
         title: Optional heading.
     """
     d = data
+    if ctx.fields:
+        fields = [(key, key) for key in ctx.fields]
+
+    if ctx.output_format in PLAIN_FORMATS:
+        cells = [[label, _fmt(_get(d, key))] for label, key in fields]
+        return plain_table([row for row in cells if row[1]], ["Field", "Value"], tsv=ctx.output_format == "tsv")
 
     lines: list[str] = []
     if title:
@@ -40,7 +48,22 @@ def list_table(
     total: int = 0,
     page: int = 1,
 ) -> str:
-    """Render a list of records as a markdown table."""
+    """Render a list of records as a markdown table.
+
+    With `--format table`/`tsv` the rows are rendered directly instead (no
+    title), and items tagged with a ``project`` (multi-project lists) get a
+    leading Project column unless `columns` already shows it. `--fields`
+    replaces `columns`.
+    """
+    if ctx.fields:
+        columns = [(key, key) for key in ctx.fields]
+    if ctx.output_format in PLAIN_FORMATS:
+        tagged = items and all(isinstance(item, dict) and "project" in item for item in items)
+        if tagged and "project" not in {key for _, key in columns}:
+            columns = [("Project", "project"), *columns]
+        cells = [[_fmt(_get(item, key)) for _, key in columns] for item in items]
+        return plain_table(cells, [label for label, _ in columns], tsv=ctx.output_format == "tsv")
+
     if not items:
         return f"# {title}\n\n_No results found._"
 
@@ -59,6 +82,37 @@ def list_table(
     return f"{header}\n\n{md_table(rows, columns)}"
 
 
+def select_fields(data: Any, fields: Sequence[str]) -> Any:
+    """Keep only `fields` (dot notation) of a record, or of each record in a list.
+
+    Nested paths keep their nesting: ``author.username`` gives
+    ``{"author": {"username": ...}}``. Missing values become None. Failure
+    records (those with an ``error`` key) are returned unchanged.
+    """
+    if not fields:
+        return data
+    if isinstance(data, list):
+        return [select_fields(item, fields) for item in data]
+    if not isinstance(data, dict) or "error" in data:
+        return data
+
+    selected: dict[str, Any] = {}
+    whole: set[str] = set()
+    for path in fields:
+        parts = path.split(".")
+        if any(".".join(parts[:i]) in whole for i in range(1, len(parts))):
+            continue  # a parent is already selected in full
+        target = selected
+        for part in parts[:-1]:
+            child = target.get(part)
+            if not isinstance(child, dict):
+                child = target[part] = {}
+            target = child
+        target[parts[-1]] = _get(data, path)
+        whole.add(path)
+    return selected
+
+
 def _get(d: dict, key: str) -> Any:
     """Get a value from a dict, supporting dot notation."""
     parts = key.split(".")
@@ -37,3 +37,7 @@ def format_job_detail(data: Any) -> str:
 
 def format_job_list(items: list[Any], *, total: int = 0, page: int = 1) -> str:
     return list_table(items, JOB_LIST_COLUMNS, title="Jobs", total=total, page=page)
+
+
+def format_log_saved(data: Any) -> str:
+    return f"Wrote {data.get('bytes', 0)} bytes of job #{data.get('job_id', '?')} log to `{data.get('path', '?')}`."
@@ -32,6 +32,14 @@ MR_LIST_COLUMNS = [
     ("State", "state"),
 ]
 
+# Extra columns for `mrs list --enrich` (see `qodev_gitlab_cli.graphql.enrich_mrs`).
+MR_ENRICHED_COLUMNS = [
+    ("Pipeline", "head_pipeline_status"),
+    ("Approvals", "approval_count"),
+    ("Unresolved", "unresolved_discussions"),
+    ("Conflicts", "has_conflicts"),
+]
+
 DISCUSSION_LIST_COLUMNS = [
     ("ID", "id"),
     ("Author", "_author"),
@@ -56,6 +64,10 @@ def format_mr_list(items: list[Any], *, total: int = 0, page: int = 1) -> str:
     return list_table(items, MR_LIST_COLUMNS, title="Merge Requests", total=total, page=page)
 
 
+def format_mr_list_enriched(items: list[Any], *, total: int = 0, page: int = 1) -> str:
+    return list_table(items, MR_LIST_COLUMNS + MR_ENRICHED_COLUMNS, title="Merge Requests", total=total, page=page)
+
+
 def format_discussion_list(items: list[Any], *, total: int = 0, page: int = 1) -> str:
     """Format discussions with first note content."""
     rows = []
@@ -64,6 +76,8 @@ def format_discussion_list(items: list[Any], *, total: int = 0, page: int = 1) -
         first_note = notes[0] if notes else {}
         rows.append(
             {
+                # The whole discussion stays readable for `--fields`.
+                **d,
                 "id": d.get("id", ""),
                 "_author": first_note.get("author", {}).get("name", ""),
                 "_resolved": "Yes"
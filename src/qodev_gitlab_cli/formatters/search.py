@@ -0,0 +1,20 @@
+"""Search result formatters."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from qodev_gitlab_cli.formatters.generic import list_table
+
+SEARCH_COLUMNS = [
+    ("Type", "type"),
+    ("IID", "iid"),
+    ("Title", "title"),
+    ("State", "state"),
+    ("Score", "score"),
+    ("Snippet", "snippet"),
+]
+
+
+def format_search_results(items: list[Any], *, total: int = 0, page: int = 1) -> str:
+    return list_table(items, SEARCH_COLUMNS, title="Search Results", total=total, page=page)
@@ -0,0 +1,60 @@
+"""Branch status formatter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def format_branch_status(data: Any) -> str:
+    lines = [f"# Branch `{data.get('branch', '?')}` ({data.get('project', '?')})", ""]
+
+    mr = data.get("merge_request")
+    if mr:
+        draft = " (draft)" if mr.get("draft") else ""
+        lines.append(f"**Merge request:** !{mr.get('iid')} {mr.get('title', '')}{draft}")
+        lines.append(f"**State:** {mr.get('state')} → `{mr.get('target_branch')}`")
+        if mr.get("detailed_merge_status"):
+            lines.append(f"**Merge status:** {mr['detailed_merge_status']}")
+        if mr.get("has_conflicts"):
+            lines.append("**Conflicts:** Yes")
+        lines.append(f"**URL:** {mr.get('web_url')}")
+    else:
+        lines.append("_No merge request for this branch._")
+
+    pipeline = data.get("pipeline")
+    lines.append("")
+    if pipeline:
+        lines.append(f"## Pipeline #{pipeline.get('id')}: {pipeline.get('status')}")
+        jobs = data.get("jobs")
+        if jobs:
+            counts = ", ".join(f"{n} {status}" for status, n in sorted(jobs.get("by_status", {}).items()))
+            lines.append(f"**Jobs:** {jobs.get('total', 0)} total ({counts})")
+            for job in jobs.get("failed", []):
+                suffix = " (allowed to fail)" if job.get("allow_failure") else ""
+                lines.append(f"- **{job.get('name')}** failed in {job.get('stage')}{suffix}: {job.get('web_url')}")
+        lines.append(f"**URL:** {pipeline.get('web_url')}")
+    else:
+        lines.append("_No pipeline for this branch._")
+
+    approvals = data.get("approvals")
+    if approvals:
+        lines.append("")
+        approved_by = ", ".join(approvals.get("approved_by") or []) or "nobody"
+        lines.append(f"## Approvals: {'approved' if approvals.get('approved') else 'not approved'}")
+        lines.append(f"Approved by {approved_by}; {approvals.get('approvals_left', 0)} approvals left.")
+
+    unresolved = data.get("unresolved_discussions")
+    if unresolved:
+        lines.append("")
+        lines.append(f"## Unresolved discussions: {unresolved.get('count', 0)}")
+        for thread in unresolved.get("items", []):
+            body = " ".join((thread.get("body") or "").split())[:80]
+            lines.append(f"- {thread.get('author')}: {body}")
+
+    errors = data.get("errors")
+    if errors:
+        lines.append("")
+        lines.append("## Errors")
+        lines.extend(f"- {section}: {message}" for section, message in errors.items())
+
+    return "\n".join(lines)
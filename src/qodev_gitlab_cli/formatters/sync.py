@@ -0,0 +1,21 @@
+"""Sync formatters."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from qodev_gitlab_cli.formatters.generic import list_table
+
+SYNC_COLUMNS = [
+    ("Project", "project"),
+    ("Issues", "issues"),
+    ("MRs", "merge_requests"),
+    ("Notes", "notes"),
+    ("Pipelines", "pipelines"),
+    ("Releases", "releases"),
+    ("Elapsed (s)", "elapsed"),
+]
+
+
+def format_sync_list(items: list[Any], *, total: int = 0, page: int = 1) -> str:
+    return list_table(items, SYNC_COLUMNS, title="Synced", total=total, page=page)
@@ -0,0 +1,124 @@
+"""GraphQL queries that replace per-item REST round trips.
+
+`enrich_mrs` adds triage fields to a page of REST merge requests with a
+single query: each project on the page becomes one aliased ``project`` field
+selecting its merge requests by IID.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from typing import Any
+
+from qodev_gitlab_cli.api import MAX_PER_PAGE, Page, raise_for_status
+
+logger = logging.getLogger(__name__)
+
+# Relative to the REST base URL (``.../api/v4/``).
+GRAPHQL_URL = "../graphql"
+
+MR_ENRICH_FIELDS = """
+      iid
+      conflicts
+      resolvableDiscussionsCount
+      resolvedDiscussionsCount
+      approvedBy { count }
+      headPipeline { status }
+"""
+
+
+class GraphQLError(Exception):
+    pass
+
+
+def query(client: Any, document: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+    """POST a GraphQL document and return its ``data``.
+
+    Raises the REST error types for HTTP failures and `GraphQLError` when the
+    response carries errors but no data.
+    """
+    session = client.client
+    response = session.post(session.base_url.join(GRAPHQL_URL), json={"query": document, "variables": variables or {}})
+    raise_for_status(response)
+    body = response.json()
+    if body.get("errors"):
+        messages = "; ".join(str(e.get("message", e)) for e in body["errors"])
+        if not body.get("data"):
+            raise GraphQLError(messages)
+        logger.warning(f"GraphQL returned partial data: {messages}")
+    return body.get("data") or {}
+
+
+def mr_project(item: dict[str, Any], default: str | None = None) -> str | None:
+    """Full path of an MR's project, from ``references.full`` ("group/project!12")."""
+    full = (item.get("references") or {}).get("full") or ""
+    return item.get("project") or full.rsplit("!", 1)[0] or default
+
+
+def enrich_mrs(client: Any, items: list[dict[str, Any]], *, project: str | None = None) -> list[dict[str, Any]]:
+    """Add head pipeline status, approval count, unresolved discussions and conflict state.
+
+    Adds ``head_pipeline_status``, ``approval_count``, ``unresolved_discussions``
+    and ``has_conflicts`` to each item. If the query fails the items are
+    returned unchanged and a warning is logged.
+
+    Args:
+        project: Project path for items that do not say which project they are in.
+    """
+    if len(items) > MAX_PER_PAGE:
+        return [
+            enriched
+            for start in range(0, len(items), MAX_PER_PAGE)
+            for enriched in enrich_mrs(client, items[start : start + MAX_PER_PAGE], project=project)
+        ]
+    by_project: dict[str, list[str]] = {}
+    for item in items:
+        path = mr_project(item, project)
+        if path and item.get("iid") is not None:
+            by_project.setdefault(path, []).append(str(item["iid"]))
+    if not by_project:
+        return items
+
+    aliases = {f"p{i}": path for i, path in enumerate(by_project)}
+    selections = "\n".join(
+        f"  {alias}: project(fullPath: {json.dumps(path)}) {{\n"
+        f"    mergeRequests(iids: {json.dumps(by_project[path])}, first: {len(by_project[path])}) {{\n"
+        f"      nodes {{{MR_ENRICH_FIELDS}      }}\n"
+        f"    }}\n"
+        f"  }}"
+        for alias, path in aliases.items()
+    )
+    try:
+        data = query(client, f"query {{\n{selections}\n}}")
+    except Exception as exc:
+        logger.warning(f"Could not enrich merge requests: {exc}")
+        return items
+
+    extra: dict[tuple[str, str], dict[str, Any]] = {}
+    for alias, path in aliases.items():
+        nodes = ((data.get(alias) or {}).get("mergeRequests") or {}).get("nodes") or []
+        for node in nodes:
+            extra[(path, str(node.get("iid")))] = _mr_fields(node)
+
+    return [{**item, **extra.get((mr_project(item, project) or "", str(item.get("iid"))), {})} for item in items]
+
+
+def enrich_mr_pages(client: Any, pages: Iterable[Page], *, project: str | None = None) -> Iterator[Page]:
+    """Apply `enrich_mrs` to each page as it arrives (one query per page)."""
+    for page in pages:
+        yield replace(page, items=enrich_mrs(client, page.items, project=project))
+
+
+def _mr_fields(node: dict[str, Any]) -> dict[str, Any]:
+    pipeline = node.get("headPipeline") or {}
+    resolvable = node.get("resolvableDiscussionsCount") or 0
+    resolved = node.get("resolvedDiscussionsCount") or 0
+    return {
+        "head_pipeline_status": (pipeline.get("status") or "").lower() or None,
+        "approval_count": (node.get("approvedBy") or {}).get("count", 0),
+        "unresolved_discussions": max(0, resolvable - resolved),
+        "has_conflicts": bool(node.get("conflicts")),
+    }
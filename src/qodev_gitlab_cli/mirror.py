@@ -0,0 +1,506 @@
+"""Local SQLite mirror of project data (`qodev-gitlab sync` and `--offline`).
+
+`sync` copies a project's issues, merge requests (each with its notes),
+pipelines and releases into one SQLite database per GitLab instance and token
+under the cache directory. Every record is stored as the JSON GitLab returned,
+next to a few indexed columns. Each kind keeps an ``updated_after`` cursor (the
+newest ``updated_at`` seen), so later syncs only fetch what changed. Notes are
+re-fetched for the issues and MRs that changed. Releases have no such filter
+and are replaced wholesale. Records deleted on the server are only dropped by
+``sync --full``.
+
+With `--offline`, `OfflineTransport` answers GET requests for mirrored
+endpoints from the database, including pagination headers, so list and get
+commands (and `--where`/`--sort`/`--fields`) work unchanged without a network
+round trip. Anything else fails with ``504`` instead of reaching GitLab.
+
+Issues and MRs are also indexed for `qodev-gitlab search` (see
+`qodev_gitlab_cli.search`): one FTS5 document per record holds its title,
+description and note bodies, and is rewritten whenever a sync brings the
+record in again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote
+
+import httpx
+
+from qodev_gitlab_cli.api import MAX_PER_PAGE, iter_pages, project_endpoint, raise_for_status
+from qodev_gitlab_cli.cache import cache_dir
+from qodev_gitlab_cli.context import executor
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.context import Context
+
+logger = logging.getLogger(__name__)
+
+# Mirrored resources and the field that identifies a record within a project.
+KINDS = {"issues": "iid", "merge_requests": "iid", "pipelines": "id", "releases": "tag_name"}
+# Resources whose notes are mirrored too.
+NOTED = ("issues", "merge_requests")
+# Resources without an `updated_after` filter, re-fetched in full on every sync.
+UNFILTERED = ("releases",)
+# Request headers that keep a response out of the response cache.
+NO_STORE = {"Cache-Control": "no-store"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    synced_at REAL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    project_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    number INTEGER,
+    state TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (project_id, kind, key)
+);
+CREATE INDEX IF NOT EXISTS items_created ON items (project_id, kind, created_at);
+CREATE INDEX IF NOT EXISTS items_updated ON items (project_id, kind, updated_at);
+CREATE TABLE IF NOT EXISTS notes (
+    project_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    parent INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    created_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (project_id, kind, parent, id)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    iid INTEGER NOT NULL,
+    UNIQUE (project_id, kind, iid)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title, description, notes, tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    project_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    updated_after TEXT NOT NULL,
+    PRIMARY KEY (project_id, kind)
+);
+"""
+
+# List query parameter -> SQL condition on `items` (one placeholder).
+_FILTERS = {
+    "status": "state = ?",
+    "author_username": "json_extract(data, '$.author.username') = ?",
+    "milestone": "json_extract(data, '$.milestone.title') = ?",
+    "ref": "json_extract(data, '$.ref') = ?",
+    "source": "json_extract(data, '$.source') = ?",
+    "updated_after": "updated_at >= ?",
+    "updated_before": "updated_at <= ?",
+    "created_after": "created_at >= ?",
+    "created_before": "created_at <= ?",
+}
+_ORDER = {
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "id": "number",
+    "released_at": "json_extract(data, '$.released_at')",
+}
+_DEFAULT_ORDER = {"issues": "created_at", "merge_requests": "created_at", "pipelines": "id", "releases": "released_at"}
+# Parameters that do not change which records a list returns.
+_IGNORED = {"page", "per_page", "order_by", "sort", "scope", "simple", "view", "with_stats"}
+
+
+def mirror_path(url: httpx.URL, token: str) -> str:
+    """Database of the GitLab instance serving `url`, for `token`."""
+    key = f"{url.scheme}://{url.netloc.decode('ascii')}\0{token}"
+    return os.path.join(cache_dir(), "mirror", hashlib.sha256(key.encode()).hexdigest()[:16] + ".sqlite")
+
+
+def client_mirror_path(client: Any) -> str:
+    """`mirror_path` of the instance and token a `GitLabClient` talks to."""
+    session = client.client
+    return mirror_path(session.base_url, session.headers.get("private-token", ""))
+
+
+class Mirror:
+    """One mirror database; use as a context manager."""
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        # Readers (`--offline`) keep working while a sync writes.
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self) -> Mirror:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.db.close()
+
+    # -- writing -------------------------------------------------------------
+
+    def save_project(self, project: dict[str, Any]) -> None:
+        with self.db:
+            self.db.execute(
+                "DELETE FROM projects WHERE path = ? AND id != ?", (project["path_with_namespace"], project["id"])
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO projects (id, path, synced_at, data) VALUES (?, ?, ?, ?)",
+                (project["id"], project["path_with_namespace"], time.time(), json.dumps(project)),
+            )
+
+    def cursor(self, project_id: int, kind: str) -> str | None:
+        row = self.db.execute(
+            "SELECT updated_after FROM cursors WHERE project_id = ? AND kind = ?", (project_id, kind)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, project_id: int, kind: str, updated_after: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO cursors (project_id, kind, updated_after) VALUES (?, ?, ?)",
+            (project_id, kind, updated_after),
+        )
+
+    def clear(self, project_id: int, kind: str) -> None:
+        """Drop every record (and note) of one kind, e.g. before a full sync."""
+        self.db.execute("DELETE FROM items WHERE project_id = ? AND kind = ?", (project_id, kind))
+        self.db.execute("DELETE FROM notes WHERE project_id = ? AND kind = ?", (project_id, kind))
+        self.db.execute("DELETE FROM cursors WHERE project_id = ? AND kind = ?", (project_id, kind))
+        self.db.execute(
+            "DELETE FROM search_index WHERE rowid IN (SELECT rowid FROM documents WHERE project_id = ? AND kind = ?)",
+            (project_id, kind),
+        )
+        self.db.execute("DELETE FROM documents WHERE project_id = ? AND kind = ?", (project_id, kind))
+
+    def upsert(self, project_id: int, kind: str, items: Iterable[dict[str, Any]]) -> None:
+        key_field = KINDS[kind]
+        self.db.executemany(
+            "INSERT OR REPLACE INTO items (project_id, kind, key, number, state, created_at, updated_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    project_id,
+                    kind,
+                    str(item[key_field]),
+                    item[key_field] if isinstance(item[key_field], int) else None,
+                    item.get("state") or item.get("status"),
+                    item.get("created_at"),
+                    item.get("updated_at"),
+                    json.dumps(item),
+                )
+                for item in items
+            ],
+        )
+
+    def replace_notes(self, project_id: int, kind: str, parent: int, notes: Iterable[dict[str, Any]]) -> None:
+        self.db.execute(
+            "DELETE FROM notes WHERE project_id = ? AND kind = ? AND parent = ?", (project_id, kind, parent)
+        )
+        self.db.executemany(
+            "INSERT OR REPLACE INTO notes (project_id, kind, parent, id, created_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+            [(project_id, kind, parent, note["id"], note.get("created_at"), json.dumps(note)) for note in notes],
+        )
+
+    def index(self, project_id: int, kind: str, item: dict[str, Any], notes: Iterable[dict[str, Any]]) -> None:
+        """Write the search document of one issue or MR, replacing any previous one."""
+        row = self.db.execute(
+            "SELECT rowid FROM documents WHERE project_id = ? AND kind = ? AND iid = ?", (project_id, kind, item["iid"])
+        ).fetchone()
+        if row:
+            rowid = row[0]
+            self.db.execute("DELETE FROM search_index WHERE rowid = ?", (rowid,))
+        else:
+            rowid = self.db.execute(
+                "INSERT INTO documents (project_id, kind, iid) VALUES (?, ?, ?)", (project_id, kind, item["iid"])
+            ).lastrowid
+        # System notes ("changed the description", "added 1 commit") are noise for search.
+        bodies = "\n\n".join(note.get("body") or "" for note in notes if not note.get("system"))
+        self.db.execute(
+            "INSERT INTO search_index (rowid, title, description, notes) VALUES (?, ?, ?, ?)",
+            (rowid, item.get("title") or "", item.get("description") or "", bodies),
+        )
+
+    def reindex(self, project_id: int, kind: str) -> int:
+        """Index stored records that have no search document yet; returns how many."""
+        rows = self.db.execute(
+            "SELECT number, data FROM items WHERE project_id = ? AND kind = ? AND number NOT IN "
+            "(SELECT iid FROM documents WHERE project_id = ? AND kind = ?)",
+            (project_id, kind, project_id, kind),
+        ).fetchall()
+        for iid, data in rows:
+            notes = self.db.execute(
+                "SELECT data FROM notes WHERE project_id = ? AND kind = ? AND parent = ?", (project_id, kind, iid)
+            ).fetchall()
+            self.index(project_id, kind, json.loads(data), [json.loads(note) for (note,) in notes])
+        return len(rows)
+
+    # -- reading -------------------------------------------------------------
+
+    def project(self, ref: str) -> tuple[int, str] | None:
+        """(id, stored JSON) of a mirrored project, by numeric ID or path."""
+        column = "id" if ref.isdigit() else "path"
+        row = self.db.execute(f"SELECT id, data FROM projects WHERE {column} = ?", (ref,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def synced_at(self, project_id: int) -> float | None:
+        """Time of the project's last sync."""
+        row = self.db.execute("SELECT synced_at FROM projects WHERE id = ?", (project_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, project_id: int, kind: str, key: str) -> str | None:
+        row = self.db.execute(
+            "SELECT data FROM items WHERE project_id = ? AND kind = ? AND key = ?", (project_id, kind, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def select(self, project_id: int, kind: str, params: dict[str, str]) -> tuple[list[str], int]:
+        """One page of records matching GitLab list `params`, and the total."""
+        where = ["project_id = ?", "kind = ?"]
+        args: list[Any] = [project_id, kind]
+        for name, value in params.items():
+            if name == "state":
+                if value != "all":
+                    where.append("state = ?")
+                    args.append(value)
+            elif name == "labels":
+                for label in filter(None, (part.strip() for part in value.split(","))):
+                    where.append("EXISTS (SELECT 1 FROM json_each(data, '$.labels') WHERE value = ?)")
+                    args.append(label)
+            elif name == "search":
+                where.append("(json_extract(data, '$.title') LIKE ? OR json_extract(data, '$.description') LIKE ?)")
+                args += [f"%{value}%", f"%{value}%"]
+            elif name in _FILTERS:
+                where.append(_FILTERS[name])
+                args.append(value)
+            elif name not in _IGNORED:
+                logger.debug(f"--offline ignores the {name} filter of {kind}")
+        order = _ORDER.get(params.get("order_by", ""), _ORDER[_DEFAULT_ORDER[kind]])
+        direction = "ASC" if params.get("sort") == "asc" else "DESC"
+        return self._page(
+            f"FROM items WHERE {' AND '.join(where)}", args, f"{order} {direction}, number {direction}", params
+        )
+
+    def notes(self, project_id: int, kind: str, parent: int, params: dict[str, str]) -> tuple[list[str], int]:
+        order = "updated_at" if params.get("order_by") == "updated_at" else "created_at"
+        order = f"json_extract(data, '$.{order}')"
+        direction = "ASC" if params.get("sort") == "asc" else "DESC"
+        return self._page(
+            "FROM notes WHERE project_id = ? AND kind = ? AND parent = ?",
+            [project_id, kind, parent],
+            f"{order} {direction}, id {direction}",
+            params,
+        )
+
+    def _page(self, source: str, args: list[Any], order: str, params: dict[str, str]) -> tuple[list[str], int]:
+        page, per_page = _page_params(params)
+        total = self.db.execute(f"SELECT count(*) {source}", args).fetchone()[0]
+        rows = self.db.execute(
+            f"SELECT data {source} ORDER BY {order} LIMIT ? OFFSET ?", [*args, per_page, (page - 1) * per_page]
+        ).fetchall()
+        return [row[0] for row in rows], total
+
+
+def _page_params(params: dict[str, str]) -> tuple[int, int]:
+    try:
+        page = max(1, int(params.get("page", 1)))
+        per_page = max(1, min(int(params.get("per_page", 20)), MAX_PER_PAGE))
+    except ValueError:
+        return 1, 20
+    return page, per_page
+
+
+# ---------------------------------------------------------------------------
+# sync
+# ---------------------------------------------------------------------------
+
+
+def sync(
+    client: Any,
+    project: str,
+    *,
+    ctx: Context,
+    full: bool = False,
+    kinds: Iterable[str] = tuple(KINDS),
+    bypass_cache: bool = False,
+) -> dict[str, Any]:
+    """Bring the mirror of `project` up to date and return what changed per kind.
+
+    With `bypass_cache`, the records and notes are fetched past the response
+    cache: incremental queries are never repeated, so caching them would only
+    evict useful entries.
+    """
+    headers = NO_STORE if bypass_cache else None
+    started = time.monotonic()
+    response = client.client.get(project_endpoint(project))
+    raise_for_status(response)
+    info = response.json()
+    result: dict[str, Any] = {"project": info["path_with_namespace"]}
+    with Mirror(client_mirror_path(client)) as mirror:
+        mirror.save_project(info)
+        result["notes"] = 0
+        for kind in kinds:
+            changed, notes = _sync_kind(client, mirror, info, kind, ctx=ctx, full=full, headers=headers)
+            result[kind] = changed
+            result["notes"] += notes
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def _sync_kind(
+    client: Any,
+    mirror: Mirror,
+    project: dict[str, Any],
+    kind: str,
+    *,
+    ctx: Context,
+    full: bool,
+    headers: dict[str, str] | None,
+) -> tuple[int, int]:
+    project_id = project["id"]
+    endpoint = project_endpoint(str(project_id), kind)
+    cursor = None if full or kind in UNFILTERED else mirror.cursor(project_id, kind)
+    if kind in UNFILTERED:
+        params: dict[str, Any] = {"order_by": "released_at", "sort": "desc"}
+    else:
+        # Oldest change first, so an interrupted sync can resume from its cursor.
+        params = {"order_by": "updated_at", "sort": "asc"}
+        if cursor:
+            params["updated_after"] = cursor
+    pages = iter_pages(client, endpoint, params, concurrency=ctx.concurrency, headers=headers)
+    items = [item for page in pages for item in page.items]
+    logger.info(f"sync {project['path_with_namespace']}: {len(items)} {kind} changed")
+
+    notes: list[tuple[int, list[dict[str, Any]]]] = []
+    if kind in NOTED and items:
+
+        def fetch(iid: int) -> tuple[int, list[dict[str, Any]]]:
+            pages = iter_pages(
+                client, project_endpoint(str(project_id), kind, iid, "notes"), {"sort": "asc"}, headers=headers
+            )
+            return iid, [note for page in pages for note in page.items]
+
+        with executor(ctx.concurrency, thread_name_prefix="qodev-gitlab-sync") as pool:
+            notes = list(pool.map(fetch, [item["iid"] for item in items]))
+
+    # Records, notes and the cursor move forward together or not at all.
+    with mirror.db:
+        if full or kind in UNFILTERED:
+            mirror.clear(project_id, kind)
+        mirror.upsert(project_id, kind, items)
+        if kind in NOTED:
+            for item, (iid, parent_notes) in zip(items, notes, strict=True):
+                mirror.replace_notes(project_id, kind, iid, parent_notes)
+                mirror.index(project_id, kind, item, parent_notes)
+            # Records mirrored before the search index existed.
+            mirror.reindex(project_id, kind)
+        newest = max((item["updated_at"] for item in items if item.get("updated_at")), default=cursor)
+        if newest and kind not in UNFILTERED:
+            mirror.set_cursor(project_id, kind, newest)
+    return len(items), sum(len(parent_notes) for _, parent_notes in notes)
+
+
+# ---------------------------------------------------------------------------
+# --offline
+# ---------------------------------------------------------------------------
+
+
+class OfflineTransport(httpx.BaseTransport):
+    """httpx transport that answers requests from the mirror while `--offline` is set.
+
+    The flag is read from the context on every request, like the cache mode of
+    `CachingTransport`, so a pooled client follows each invocation's options.
+    """
+
+    def __init__(self, inner: httpx.BaseTransport, ctx: Context) -> None:
+        self.inner = inner
+        self.ctx = ctx
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.ctx.offline:
+            return self.inner.handle_request(request)
+        if request.method != "GET":
+            return _unavailable(request, f"{request.method} requests need GitLab (--offline)")
+        path = mirror_path(request.url, request.headers.get("private-token", ""))
+        if not os.path.exists(path):
+            return _unavailable(request, "No offline mirror yet; run `qodev-gitlab sync` first")
+        with Mirror(path) as mirror:
+            response = answer(mirror, request)
+        response.extensions["qodev_cache"] = "offline"
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def answer(mirror: Mirror, request: httpx.Request) -> httpx.Response:
+    """Serve a GET of a mirrored endpoint the way GitLab would."""
+    # The raw path keeps `%2F` in project paths, so segments split cleanly.
+    raw = request.url.raw_path.decode("ascii").split("?", 1)[0]
+    segments = [unquote(part) for part in raw.split("/api/v4/", 1)[-1].strip("/").split("/")]
+    if len(segments) < 2 or segments[0] != "projects":
+        return _unavailable(request, f"{request.url.path} is not part of the offline mirror")
+    project = mirror.project(segments[1])
+    if project is None:
+        return _unavailable(request, f"{segments[1]} is not mirrored; run `qodev-gitlab sync -p {segments[1]}`")
+    project_id, project_data = project
+    rest = segments[2:]
+    params = dict(request.url.params)
+
+    if not rest:
+        return _json(request, project_data)
+    kind = rest[0]
+    if kind in KINDS and len(rest) == 1:
+        rows, total = mirror.select(project_id, kind, params)
+        return _list(request, rows, total, params)
+    if kind in KINDS and len(rest) == 2:
+        data = mirror.get(project_id, kind, rest[1])
+        return _json(request, data) if data is not None else _not_found(request)
+    if kind in NOTED and len(rest) == 3 and rest[2] == "notes" and rest[1].isdigit():
+        if mirror.get(project_id, kind, rest[1]) is None:
+            return _not_found(request)
+        rows, total = mirror.notes(project_id, kind, int(rest[1]), params)
+        return _list(request, rows, total, params)
+    return _unavailable(request, f"{request.url.path} is not part of the offline mirror")
+
+
+def _json(request: httpx.Request, body: str) -> httpx.Response:
+    return httpx.Response(
+        200, headers={"Content-Type": "application/json"}, content=body.encode("utf-8"), request=request
+    )
+
+
+def _list(request: httpx.Request, rows: list[str], total: int, params: dict[str, str]) -> httpx.Response:
+    page, per_page = _page_params(params)
+    total_pages = max(1, -(-total // per_page))
+    response = _json(request, "[" + ",".join(rows) + "]")
+    response.headers.update(
+        {
+            "X-Total": str(total),
+            "X-Total-Pages": str(total_pages),
+            "X-Page": str(page),
+            "X-Per-Page": str(per_page),
+            "X-Next-Page": str(page + 1) if page < total_pages else "",
+        }
+    )
+    return response
+
+
+def _not_found(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(404, json={"message": "404 Not found (offline mirror)"}, request=request)
+
+
+def _unavailable(request: httpx.Request, message: str) -> httpx.Response:
+    return httpx.Response(504, json={"message": message}, request=request)
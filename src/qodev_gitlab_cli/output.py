@@ -1,19 +1,44 @@
-"""Output formatting — JSON and Markdown modes."""
+"""Output formatting — JSON, NDJSON, Markdown and plain table/TSV modes."""
 
 from __future__ import annotations
 
 import json
+import os
 import sys
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import replace
 from datetime import datetime
-from typing import Any
-
-from rich.console import Console
-from rich.markdown import Markdown
+from typing import TYPE_CHECKING, Any, NoReturn
 
 from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.tracing import span
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from qodev_gitlab_cli.api import Page
+    from qodev_gitlab_cli.query import Query
+
+# rich is only imported on the markdown/error path; consoles are created on first use.
+_consoles: dict[bool, Console] = {}
+
+# `--format table`/`tsv`: formatters render these directly instead of producing markdown.
+PLAIN_FORMATS = ("table", "tsv")
+TABLE_MAX_WIDTH = 60
+
+
+class PlainText(str):
+    """Formatter output that is already rendered and is written as-is."""
+
 
-console = Console(stderr=True)
-stdout_console = Console()
+def get_console(*, stderr: bool = False) -> Console:
+    """Return the shared rich console for stdout (or stderr)."""
+    if stderr not in _consoles:
+        from rich.console import Console
+
+        _consoles[stderr] = Console(stderr=stderr)
+    return _consoles[stderr]
 
 
 def serialize(obj: Any) -> Any:
@@ -27,21 +52,76 @@ def serialize(obj: Any) -> Any:
     return obj
 
 
-def output_json(data: Any) -> None:
-    print(json.dumps(serialize(data), indent=2, default=str))
+def output_json(data: Any, *, compact: bool = False) -> None:
+    """Write `data` as JSON, streamed in pieces (see `qodev_gitlab_cli.encoding`)."""
+    from qodev_gitlab_cli.encoding import write_json
+
+    with span("render.json"):
+        write_json(data, compact=compact)
+
+
+def output_json_line(data: Any) -> None:
+    """Write one compact JSON document on its own line (NDJSON)."""
+    from qodev_gitlab_cli.encoding import dumps
+
+    sys.stdout.write(dumps(data, compact=True).decode() + "\n")
 
 
 def output_markdown(text: str) -> None:
-    stdout_console.print(Markdown(text))
+    with span("render.markdown"):
+        from rich.markdown import Markdown
+
+        get_console().print(Markdown(text))
 
 
 def output(data: Any, *, ctx: Context, format_fn: Any = None) -> None:
     """Route output through the correct formatter."""
-    if ctx.json_mode:
-        output_json(data)
+    if ctx.json_mode and ctx.fields:
+        from qodev_gitlab_cli.formatters.generic import select_fields
+
+        data = select_fields(data, ctx.fields)
+    if ctx.output_format == "ndjson":
+        output_json_line(data)
+    elif ctx.json_mode:
+        output_json(data, compact=ctx.compact)
     else:
-        md = format_fn(data) if format_fn else generic_markdown(data)
-        output_markdown(md)
+        with span("render.format"):
+            md = format_fn(data) if format_fn else generic_markdown(data)
+        if isinstance(md, PlainText):
+            output_plain(md)
+        else:
+            output_markdown(md)
+
+
+def output_plain(text: str) -> None:
+    with span("render.plain"):
+        sys.stdout.write(text + "\n" if text else "")
+
+
+def output_raw(data: bytes) -> None:
+    """Write bytes to stdout unmodified and flush (logs, raw downloads)."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+
+def output_json_stream(fields: dict[str, Any], key: str, chunks: Iterable[str], *, ctx: Context) -> None:
+    """Write a JSON object whose last field is a string streamed from text chunks.
+
+    The document matches what `output()` would print for ``{**fields, key: text}``
+    without ever holding the full text in memory.
+    """
+    from qodev_gitlab_cli.encoding import dumps
+
+    document = {**fields, key: ""}
+    skeleton = dumps(document, compact=ctx.compact or ctx.output_format == "ndjson").decode()
+    split = skeleton.rindex('""') + 1
+    write = sys.stdout.write
+    write(skeleton[:split])
+    for chunk in chunks:
+        write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+    write(skeleton[split:] + "\n")
+    sys.stdout.flush()
 
 
 def output_list(
@@ -52,28 +132,176 @@ def output_list(
     limit: int = 25,
     ctx: Context,
     format_fn: Any,
+    total_pages: int | None = None,
+    next_page: int | None = None,
 ) -> None:
     """Output a paginated list."""
-    if total is None:
+    if total is None and next_page is None:
         total = len(items)
 
     if ctx.json_mode:
-        output_json({"items": serialize(items), "total": total, "page": page, "limit": limit})
+        payload: dict[str, Any] = {"items": items, "total": total, "page": page, "limit": limit}
+        if total_pages is not None:
+            payload["total_pages"] = total_pages
+        if next_page is not None:
+            payload["next_page"] = next_page
+        output_json(payload, compact=ctx.compact)
     else:
-        md = format_fn(items, total=total, page=page)
-        if total > page * limit:
+        with span("render.format"):
+            md = format_fn(items, total=total or 0, page=page)
+        if isinstance(md, PlainText):
+            # Only rows go to stdout so the output can be piped; hints go to stderr.
+            output_plain(md)
+            hint = _page_hint(len(items), total, page, limit, next_page)
+            if hint and ctx.output_format == "table":
+                print(hint, file=sys.stderr)
+            return
+        if total is None:
+            md += f"\n\n*Showing {len(items)} results. Use `--page {next_page}` for next page.*"
+        elif total > page * limit:
             md += f"\n\n*Showing {len(items)} of {total} results. Use `--page {page + 1}` for next page.*"
         elif total > 0:
             md += f"\n\n*Showing {len(items)} of {total} results.*"
         output_markdown(md)
 
 
-def error(message: str, *, ctx: Context | None = None, code: str = "error", exit_code: int = 1) -> None:
-    """Output an error and exit."""
+def output_pages(
+    pages: Iterable[Page],
+    *,
+    ctx: Context,
+    format_fn: Any,
+    transform: Any = None,
+    keep: Sequence[str] = (),
+) -> None:
+    """Collect pages from `api.paginate` and output them as one list.
+
+    In NDJSON mode the pages are streamed instead; see `stream_ndjson`.
+    `--where` filters each page as it arrives; `--sort` collects every page
+    first.
+
+    Args:
+        transform: Optional function applied to each item as its page arrives.
+        keep: Fields passed as `keep` to `api.paginate`, output besides `--fields`.
+    """
+    query = ctx.query
+    if query is not None:
+        if transform:
+            pages = (replace(page, items=[transform(item) for item in page.items]) for page in pages)
+            transform = None
+        pages = query.filter_pages(pages)
+        if query.sort:
+            pages = [_sorted_page(pages, query)]
+        if ctx.fields:
+            shown = (*ctx.fields, *keep)
+            pages = (replace(page, items=query.project(page.items, shown)) for page in pages)
+
+    if ctx.output_format == "ndjson":
+        stream_ndjson(pages, ctx=ctx, transform=transform)
+        return
+
+    items: list[Any] = []
+    last: Page | None = None
+    for current in pages:
+        items.extend(map(transform, current.items) if transform else current.items)
+        last = current
+
+    if last is None or ctx.all_pages:
+        output_list(items=items, total=len(items), page=1, limit=max(len(items), 1), ctx=ctx, format_fn=format_fn)
+        return
+    output_list(
+        items=items,
+        total=last.total,
+        page=last.page,
+        limit=last.per_page,
+        ctx=ctx,
+        format_fn=format_fn,
+        total_pages=last.total_pages,
+        next_page=last.next_page,
+    )
+
+
+def _sorted_page(pages: Iterable[Page], query: Query) -> Page:
+    from qodev_gitlab_cli.api import Page
+
+    items: list[Any] = []
+    last: Page | None = None
+    for current in pages:
+        items.extend(current.items)
+        last = current
+    items = query.finish(items)
+    # Keep the next-page hint of a single `--page` fetch.
+    return Page(
+        items=items, page=last.page if last else 1, per_page=len(items), next_page=last.next_page if last else None
+    )
+
+
+def stream_ndjson(pages: Iterable[Page], *, ctx: Context, transform: Any = None) -> None:
+    """Write each item as one JSON line as soon as its page arrives.
+
+    Only the current page is held in memory. A final ``{"_meta": ...}`` line
+    reports the item count, pagination headers of the last page and elapsed
+    seconds, so consumers can tell a complete stream from a truncated one.
+    """
+    start = time.perf_counter()
+    count = fetched = 0
+    last: Page | None = None
+    for current in pages:
+        for item in current.items:
+            output_json_line(transform(item) if transform else item)
+        sys.stdout.flush()
+        count += len(current.items)
+        fetched += 1
+        last = current
+
+    meta: dict[str, Any] = {"count": count, "pages": fetched}
+    if last is not None and not ctx.all_pages:
+        meta.update(total=last.total, page=last.page, total_pages=last.total_pages, next_page=last.next_page)
+    else:
+        meta["total"] = count
+    meta["elapsed"] = round(time.perf_counter() - start, 3)
+    output_json_line({"_meta": meta})
+    sys.stdout.flush()
+
+
+def _page_hint(count: int, total: int | None, page: int, limit: int, next_page: int | None) -> str | None:
+    if total is None and next_page:
+        return f"Showing {count} results. Use --page {next_page} for next page."
+    if total is not None and total > page * limit:
+        return f"Showing {count} of {total} results. Use --page {page + 1} for next page."
+    return None
+
+
+def silence_stdout() -> None:
+    """Point stdout at /dev/null once the reader has gone away (e.g. `| head`).
+
+    Python flushes stdout at exit; without this that flush raises a second
+    BrokenPipeError and prints a traceback to stderr.
+    """
+    stdout = sys.__stdout__
+    if stdout is None or sys.stdout is not stdout:
+        return
+    try:
+        fd = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(fd, stdout.fileno())
+    except (OSError, ValueError):
+        pass
+
+
+def error(message: str, *, ctx: Context | None = None, code: str = "error", exit_code: int = 1) -> NoReturn:
+    """Output an error and exit.
+
+    JSON errors include the rate-limit budget (``rate_limit``) once GitLab has reported one.
+    """
     if ctx and ctx.json_mode:
-        print(json.dumps({"error": message, "code": code}))
+        from qodev_gitlab_cli.ratelimit import current_budget
+
+        payload: dict[str, Any] = {"error": message, "code": code}
+        budget = current_budget()
+        if budget is not None:
+            payload["rate_limit"] = budget
+        print(json.dumps(payload))
     else:
-        console.print(f"[red]Error:[/red] {message}")
+        get_console(stderr=True).print(f"[red]Error:[/red] {message}")
     sys.exit(exit_code)
 
 
@@ -102,6 +330,41 @@ def _dict_to_md(d: dict) -> str:
     return "\n".join(lines)
 
 
+def plain_table(rows: list[list[str]], headers: list[str], *, tsv: bool = False) -> PlainText:
+    """Render rows as aligned columns (or tab-separated values) without markdown."""
+    if tsv:
+        lines = ["\t".join(headers)]
+        lines.extend("\t".join(_tsv_cell(cell) for cell in row) for row in rows)
+        return PlainText("\n".join(lines))
+
+    # Only the last column may run long (URLs, titles in detail views stay whole).
+    last = len(headers) - 1
+    cells = [[_table_cell(cell, truncate=i != last) for i, cell in enumerate(row)] for row in rows]
+    widths = [len(h) for h in headers]
+    for row in cells:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+
+    def line(row: list[str]) -> str:
+        return "  ".join(cell if i == last else cell.ljust(widths[i]) for i, cell in enumerate(row)).rstrip()
+
+    lines = [line(headers), line(["-" * w for w in widths])]
+    lines.extend(line(row) for row in cells)
+    return PlainText("\n".join(lines))
+
+
+def _tsv_cell(value: str) -> str:
+    return value.replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+
+def _table_cell(value: str, *, truncate: bool) -> str:
+    value = " ".join(value.split())
+    if not truncate or len(value) <= TABLE_MAX_WIDTH:
+        return value
+    return value[: TABLE_MAX_WIDTH - 1] + "…"
+
+
 def md_table(rows: list[dict[str, str]], headers: list[tuple[str, str]]) -> str:
     """Build a markdown table from rows."""
     if not rows:
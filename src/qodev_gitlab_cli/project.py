@@ -1,4 +1,11 @@
-"""Git remote → GitLab project path detection."""
+"""Git remote → GitLab project path detection.
+
+The repository layout is resolved in pure Python: walk up to `.git` (following
+`gitdir:` files used by worktrees and submodules) and parse `config` and `HEAD`
+directly. Parsed config files are cached by mtime. Setups the parser does not
+model (GIT_DIR overrides, `include`s, `insteadOf` URL rewriting) fall back to
+the `git` subprocess.
+"""
 
 from __future__ import annotations
 
@@ -6,31 +13,51 @@ import logging
 import os
 import re
 import subprocess
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
+class _NeedsGit(Exception):
+    """The pure-Python resolver cannot answer reliably; ask git instead."""
+
+
 def detect_project_from_git(base_url: str | None = None) -> str | None:
     """Detect GitLab project path from the current git remote.
 
     Returns namespace/project string or None.
     """
-    git_root = _find_git_root(os.getcwd())
-    if not git_root:
-        return None
-
-    remote_url = _get_remote_url(git_root)
+    remote_url = get_remote_url(os.getcwd())
     if not remote_url:
         return None
 
     return _parse_project_path(remote_url, base_url)
 
 
-def _find_git_root(start_path: str) -> str | None:
+def get_remote_url(start_path: str, remote: str = "origin") -> str | None:
+    """Return the URL of a remote for the repository containing start_path."""
+    try:
+        return _read_remote_url(start_path, remote)
+    except _NeedsGit as exc:
+        logger.debug(f"Falling back to git for remote detection: {exc}")
+
+    git_root = _find_git_root(start_path)
+    if not git_root:
+        return None
+    return _get_remote_url(git_root)
+
+
+def get_current_branch() -> str | None:
+    """Get the current git branch name ("HEAD" when detached, like git)."""
+    try:
+        return _read_current_branch(os.getcwd())
+    except _NeedsGit as exc:
+        logger.debug(f"Falling back to git for branch detection: {exc}")
+
     try:
         result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=start_path,
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
             capture_output=True,
             text=True,
             timeout=5,
@@ -42,11 +69,194 @@ def _find_git_root(start_path: str) -> str | None:
         return None
 
 
-def _get_remote_url(git_root: str) -> str | None:
+# ---------------------------------------------------------------------------
+# Pure-Python resolver
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _GitConfig:
+    sections: dict[tuple[str, str | None], dict[str, list[str]]] = field(default_factory=dict)
+    has_includes: bool = False
+
+    def get(self, section: str, subsection: str | None, key: str) -> str | None:
+        values = self.sections.get((section, subsection), {}).get(key.lower())
+        return values[-1] if values else None
+
+    @property
+    def rewrites_urls(self) -> bool:
+        return any(
+            name == "url" and ("insteadof" in keys or "pushinsteadof" in keys)
+            for (name, _), keys in self.sections.items()
+        )
+
+
+# config path -> ((mtime_ns, size), parsed config)
+_config_cache: dict[str, tuple[tuple[int, int], _GitConfig]] = {}
+
+_SECTION_RE = re.compile(r'^\s*\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]\s*(.*)$')
+_KEY_RE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9-]*)\s*(?:=\s*(.*?))?\s*$")
+
+
+def _find_git_dir(start_path: str) -> str | None:
+    """Walk up from start_path to the repository's git dir."""
+    if any(os.getenv(var) for var in ("GIT_DIR", "GIT_WORK_TREE", "GIT_CONFIG_PARAMETERS", "GIT_CEILING_DIRECTORIES")):
+        raise _NeedsGit("GIT_* environment overrides are set")
+
+    current = os.path.abspath(start_path)
+    while True:
+        candidate = os.path.join(current, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.isfile(candidate):
+            return _read_gitdir_file(candidate)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _read_gitdir_file(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8") as f:
+            content = f.read().strip()
+    except OSError as exc:
+        raise _NeedsGit(f"unreadable {path}") from exc
+    if not content.startswith("gitdir:"):
+        raise _NeedsGit(f"unrecognised .git file {path}")
+    gitdir = content[len("gitdir:") :].strip()
+    return os.path.normpath(os.path.join(os.path.dirname(path), gitdir))
+
+
+def _common_dir(git_dir: str) -> str:
+    """Return the shared git dir (differs from git_dir for linked worktrees)."""
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except FileNotFoundError:
+        return git_dir
+    except OSError as exc:
+        raise _NeedsGit(f"unreadable commondir in {git_dir}") from exc
+
+
+def _load_config(path: str) -> _GitConfig | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        raise _NeedsGit(f"cannot stat {path}") from exc
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = _parse_config(f.read())
+    except (OSError, UnicodeDecodeError) as exc:
+        raise _NeedsGit(f"cannot read {path}") from exc
+    _config_cache[path] = (stamp, config)
+    return config
+
+
+def _parse_config(text: str) -> _GitConfig:
+    config = _GitConfig()
+    current: dict[str, list[str]] | None = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            m = _SECTION_RE.match(line)
+            if not m:
+                raise _NeedsGit(f"unsupported section header: {line}")
+            name = m.group(1).lower()
+            subsection = m.group(2).replace('\\"', '"').replace("\\\\", "\\") if m.group(2) is not None else None
+            if subsection is None and "." in name:
+                # Deprecated [section.subsection] syntax
+                name, subsection = name.split(".", 1)
+            if name in ("include", "includeif"):
+                config.has_includes = True
+            current = config.sections.setdefault((name, subsection), {})
+            line = m.group(3).strip()
+            if not line:
+                continue
+        if current is None:
+            continue
+        if line.endswith("\\"):
+            raise _NeedsGit("line continuations are not supported")
+        m = _KEY_RE.match(line)
+        if not m:
+            continue
+        value = m.group(2) if m.group(2) is not None else "true"
+        current.setdefault(m.group(1).lower(), []).append(_unquote(value))
+    return config
+
+
+def _unquote(value: str) -> str:
+    # Strip trailing comments outside quotes, then surrounding quotes.
+    out: list[str] = []
+    quoted = False
+    for ch in value:
+        if ch == '"':
+            quoted = not quoted
+            continue
+        if ch in "#;" and not quoted:
+            break
+        out.append(ch)
+    return "".join(out).strip()
+
+
+def _global_configs() -> list[_GitConfig]:
+    home = os.path.expanduser("~")
+    xdg = os.getenv("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    configs = []
+    for path in (os.path.join(xdg, "git", "config"), os.path.join(home, ".gitconfig")):
+        config = _load_config(path)
+        if config is not None:
+            configs.append(config)
+    return configs
+
+
+def _read_remote_url(start_path: str, remote: str) -> str | None:
+    git_dir = _find_git_dir(start_path)
+    if git_dir is None:
+        return None
+    config = _load_config(os.path.join(_common_dir(git_dir), "config"))
+    if config is None:
+        raise _NeedsGit(f"no config in {git_dir}")
+    if any(c.rewrites_urls or c.has_includes for c in [config, *_global_configs()]):
+        raise _NeedsGit("config uses includes or insteadOf rewriting")
+    return config.get("remote", remote, "url")
+
+
+def _read_current_branch(start_path: str) -> str | None:
+    git_dir = _find_git_dir(start_path)
+    if git_dir is None:
+        return None
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError as exc:
+        raise _NeedsGit(f"unreadable HEAD in {git_dir}") from exc
+    if head.startswith("ref:"):
+        ref = head[len("ref:") :].strip()
+        return ref.removeprefix("refs/heads/")
+    return "HEAD"
+
+
+# ---------------------------------------------------------------------------
+# Subprocess fallback
+# ---------------------------------------------------------------------------
+
+
+def _find_git_root(start_path: str) -> str | None:
     try:
         result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=git_root,
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=start_path,
             capture_output=True,
             text=True,
             timeout=5,
@@ -58,11 +268,11 @@ def _get_remote_url(git_root: str) -> str | None:
         return None
 
 
-def get_current_branch() -> str | None:
-    """Get the current git branch name."""
+def _get_remote_url(git_root: str) -> str | None:
     try:
         result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            ["git", "remote", "get-url", "origin"],
+            cwd=git_root,
             capture_output=True,
             text=True,
             timeout=5,
@@ -74,6 +284,7 @@ def get_current_branch() -> str | None:
         return None
 
 
+@lru_cache(maxsize=64)
 def _parse_project_path(remote_url: str, base_url: str | None = None) -> str | None:
     """Extract project path from SSH or HTTPS remote URL."""
     # Determine the domain to match against
@@ -0,0 +1,290 @@
+"""`--where`, `--sort` and `--top`: filtering list output in-process.
+
+A `--where` expression uses Python comparison syntax over item fields, e.g.
+``state == "opened" and author.username in ["a", "b"]``. It is parsed once
+with `ast` into a tree of closures, so no code is ever evaluated. Supported:
+``and``/``or``/``not``, the comparisons ``== != < <= > >= in`` and ``not in``,
+dotted field paths, and string, number, ``true``/``false``/``null`` and list
+literals. Comparing values of different types (or with a missing field) is
+false rather than an error.
+
+Top-level ``and`` terms that GitLab can evaluate itself (`PUSHDOWN`) are also
+sent as query parameters. The filter still runs locally, so a pushed-down
+parameter only needs to return a superset.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+from qodev_gitlab_cli.errors import UsageError
+from qodev_gitlab_cli.formatters.generic import _get, select_fields
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.api import Page
+
+_DATE_PARAMS = {
+    ">": "{}_after",
+    ">=": "{}_after",
+    "<": "{}_before",
+    "<=": "{}_before",
+}
+_ISSUABLE: dict[str, dict[str, str]] = {
+    "state": {"==": "state"},
+    "author.username": {"==": "author_username"},
+    "labels": {"contains": "labels"},
+    "updated_at": {op: param.format("updated") for op, param in _DATE_PARAMS.items()},
+    "created_at": {op: param.format("created") for op, param in _DATE_PARAMS.items()},
+}
+# Resource -> field path -> operator -> list endpoint query parameter.
+PUSHDOWN: dict[str, dict[str, dict[str, str]]] = {
+    "merge_requests": _ISSUABLE,
+    "issues": _ISSUABLE,
+    "pipelines": {
+        "status": {"==": "status"},
+        "ref": {"==": "ref"},
+        "source": {"==": "source"},
+        "updated_at": {op: param.format("updated") for op, param in _DATE_PARAMS.items()},
+    },
+}
+
+_COMPARE: dict[type[ast.cmpop], tuple[str, Callable[[Any, Any], bool]]] = {
+    ast.Eq: ("==", operator.eq),
+    ast.NotEq: ("!=", operator.ne),
+    ast.Lt: ("<", operator.lt),
+    ast.LtE: ("<=", operator.le),
+    ast.Gt: (">", operator.gt),
+    ast.GtE: (">=", operator.ge),
+    ast.In: ("in", lambda a, b: a in b),
+    ast.NotIn: ("not in", lambda a, b: a not in b),
+}
+_CONSTANTS = {"true": True, "false": False, "null": None}
+
+
+class QueryError(UsageError):
+    pass
+
+
+@dataclass(frozen=True)
+class Condition:
+    """A ``field <op> value`` term of the top-level ``and`` (``contains`` for ``value in field``)."""
+
+    path: str
+    op: str
+    value: Any
+
+
+@dataclass
+class Query:
+    """Compiled `--where`/`--sort`/`--top` options."""
+
+    where: Callable[[Any], bool] | None = None
+    sort: list[tuple[str, bool]] = field(default_factory=list)  # (path, descending)
+    top: int | None = None
+    fields: tuple[str, ...] = ()  # paths the query reads
+    conditions: list[Condition] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, where: str | None = None, sort: str | None = None, top: int | None = None) -> Query | None:
+        """Compile the options, or return None when none is given. Raises `QueryError`."""
+        if where is None and sort is None and top is None:
+            return None
+        if top is not None and top < 1:
+            raise QueryError("--top must be at least 1.")
+        query = cls(top=top)
+        paths: list[str] = []
+        if where is not None:
+            try:
+                tree = ast.parse(where.strip(), mode="eval").body
+            except SyntaxError as exc:
+                raise QueryError(f"Invalid --where expression: {exc.msg}") from None
+            query.where = _compile(tree, paths)
+            query.conditions = _conditions(tree)
+        for key in (sort or "").split(","):
+            key = key.strip()
+            if key:
+                path = key.lstrip("-+")
+                query.sort.append((path, key.startswith("-")))
+                paths.append(path)
+        query.fields = tuple(dict.fromkeys(paths))
+        return query
+
+    def pushdown(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Query parameters for the conditions GitLab can apply to `endpoint` itself.
+
+        `params` are the ones the user set through the command's options (not
+        its defaults). Labels are combined with them, and ``all`` (as in
+        ``--state all``) gives way to an equality. Any other value set differently
+        raises `QueryError`, since no item could match both.
+        """
+        supported = PUSHDOWN.get(endpoint.rsplit("/", 1)[-1], {})
+        pushed: dict[str, Any] = {}
+        for condition in self.conditions:
+            param = supported.get(condition.path, {}).get(condition.op)
+            if param is None or not isinstance(condition.value, str):
+                continue
+            if param == "labels":
+                # GitLab matches items carrying every listed label.
+                existing = pushed.get(param) or (params or {}).get(param)
+                pushed[param] = f"{existing},{condition.value}" if existing else condition.value
+                continue
+            existing = (params or {}).get(param)
+            if existing in (None, "all", condition.value):
+                pushed[param] = condition.value
+            elif condition.op == "==":
+                raise QueryError(
+                    f"--where {condition.path} == {condition.value!r} contradicts the command's {param}={existing!r}."
+                )
+        return pushed
+
+    def matches(self, item: Any) -> bool:
+        # Failure records of multi-project and multi-ID output always pass.
+        return self.where is None or (isinstance(item, dict) and "error" in item) or self.where(item)
+
+    def filter_pages(self, pages: Iterable[Page]) -> Iterator[Page]:
+        """Filter each page as it arrives; without `sort`, stop fetching once `top` items passed.
+
+        Filtered pages drop the server's totals, which no longer apply.
+        """
+        remaining = self.top if not self.sort else None
+        for page in pages:
+            items = [item for item in page.items if self.matches(item)]
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            done = remaining == 0
+            yield replace(page, items=items, total=None, total_pages=None, next_page=None if done else page.next_page)
+            if done:
+                return
+
+    def finish(self, items: list[Any]) -> list[Any]:
+        """Sort `items` and cut them to `top`."""
+        for path, descending in reversed(self.sort):
+            # Items without the field go last in either direction.
+            present = [item for item in items if _get(item, path) is not None]
+            missing = [item for item in items if _get(item, path) is None]
+            try:
+                present.sort(key=lambda item: _get(item, path), reverse=descending)
+            except TypeError:
+                present.sort(key=lambda item: str(_get(item, path)), reverse=descending)
+            items = present + missing
+        return items[: self.top] if self.top is not None else items
+
+    def project(self, items: list[Any], fields: Sequence[str]) -> list[Any]:
+        """Drop what was fetched only for the query from items selected with `--fields`.
+
+        `fields` are the paths to output (``--fields`` plus what the caller
+        needs); with none, items are returned whole.
+        """
+        if not fields:
+            return items
+        roots = {path.split(".", 1)[0] for path in self.fields}
+        projected = []
+        for item in items:
+            if isinstance(item, dict) and "error" not in item:
+                item = dict(item)
+                for root in roots:
+                    wanted = [path for path in fields if path.split(".", 1)[0] == root]
+                    if not wanted:
+                        item.pop(root, None)
+                    elif root not in wanted:
+                        item[root] = select_fields(item, wanted)[root]
+            projected.append(item)
+        return projected
+
+    def apply(self, items: list[Any]) -> list[Any]:
+        """Filter, sort and cut an already collected list."""
+        return self.finish([item for item in items if self.matches(item)])
+
+
+def _compile(node: ast.expr, paths: list[str]) -> Callable[[Any], Any]:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(value, paths) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda item: all(part(item) for part in parts)
+        return lambda item: any(part(item) for part in parts)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner = _compile(node.operand, paths)
+        return lambda item: not inner(item)
+    if isinstance(node, ast.Compare):
+        return _compile_compare(node, paths)
+    path = _path(node)
+    if path is not None:
+        if path in _CONSTANTS:
+            constant = _CONSTANTS[path]
+            return lambda item: constant
+        paths.append(path)
+        return lambda item: _get(item, path)
+    value = _constant(node)
+    return lambda item: value
+
+
+def _compile_compare(node: ast.Compare, paths: list[str]) -> Callable[[Any], bool]:
+    operands = [_compile(operand, paths) for operand in (node.left, *node.comparators)]
+    ops = []
+    for op in node.ops:
+        if type(op) not in _COMPARE:
+            raise QueryError(f"Unsupported operator in --where: {ast.unparse(node)}")
+        ops.append(_COMPARE[type(op)][1])
+
+    def compare(item: Any) -> bool:
+        left = operands[0](item)
+        for op, operand in zip(ops, operands[1:], strict=True):
+            right = operand(item)
+            try:
+                if not op(left, right):
+                    return False
+            except TypeError:
+                return False
+            left = right
+        return True
+
+    return compare
+
+
+def _path(node: ast.expr) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _path(node.value)
+        return f"{parent}.{node.attr}" if parent is not None else None
+    return None
+
+
+def _literal(node: ast.expr) -> Any:
+    if isinstance(node, ast.Constant) and (node.value is None or isinstance(node.value, (str, int, float, bool))):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return tuple(_constant(element) for element in node.elts)
+    raise QueryError(f"Unsupported --where expression: {ast.unparse(node)}")
+
+
+def _constant(node: ast.expr) -> Any:
+    path = _path(node)
+    if path in _CONSTANTS:
+        return _CONSTANTS[path]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_literal(node.operand)
+    return _literal(node)
+
+
+def _conditions(node: ast.expr) -> list[Condition]:
+    terms = node.values if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And) else [node]
+    conditions = []
+    for term in terms:
+        if not isinstance(term, ast.Compare) or len(term.ops) != 1 or type(term.ops[0]) not in _COMPARE:
+            continue
+        op = _COMPARE[type(term.ops[0])][0]
+        left, right = term.left, term.comparators[0]
+        try:
+            if _path(left) not in (None, *_CONSTANTS) and _path(right) is None:
+                conditions.append(Condition(str(_path(left)), op, _literal(right)))
+            elif op == "in" and _path(right) not in (None, *_CONSTANTS) and _path(left) is None:
+                conditions.append(Condition(str(_path(right)), "contains", _literal(left)))
+        except QueryError:
+            continue
+    return conditions
@@ -0,0 +1,193 @@
+"""Client-side pacing against GitLab's rate limits.
+
+GitLab reports the remaining request budget of the current window in
+``RateLimit-Remaining`` and its end (a Unix timestamp) in ``RateLimit-Reset``
+and answers ``429`` with ``Retry-After`` once it is used up. `RateLimiter`
+keeps that budget per host, shared by every thread of the process (parallel
+pages, multi-project fan-out, batch commands). Requests take a token from it
+before they are sent. Once the budget falls below `SLOW_DOWN_BELOW` of the
+limit, the remaining tokens are spread evenly over the rest of the window, so
+the process slows down before GitLab starts refusing requests.
+
+`RateLimitTransport` also retries ``429`` (any method, the request was not
+processed) and ``503`` (reads only, as a write may have been carried out) up
+to `MAX_RETRIES` times, waiting for ``Retry-After`` or an exponential backoff. The wait applies to every
+request to the host, not just the retried one.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import logging
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from qodev_gitlab_cli.retry import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+MAX_WAIT = 60.0
+# Fraction of the limit below which requests are paced.
+SLOW_DOWN_BELOW = 0.2
+# Threshold used while the server has not reported `RateLimit-Limit`.
+SLOW_DOWN_MIN = 10
+RETRY_STATUS = (429, 503)
+
+_registry: dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+_last_updated: RateLimiter | None = None
+
+
+class RateLimiter:
+    """Token bucket for one host, refilled from the server's rate-limit headers."""
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.limit: int | None = None
+        self.remaining: float | None = None
+        self.reset_at: float | None = None  # time.monotonic() at which the window resets
+        self.blocked_until = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping first if the budget requires it. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            if self.reset_at is not None and now >= self.reset_at:
+                # A new window has started; the next response reports its budget.
+                self.remaining = self.reset_at = None
+            wait = max(0.0, self.blocked_until - now)
+            if self.remaining is not None and self.reset_at is not None:
+                if self.remaining < 1:
+                    wait = max(wait, self.reset_at - now)
+                elif self.remaining <= self._slow_down_below():
+                    spacing = (self.reset_at - now) / self.remaining
+                    slot = max(now + wait, self._next_slot)
+                    self._next_slot = slot + spacing
+                    wait = slot - now
+                self.remaining -= 1
+            wait = min(wait, MAX_WAIT)
+        if wait > 0:
+            logger.debug(f"Rate limit for {self.host}: waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def update(self, response: httpx.Response) -> None:
+        """Refresh the budget from a response's headers."""
+        global _last_updated
+        headers = response.headers
+        remaining = _number(headers.get("ratelimit-remaining"))
+        reset = _number(headers.get("ratelimit-reset"))
+        limit = _number(headers.get("ratelimit-limit"))
+        retry_after = _retry_after(headers.get("retry-after"))
+        with self._lock:
+            now = time.monotonic()
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self.remaining = remaining
+            if reset is not None:
+                self.reset_at = now + max(0.0, reset - time.time())
+            if response.status_code == 429:
+                self.remaining = 0
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, now + retry_after)
+        if remaining is not None or response.status_code == 429:
+            _last_updated = self
+
+    def block(self, seconds: float) -> None:
+        """Hold back every request to the host for `seconds`."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def budget(self) -> dict[str, Any]:
+        """The current budget, as reported in `--json` error payloads."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "host": self.host,
+                "limit": self.limit,
+                "remaining": None if self.remaining is None else max(0, int(self.remaining)),
+                "reset_in": None if self.reset_at is None else round(max(0.0, self.reset_at - now), 1),
+                "retry_after": round(self.blocked_until - now, 1) if self.blocked_until > now else None,
+            }
+
+    def _slow_down_below(self) -> float:
+        return self.limit * SLOW_DOWN_BELOW if self.limit else SLOW_DOWN_MIN
+
+
+def limiter_for(host: str) -> RateLimiter:
+    with _registry_lock:
+        if host not in _registry:
+            _registry[host] = RateLimiter(host)
+        return _registry[host]
+
+
+def current_budget() -> dict[str, Any] | None:
+    """Budget of the host that most recently reported one, if any did."""
+    return _last_updated.budget() if _last_updated is not None else None
+
+
+class RateLimitTransport(httpx.BaseTransport):
+    """httpx transport that paces requests through the host's `RateLimiter` and retries 429/503."""
+
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = limiter_for(request.url.netloc.decode("ascii"))
+        attempt = 0
+        waited = 0.0
+        while True:
+            waited += limiter.acquire()
+            response = self.inner.handle_request(request)
+            limiter.update(response)
+            if attempt >= MAX_RETRIES or not self._retryable(request, response):
+                # Reported by `--trace`.
+                response.extensions["qodev_retries"] = attempt
+                response.extensions["qodev_wait"] = waited
+                return response
+            delay = _retry_after(response.headers.get("retry-after"))
+            if delay is None:
+                delay = BACKOFF_BASE * 2**attempt
+            response.close()
+            logger.info(f"{response.status_code} from {request.url.path}; retrying in {delay:.1f}s")
+            # The whole host backs off, not just this thread.
+            limiter.block(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retryable(request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        return response.status_code in RETRY_STATUS and request.method in SAFE_METHODS
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def _number(value: str | None) -> float | None:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    seconds = _number(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
@@ -0,0 +1,194 @@
+"""Retries of transient failures, and hedged GETs.
+
+A connection reset, a timeout or a ``500``/``502``/``504`` from a load
+balancer usually succeeds on the next try. `RetryTransport` retries them up
+to ``--retries`` times (3 by default), with exponential backoff capped at
+`MAX_BACKOFF` and jittered so parallel requests do not retry in lockstep.
+``429`` (any method) and ``503`` (reads) are retried further down by
+`qodev_gitlab_cli.ratelimit.RateLimitTransport`, which honours
+``Retry-After``.
+
+Only reads (`SAFE_METHODS`) are retried after the request may have reached
+GitLab. A write (``mrs merge``, ``issues create``, ``variables set``) is only
+retried when the connection could not be established, i.e. nothing was sent.
+
+With ``--hedge``, a GET still unanswered after the host's p95 latency (of the
+recent `LATENCY_WINDOW` requests) gets a second, identical request and the
+first response wins. That cuts the tail when single requests stall, for about
+5% more requests.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, as_completed
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.context import Context
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 0.25
+MAX_BACKOFF = 8.0
+RETRY_STATUS = frozenset({500, 502, 504})
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Failures that guarantee the request was never sent, so any method may retry.
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+HEDGE_PERCENTILE = 0.95
+LATENCY_WINDOW = 200
+# Hedge only once this many latencies are known, and never sooner than HEDGE_MIN_DELAY.
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.05
+
+_registry: dict[str, LatencyWindow] = {}
+_registry_lock = threading.Lock()
+
+
+class LatencyWindow:
+    """Response times (until the headers arrived) of one host's recent successful requests."""
+
+    def __init__(self) -> None:
+        self.samples: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """The `fraction` quantile, or None while there are fewer than `HEDGE_MIN_SAMPLES` samples."""
+        with self._lock:
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def latencies_for(host: str) -> LatencyWindow:
+    with _registry_lock:
+        if host not in _registry:
+            _registry[host] = LatencyWindow()
+        return _registry[host]
+
+
+def backoff(attempt: int) -> float:
+    """Seconds before retry number `attempt` (from 0): exponential, capped, with jitter."""
+    ceiling = min(MAX_BACKOFF, BACKOFF_BASE * 2**attempt)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """httpx transport that retries transient failures and optionally hedges slow GETs."""
+
+    def __init__(self, inner: httpx.BaseTransport, ctx: Context) -> None:
+        self.inner = inner
+        self.ctx = ctx
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        retries = self.ctx.retries
+        safe = request.method in SAFE_METHODS
+        latencies = latencies_for(request.url.netloc.decode("ascii"))
+        attempt = inner_retries = 0
+        waited = 0.0
+        hedged = False
+        while True:
+            start = time.monotonic()
+            try:
+                if safe and self.ctx.hedge:
+                    response, hedge = self._hedged(request, latencies)
+                    hedged = hedged or hedge
+                else:
+                    response = self.inner.handle_request(request)
+            except httpx.TransportError as exc:
+                if attempt >= retries or not self._retryable_error(request, exc):
+                    raise
+                reason = type(exc).__name__
+            else:
+                # Retries and waits of the rate limiter below count as well.
+                inner_retries += response.extensions.get("qodev_retries", 0)
+                waited += response.extensions.get("qodev_wait", 0.0)
+                if response.status_code < 500:
+                    latencies.add(time.monotonic() - start)
+                if attempt >= retries or not (safe and response.status_code in RETRY_STATUS):
+                    # Reported by `--trace`.
+                    response.extensions["qodev_retries"] = attempt + inner_retries
+                    response.extensions["qodev_wait"] = waited
+                    if hedged:
+                        response.extensions["qodev_hedged"] = True
+                    return response
+                reason = str(response.status_code)
+                response.close()
+            delay = backoff(attempt)
+            logger.info(
+                f"{reason} from {request.method} {request.url.path}; retry {attempt + 1}/{retries} in {delay:.2f}s"
+            )
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def _hedged(self, request: httpx.Request, latencies: LatencyWindow) -> tuple[httpx.Response, bool]:
+        """Send `request`, and once more if it is slower than the p95; the first response wins."""
+        threshold = latencies.percentile(HEDGE_PERCENTILE)
+        if threshold is None:
+            return self.inner.handle_request(request), False
+        first = _start(self.inner.handle_request, request)
+        try:
+            return first.result(timeout=max(threshold, HEDGE_MIN_DELAY)), False
+        except TimeoutError:
+            pass
+        logger.debug(f"Hedging {request.method} {request.url.path} after {threshold:.3f}s")
+        attempts = [first, _start(self.inner.handle_request, request)]
+        error: BaseException | None = None
+        for future in as_completed(attempts):
+            try:
+                response = future.result()
+            except httpx.TransportError as exc:
+                error = exc
+                continue
+            for other in attempts:
+                if other is not future:
+                    # The loser's connection goes back to the pool once it is answered.
+                    other.add_done_callback(_close_response)
+            return response, True
+        assert error is not None
+        raise error
+
+    @staticmethod
+    def _retryable_error(request: httpx.Request, exc: httpx.TransportError) -> bool:
+        if isinstance(exc, UNSENT_ERRORS):
+            return True
+        return request.method in SAFE_METHODS and isinstance(exc, TRANSIENT_ERRORS)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def _start(send: Callable[[httpx.Request], httpx.Response], request: httpx.Request) -> Future[httpx.Response]:
+    """Run `send(request)` in a new daemon thread (a pool could be filled up by stalled requests)."""
+    future: Future[httpx.Response] = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(send(request))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name="qodev-gitlab-hedge", daemon=True).start()
+    return future
+
+
+def _close_response(future: Future[httpx.Response]) -> None:
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,126 @@
+"""Ranked full-text search over the mirrored issues and merge requests.
+
+The index is the FTS5 table `search_index` of the mirror database (see
+`qodev_gitlab_cli.mirror`). `sync` keeps it current, rewriting the documents
+of the records it fetched, so a search costs one SQLite query. Results are
+ranked with BM25, where a match in the title counts more than one in the
+description, and that counts more than one in a note.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.mirror import Mirror
+
+# BM25 weights of the title, description and notes columns.
+WEIGHTS = (10.0, 3.0, 1.0)
+SNIPPET_TOKENS = 16
+# `search --type` value -> mirrored resource.
+TYPES = {"issue": "issues", "mr": "merge_requests"}
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class SearchError(ValueError):
+    pass
+
+
+def match_expression(text: str) -> str:
+    """Turn user input into an FTS5 query: words (``prefix*``) and ``"quoted phrases"``, all required.
+
+    ``OR`` between terms is kept. Everything else is quoted, so punctuation can
+    never be read as FTS5 syntax.
+    """
+    terms: list[str] = []
+    for match in _TERM.finditer(text):
+        phrase, word = match.groups()
+        if word == "OR" and terms and terms[-1] != "OR":
+            terms.append("OR")
+            continue
+        value = phrase if phrase is not None else word
+        prefix = phrase is None and value.endswith("*")
+        value = value.rstrip("*") if prefix else value
+        if not value.strip():
+            continue
+        terms.append('"' + value.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if terms and terms[-1] == "OR":
+        terms.pop()
+    if not terms:
+        raise SearchError("Search query is empty.")
+    return " ".join(terms)
+
+
+def search(
+    mirror: Mirror,
+    text: str,
+    project_ids: Sequence[int],
+    *,
+    kinds: Sequence[str] = tuple(TYPES.values()),
+    state: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[dict[str, Any]], int]:
+    """The best `limit` matches after `offset` (``-1`` for all), and the number of matches in total."""
+    match = match_expression(text)
+    # CROSS JOIN keeps the FTS index as the outer loop; SQLite would otherwise
+    # scan `documents` and probe the index once per row.
+    source = (
+        "FROM search_index CROSS JOIN documents d ON d.rowid = search_index.rowid "
+        f"WHERE search_index MATCH ? AND d.project_id IN ({_marks(project_ids)}) AND d.kind IN ({_marks(kinds)})"
+    )
+    args: list[Any] = [match, *project_ids, *kinds]
+    if state and state != "all":
+        source += (
+            " AND EXISTS (SELECT 1 FROM items i WHERE i.project_id = d.project_id AND i.kind = d.kind "
+            "AND i.key = CAST(d.iid AS TEXT) AND i.state = ?)"
+        )
+        args.append(state)
+    db = mirror.db
+    total = db.execute(f"SELECT count(*) {source}", args).fetchone()[0]
+    ranked = db.execute(
+        f"SELECT search_index.rowid, d.project_id, d.kind, d.iid, bm25(search_index, {', '.join(map(str, WEIGHTS))}) "
+        f"AS rank {source} ORDER BY rank LIMIT ? OFFSET ?",
+        [*args, limit, offset],
+    ).fetchall()
+    if not ranked:
+        return [], total
+
+    # Snippets and item details only for the page being returned.
+    rowids = [row[0] for row in ranked]
+    snippets = dict(
+        db.execute(
+            f"SELECT rowid, snippet(search_index, -1, '**', '**', '…', {SNIPPET_TOKENS}) FROM search_index "
+            f"WHERE search_index MATCH ? AND rowid IN ({_marks(rowids)})",
+            [match, *rowids],
+        ).fetchall()
+    )
+    kind_types = {kind: name for name, kind in TYPES.items()}
+    results = []
+    for rowid, project_id, kind, iid, rank in ranked:
+        title, item_state, reference, web_url = db.execute(
+            "SELECT json_extract(data, '$.title'), state, json_extract(data, '$.references.full'), "
+            "json_extract(data, '$.web_url') FROM items WHERE project_id = ? AND kind = ? AND key = ?",
+            (project_id, kind, str(iid)),
+        ).fetchone() or (None, None, None, None)
+        results.append(
+            {
+                "type": kind_types[kind],
+                "iid": iid,
+                "title": title,
+                "state": item_state,
+                "reference": reference,
+                # BM25 is lower for better matches; report it so that higher is better.
+                "score": round(-rank, 3),
+                "snippet": " ".join(snippets.get(rowid, "").split()),
+                "web_url": web_url,
+            }
+        )
+    return results, total
+
+
+def _marks(values: Sequence[Any]) -> str:
+    return ", ".join("?" * len(values))
@@ -0,0 +1,168 @@
+"""Combined status report for a branch (`qodev-gitlab status`).
+
+The merge request lookup (a server-side ``source_branch`` filter) and the
+branch's latest pipeline start together. Once the MR arrives, its approvals,
+discussions and latest MR pipeline are fetched concurrently, followed by the
+jobs of whichever pipeline is newer; without an MR, the branch pipeline's jobs
+are fetched as soon as it arrives. The report costs two or three round trips.
+A sub-request that fails is reported under ``errors`` instead of failing the
+whole report.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any
+
+from qodev_gitlab_cli.api import get_page, iter_pages, project_endpoint
+from qodev_gitlab_cli.context import executor
+from qodev_gitlab_cli.errors import error_message
+
+UNRESOLVED_DETAILS = 10
+BODY_EXCERPT = 200
+
+
+def find_branch_mr(client: Any, project: str, branch: str) -> dict[str, Any] | None:
+    """The open MR for `branch`, else its most recently updated one."""
+    params = {"source_branch": branch, "state": "all", "order_by": "updated_at", "sort": "desc"}
+    items = get_page(client, project_endpoint(project, "merge_requests"), params, per_page=5).items
+    return next((mr for mr in items if mr.get("state") == "opened"), items[0] if items else None)
+
+
+def _latest(client: Any, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any] | None:
+    items = get_page(client, endpoint, params, per_page=1).items
+    return items[0] if items else None
+
+
+def _jobs(client: Any, project: str, pipeline: dict[str, Any] | None) -> list[dict[str, Any]] | None:
+    if pipeline is None:
+        return None
+    endpoint = project_endpoint(project, "pipelines", pipeline["id"], "jobs")
+    return [job for page in iter_pages(client, endpoint) for job in page.items]
+
+
+def _branch_jobs(client: Any, project: str, pipeline_future: Future[Any]) -> list[dict[str, Any]] | None:
+    try:
+        pipeline = pipeline_future.result()
+    except Exception:
+        # Reported under "pipeline"; there are no jobs to fetch.
+        return None
+    return _jobs(client, project, pipeline)
+
+
+def _discussions(client: Any, project: str, iid: int) -> list[dict[str, Any]]:
+    endpoint = project_endpoint(project, "merge_requests", iid, "discussions")
+    return [d for page in iter_pages(client, endpoint) for d in page.items]
+
+
+def branch_status(client: Any, project: str, branch: str) -> dict[str, Any]:
+    """Collect MR, pipeline, jobs, approvals and unresolved discussions for `branch`."""
+    errors: dict[str, str] = {}
+
+    def result(future: Future[Any] | None, section: str) -> Any:
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as exc:
+            errors[section] = error_message(exc)
+            return None
+
+    with executor(6, thread_name_prefix="qodev-gitlab-status") as pool:
+        mr_future = pool.submit(find_branch_mr, client, project, branch)
+        pipeline_future = pool.submit(_latest, client, project_endpoint(project, "pipelines"), {"ref": branch})
+
+        mr = result(mr_future, "mr")
+        jobs_future = approvals_future = discussions_future = mr_pipeline_future = None
+        if mr is None:
+            # The branch pipeline is the one reported, so its jobs need not wait.
+            jobs_future = pool.submit(_branch_jobs, client, project, pipeline_future)
+        else:
+            iid = mr["iid"]
+            approvals_future = pool.submit(client.get_mr_approvals, project, iid)
+            discussions_future = pool.submit(_discussions, client, project, iid)
+            mr_pipeline_future = pool.submit(
+                _latest, client, project_endpoint(project, "merge_requests", iid, "pipelines")
+            )
+
+        branch_pipeline = result(pipeline_future, "pipeline")
+        mr_pipeline = result(mr_pipeline_future, "pipeline")
+        # Merge request pipelines run on refs/merge-requests/<iid>/head, not the branch.
+        pipeline = max((p for p in (branch_pipeline, mr_pipeline) if p), key=lambda p: p["id"], default=None)
+        if jobs_future is None and pipeline is not None:
+            jobs_future = pool.submit(_jobs, client, project, pipeline)
+        jobs = result(jobs_future, "jobs")
+        approvals = result(approvals_future, "approvals")
+        discussions = result(discussions_future, "discussions")
+
+    report: dict[str, Any] = {
+        "project": project,
+        "branch": branch,
+        "merge_request": _mr_summary(mr),
+        "pipeline": _pick(pipeline, "id", "status", "ref", "sha", "web_url", "created_at", "updated_at"),
+        "jobs": _job_summary(jobs) if jobs is not None else None,
+        "approvals": _approval_summary(approvals) if approvals is not None else None,
+        "unresolved_discussions": _unresolved(discussions) if discussions is not None else None,
+    }
+    if errors:
+        report["errors"] = errors
+    return report
+
+
+def _pick(data: dict[str, Any] | None, *keys: str) -> dict[str, Any] | None:
+    return {key: data.get(key) for key in keys} if data else None
+
+
+def _mr_summary(mr: dict[str, Any] | None) -> dict[str, Any] | None:
+    summary = _pick(
+        mr,
+        "iid",
+        "title",
+        "state",
+        "draft",
+        "target_branch",
+        "has_conflicts",
+        "detailed_merge_status",
+        "web_url",
+    )
+    if summary is not None and mr is not None:
+        summary["author"] = (mr.get("author") or {}).get("username")
+    return summary
+
+
+def _job_summary(jobs: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "total": len(jobs),
+        "by_status": dict(Counter(job.get("status", "unknown") for job in jobs)),
+        "failed": [
+            _pick(job, "id", "name", "stage", "allow_failure", "web_url")
+            for job in jobs
+            if job.get("status") == "failed"
+        ],
+    }
+
+
+def _approval_summary(approvals: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "approved": approvals.get("approved"),
+        "approvals_left": approvals.get("approvals_left"),
+        "approved_by": [(a.get("user") or {}).get("username") for a in approvals.get("approved_by", [])],
+    }
+
+
+def _unresolved(discussions: list[dict[str, Any]]) -> dict[str, Any]:
+    open_threads = []
+    for discussion in discussions:
+        notes = discussion.get("notes") or []
+        resolvable = [n for n in notes if n.get("resolvable")]
+        if resolvable and not all(n.get("resolved") for n in resolvable):
+            first = notes[0]
+            open_threads.append(
+                {
+                    "id": discussion.get("id"),
+                    "author": (first.get("author") or {}).get("username"),
+                    "body": (first.get("body") or "")[:BODY_EXCERPT],
+                }
+            )
+    return {"count": len(open_threads), "items": open_threads[:UNRESOLVED_DETAILS]}
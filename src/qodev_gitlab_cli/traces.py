@@ -0,0 +1,63 @@
+"""Incremental job trace access: tail and follow via HTTP Range requests."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from qodev_gitlab_cli.api import get_range
+
+TERMINAL_JOB_STATUSES = frozenset({"success", "failed", "canceled", "skipped", "manual"})
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def last_lines(data: bytes, lines: int) -> bytes:
+    """Return the last `lines` lines of data (a trailing newline does not start a line)."""
+    if lines <= 0:
+        return b""
+    body = data[:-1] if data.endswith(b"\n") else data
+    parts = body.rsplit(b"\n", lines)
+    if len(parts) <= lines:
+        return data
+    return data[len(parts[0]) + 1 :]
+
+
+def tail(client: Any, endpoint: str, lines: int, *, chunk_size: int = TAIL_CHUNK_SIZE) -> tuple[bytes, int]:
+    """Fetch the last `lines` lines of a trace, growing the range until enough arrive.
+
+    Returns the lines and the byte offset of the end of the trace.
+    """
+    size = chunk_size
+    while True:
+        part = get_range(client, endpoint, suffix=size)
+        body = part.data[:-1] if part.data.endswith(b"\n") else part.data
+        if part.start == 0 or body.count(b"\n") >= lines:
+            return last_lines(part.data, lines), part.end
+        size *= 4
+
+
+def follow(
+    client: Any,
+    endpoint: str,
+    *,
+    offset: int,
+    is_finished: Callable[[], bool],
+    write: Callable[[bytes], None],
+    interval: float = 2.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Stream bytes appended to a trace from `offset` until the job finishes.
+
+    The job state is checked *before* each fetch, so the fetch after the job
+    is seen finished still picks up the final bytes. Returns the final offset.
+    """
+    while True:
+        finished = is_finished()
+        part = get_range(client, endpoint, start=offset)
+        if part.data:
+            write(part.data)
+            offset = part.end
+        if finished:
+            return offset
+        sleep(interval)
@@ -0,0 +1,189 @@
+"""`--trace`: where the time of one invocation goes.
+
+A `Tracer` on the context collects spans: phases such as git remote
+detection, client setup, JSON decoding and rendering (via `span`), and one
+span per HTTP request (see `qodev_gitlab_cli.transport.TracingTransport`). Each request span holds
+the method, path template, status, wire bytes, the server's own time
+(``X-Runtime``), retries and how the response cache answered. The
+connection-level steps httpcore reports (DNS + TCP connect, TLS handshake,
+waiting for the response headers) become child spans.
+
+When the command finishes, a summary goes to stderr (a table, or one JSON
+line when the output is JSON), and `--trace-file` writes every span in Chrome
+trace-event format for chrome://tracing or https://ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.context import Context
+
+# httpcore trace events -> span names.
+_NET_EVENTS = {
+    "connect_tcp": "net.connect",
+    "start_tls": "net.tls",
+    "receive_response_headers": "net.wait",
+}
+# Path segments followed by an identifier, e.g. `projects/<id>`, `releases/<tag>`.
+_KEYED = {"projects", "groups", "users", "releases", "variables", "tags", "branches", "namespaces"}
+_NUMERIC = re.compile(r"^\d+$")
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start: float  # time.perf_counter()
+    duration: float
+    thread: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Thread-safe collector of the spans of one invocation."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, category: str, start: float, duration: float, args: dict[str, Any]) -> None:
+        record = Span(name, category, start, duration, threading.get_ident(), args)
+        with self._lock:
+            self.spans.append(record)
+
+    def summary(self) -> dict[str, Any]:
+        """Per-phase totals and the list of HTTP requests, in milliseconds."""
+        phases: dict[str, dict[str, Any]] = {}
+        requests = []
+        for record in sorted(self.spans, key=lambda s: s.start):
+            phase = phases.setdefault(record.name, {"phase": record.name, "calls": 0, "ms": 0.0})
+            phase["calls"] += 1
+            phase["ms"] += record.duration * 1000
+            if record.category == "http":
+                requests.append({**record.args, "ms": round(record.duration * 1000, 1)})
+        for phase in phases.values():
+            phase["ms"] = round(phase["ms"], 1)
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "retries": sum(request.get("retries", 0) for request in requests),
+            "phases": list(phases.values()),
+            "requests": requests,
+        }
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """All spans as Chrome trace events (complete events, microseconds)."""
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": record.name,
+                    "cat": record.category,
+                    "ph": "X",
+                    "ts": round((record.start - self.started) * 1e6, 1),
+                    "dur": round(record.duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": record.thread,
+                    "args": record.args,
+                }
+                for record in self.spans
+            ],
+        }
+
+
+@contextmanager
+def span(name: str, category: str = "cli", **args: Any) -> Iterator[dict[str, Any]]:
+    """Time the block as a span of the current context's tracer (a no-op without `--trace`).
+
+    Yields the span's args, so the block can add what it learns (sizes, counts).
+    """
+    from qodev_gitlab_cli.context import current
+
+    tracer = current().tracer
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    finally:
+        tracer.add(name, category, start, time.perf_counter() - start, args)
+
+
+def path_template(path: str) -> str:
+    """``/api/v4/projects/g%2Fp/merge_requests/12`` -> ``/projects/:id/merge_requests/:id``."""
+    segments = path.split("/api/v4", 1)[-1].strip("/").split("/")
+    templated = []
+    for i, segment in enumerate(segments):
+        keyed = i > 0 and segments[i - 1] in _KEYED
+        templated.append(":id" if keyed or _NUMERIC.match(segment) else segment)
+    return "/" + "/".join(templated)
+
+
+def net_tracer(tracer: Tracer) -> Callable[[str, dict[str, Any]], None]:
+    """httpcore ``trace`` extension callback turning its events into spans."""
+    started: dict[str, float] = {}
+
+    def trace(event: str, info: dict[str, Any]) -> None:
+        step, _, phase = event.rpartition(".")
+        name = _NET_EVENTS.get(step.rpartition(".")[2])
+        if name is None:
+            return
+        if phase == "started":
+            started[name] = time.perf_counter()
+        elif name in started:
+            start = started.pop(name)
+            tracer.add(name, "net", start, time.perf_counter() - start, {} if phase == "complete" else {"failed": True})
+
+    return trace
+
+
+def report(tracer: Tracer, *, ctx: Context, trace_file: str | None = None) -> None:
+    """Print the summary to stderr and write the Chrome trace file, if asked for."""
+    import sys
+
+    if trace_file:
+        try:
+            with open(trace_file, "w", encoding="utf-8") as f:
+                json.dump(tracer.chrome_trace(), f)
+        except OSError as exc:
+            print(f"Could not write trace file {trace_file}: {exc}", file=sys.stderr)
+    summary = tracer.summary()
+    if ctx.json_mode:
+        print(json.dumps({"trace": summary}), file=sys.stderr)
+        return
+    from qodev_gitlab_cli.output import plain_table
+
+    phases = [[p["phase"], str(p["calls"]), f"{p['ms']:.1f}"] for p in summary["phases"]]
+    header = f"trace: {summary['elapsed_ms']:.1f} ms" + (
+        f", {summary['retries']} retries" if summary["retries"] else ""
+    )
+    lines = [header, plain_table(phases, ["Phase", "Calls", "ms"])]
+    if summary["requests"]:
+        rows = [
+            [
+                r["method"],
+                r["path"] + (f"?page={r['page']}" if "page" in r else ""),
+                str(r.get("status", r.get("error", ""))),
+                str(r.get("bytes", "")),
+                f"{r['ms']:.1f}",
+                str(r.get("server_ms", "")),
+                str(r.get("retries", "")) + (" +hedge" if r.get("hedged") else ""),
+                str(r.get("cache", "")),
+            ]
+            for r in summary["requests"]
+        ]
+        headers = ["Method", "Path", "Status", "Bytes", "ms", "Server ms", "Retries", "Cache"]
+        lines += ["", plain_table(rows, headers)]
+    print("\n".join(lines), file=sys.stderr)
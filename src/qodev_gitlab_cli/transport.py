@@ -0,0 +1,125 @@
+"""HTTP transport stack installed under every `GitLabClient` the CLI creates."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from qodev_gitlab_cli.cache import CachingTransport, ResponseCache
+from qodev_gitlab_cli.mirror import OfflineTransport
+from qodev_gitlab_cli.ratelimit import RateLimitTransport
+from qodev_gitlab_cli.retry import RetryTransport
+from qodev_gitlab_cli.tracing import net_tracer, path_template
+
+if TYPE_CHECKING:
+    from qodev_gitlab_cli.context import Context
+
+
+def build_transport(ctx: Context) -> httpx.BaseTransport:
+    """Compose the transport layers, outermost first."""
+    transport: httpx.BaseTransport = httpx.HTTPTransport()
+    # Below the cache, so fresh cache hits do not spend the rate-limit budget.
+    transport = RateLimitTransport(transport)
+    # Above the rate limiter, so every retry waits for (and spends) the host's budget.
+    transport = RetryTransport(transport, ctx)
+    transport = CachingTransport(transport, ResponseCache(), ctx)
+    # Above the cache and the rate limiter, so `--offline` never touches either or the network.
+    transport = OfflineTransport(transport, ctx)
+    # Sees every request as the command made it, however it was answered.
+    transport = TracingTransport(transport, ctx)
+    return transport
+
+
+def install_transport(gl: Any, ctx: Context) -> None:
+    """Swap the client's httpx session for one that routes through `build_transport`."""
+    session = getattr(gl, "client", None)
+    if not isinstance(session, httpx.Client):
+        return
+    gl.client = httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        transport=build_transport(ctx),
+    )
+    session.close()
+
+
+class TracingTransport(httpx.BaseTransport):
+    """Outermost httpx transport: one span per request while the context has a tracer.
+
+    The span lasts until the response body is closed, so it covers the
+    download. Cache and retry details come from the response extensions set by
+    the inner layers (``qodev_cache``, ``qodev_retries``).
+    """
+
+    def __init__(self, inner: httpx.BaseTransport, ctx: Context) -> None:
+        self.inner = inner
+        self.ctx = ctx
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        tracer = self.ctx.tracer
+        if tracer is None:
+            return self.inner.handle_request(request)
+        args: dict[str, Any] = {
+            "method": request.method,
+            "path": path_template(request.url.raw_path.decode().split("?")[0]),
+        }
+        if "page" in request.url.params:
+            args["page"] = int(request.url.params["page"])
+        request.extensions = {**request.extensions, "trace": net_tracer(tracer)}
+        start = time.perf_counter()
+        try:
+            response = self.inner.handle_request(request)
+        except Exception as exc:
+            tracer.add("http", "http", start, time.perf_counter() - start, {**args, "error": type(exc).__name__})
+            raise
+        args["status"] = response.status_code
+        runtime = response.headers.get("x-runtime")
+        if runtime:
+            with contextlib.suppress(ValueError):
+                args["server_ms"] = round(float(runtime) * 1000, 1)
+        args["retries"] = response.extensions.get("qodev_retries", 0)
+        wait = response.extensions.get("qodev_wait", 0.0)
+        if wait:
+            args["wait_ms"] = round(wait * 1000, 1)
+        if response.extensions.get("qodev_hedged"):
+            args["hedged"] = True
+        args["cache"] = response.extensions.get("qodev_cache", "-")
+
+        def finish(size: int) -> None:
+            args["bytes"] = size
+            tracer.add("http", "http", start, time.perf_counter() - start, args)
+
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_CountingStream(response.stream, finish),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _CountingStream(httpx.SyncByteStream):
+    def __init__(self, inner: Any, on_close: Callable[[int], None]) -> None:
+        self.inner = inner
+        self.on_close: Callable[[int], None] | None = on_close
+        self.size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.inner:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        if hasattr(self.inner, "close"):
+            self.inner.close()
+        if self.on_close is not None:
+            self.on_close(self.size)
+            self.on_close = None
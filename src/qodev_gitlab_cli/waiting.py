@@ -0,0 +1,244 @@
+"""Adaptive polling for `pipelines wait`.
+
+Polls start short, back off exponentially (with jitter) while nothing changes
+and snap back to the short interval whenever the pipeline changes. Each poll
+fetches the pipeline; its jobs are fetched on every poll with ``--fail-fast``,
+which needs them to spot a failing job, and otherwise whenever the pipeline
+changed or every few polls, to schedule the next poll for when running jobs
+should finish, going by their typical durations (the median of recent
+successful runs of the same job name). Every poll is a conditional request through the response
+cache, so an unchanged pipeline costs a 304 without a body.
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from qodev_gitlab_cli.api import get_page, iter_pages, project_endpoint, raise_for_status
+from qodev_gitlab_cli.context import executor
+
+TERMINAL_PIPELINE_STATUSES = frozenset({"success", "failed", "canceled", "skipped"})
+# Always revalidate with GitLab, even when `--cache-ttl` would serve from disk.
+REVALIDATE = {"Cache-Control": "no-cache"}
+FAILED_JOB_DETAILS = 5
+FAILED_JOB_LOG_LINES = 10
+# Without `--fail-fast`, polls after which the jobs are refetched even if the pipeline did not change.
+JOBS_REFRESH_POLLS = 3
+
+
+@dataclass
+class PollSchedule:
+    """Next-poll delays: exponential backoff with jitter, reset on change."""
+
+    min_interval: float = 2.0
+    max_interval: float = 30.0
+    factor: float = 1.6
+    current: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.current = self.min_interval
+
+    def next_delay(self, *, changed: bool, expected_remaining: float | None = None) -> float:
+        """Return seconds until the next poll.
+
+        Args:
+            changed: Whether anything changed since the previous poll.
+            expected_remaining: Seconds until the soonest running job is
+                expected to finish, if known.
+        """
+        if changed:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, self.current * self.factor)
+        delay = random.uniform(self.current / 2, self.current)
+        if expected_remaining is not None and 0 <= expected_remaining < delay:
+            delay = expected_remaining
+        return max(self.min_interval, delay)
+
+
+def expected_durations(client: Any, project: str) -> dict[str, float]:
+    """Median duration of recent successful runs per job name."""
+    try:
+        page = get_page(
+            client, project_endpoint(project, "jobs"), {"scope[]": "success"}, per_page=100, headers=REVALIDATE
+        )
+    except Exception:
+        return {}
+    durations: dict[str, list[float]] = {}
+    for job in page.items:
+        if job.get("duration"):
+            durations.setdefault(job.get("name", ""), []).append(float(job["duration"]))
+    return {name: statistics.median(values) for name, values in durations.items()}
+
+
+def _soonest_expected_finish(jobs: list[dict[str, Any]], history: dict[str, float], elapsed: float = 0) -> float | None:
+    """Seconds until the soonest running job should finish, `elapsed` seconds after `jobs` were fetched."""
+    remaining = [
+        history[job["name"]] - float(job.get("duration") or 0) - elapsed
+        for job in jobs
+        if job.get("status") == "running" and job.get("name") in history
+    ]
+    remaining = [r for r in remaining if r >= 0]
+    return min(remaining) if remaining else None
+
+
+def _blocking_failures(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [j for j in jobs if j.get("status") == "failed" and not j.get("allow_failure")]
+
+
+def wait_for_pipeline(
+    client: Any,
+    project: str,
+    pipeline_id: int,
+    *,
+    timeout: float = 3600,
+    interval: float | None = None,
+    fail_fast: bool = False,
+    stop: threading.Event | None = None,
+    history: dict[str, float] | None = None,
+    min_interval: float = 2.0,
+    max_interval: float = 30.0,
+) -> dict[str, Any]:
+    """Poll one pipeline until it finishes, times out, or `stop` is set.
+
+    Args:
+        interval: Fixed poll interval; adaptive polling when None.
+        fail_fast: Return (and set `stop`) as soon as a job that is not allowed
+            to fail fails. The jobs are then fetched on every poll.
+        stop: Shared event used to abandon the wait early.
+        history: Expected job durations from `expected_durations`. With adaptive
+            polling, the jobs are then also fetched when the pipeline changed and
+            every `JOBS_REFRESH_POLLS` polls.
+    """
+    stop = stop or threading.Event()
+    schedule = PollSchedule(min_interval=min_interval, max_interval=max(max_interval, min_interval))
+    pipeline_endpoint = project_endpoint(project, "pipelines", pipeline_id)
+    jobs_endpoint = project_endpoint(project, "pipelines", pipeline_id, "jobs")
+
+    def fetch_jobs() -> list[dict[str, Any]]:
+        return [job for page in iter_pages(client, jobs_endpoint, headers=REVALIDATE) for job in page.items]
+
+    start = time.monotonic()
+    checks = 0
+    previous: tuple[Any, ...] | None = None
+    jobs: list[dict[str, Any]] | None = None
+    # Poll (and time) at which `jobs` were fetched.
+    jobs_checked, jobs_at = 0, start
+    stopped: str | None = None
+
+    while True:
+        checks += 1
+        response = client.client.get(pipeline_endpoint, headers=REVALIDATE)
+        raise_for_status(response)
+        pipeline = response.json()
+        status = pipeline.get("status")
+        if status in TERMINAL_PIPELINE_STATUSES:
+            final_status = status
+            break
+        pipeline_changed = previous is None or previous[:2] != (status, pipeline.get("updated_at"))
+        if fail_fast or (
+            history and interval is None and (pipeline_changed or checks - jobs_checked >= JOBS_REFRESH_POLLS)
+        ):
+            jobs, jobs_checked, jobs_at = fetch_jobs(), checks, time.monotonic()
+        if fail_fast and jobs and _blocking_failures(jobs):
+            final_status, stopped = status, "fail_fast"
+            stop.set()
+            break
+        if time.monotonic() - start > timeout:
+            final_status = "timeout"
+            break
+
+        snapshot = (status, pipeline.get("updated_at"), tuple((job.get("id"), job.get("status")) for job in jobs or ()))
+        if interval is not None:
+            delay = interval
+        else:
+            expected = _soonest_expected_finish(jobs or [], history or {}, time.monotonic() - jobs_at)
+            delay = schedule.next_delay(changed=snapshot != previous, expected_remaining=expected)
+        previous = snapshot
+        if stop.wait(delay):
+            final_status, stopped = status, "fail_fast"
+            break
+
+    result: dict[str, Any] = {
+        "final_status": final_status,
+        "pipeline_id": pipeline_id,
+        "pipeline_url": pipeline.get("web_url"),
+        "total_duration": round(time.monotonic() - start, 2),
+        "checks_performed": checks,
+    }
+    if stopped:
+        result["stopped"] = stopped
+    if final_status != "timeout":
+        if jobs is None or jobs_checked != checks:
+            jobs = fetch_jobs()
+        result["job_summary"] = {
+            "total": len(jobs),
+            "success": len([j for j in jobs if j.get("status") == "success"]),
+            "failed": len([j for j in jobs if j.get("status") == "failed"]),
+        }
+        # Allowed failures are listed as well; only `fail_fast` ignores them.
+        failed = [j for j in jobs if j.get("status") == "failed"] if final_status == "failed" or stopped else []
+        if failed:
+            result["failed_jobs"] = [_failed_job_detail(client, project, job) for job in failed[:FAILED_JOB_DETAILS]]
+    return result
+
+
+def _failed_job_detail(client: Any, project: str, job: dict[str, Any]) -> dict[str, Any]:
+    from qodev_gitlab_cli import traces
+
+    detail = {key: job.get(key) for key in ("id", "name", "status", "web_url")}
+    try:
+        log, _ = traces.tail(client, project_endpoint(project, "jobs", job["id"], "trace"), FAILED_JOB_LOG_LINES)
+        detail["last_log_lines"] = log.decode("utf-8", errors="replace").rstrip("\n")
+    except Exception:
+        detail["last_log_lines"] = "(log unavailable)"
+    return detail
+
+
+def wait_for_pipelines(
+    client: Any,
+    project: str,
+    pipeline_ids: list[int],
+    *,
+    timeout: float = 3600,
+    interval: float | None = None,
+    fail_fast: bool = False,
+    max_interval: float = 30.0,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Wait on several pipelines concurrently; results are in input order.
+
+    With `fail_fast`, the first failing job stops every other wait as well.
+    """
+    stop = threading.Event()
+    lock = threading.Lock()
+    # Expected durations only shape adaptive polling.
+    history = expected_durations(client, project) if interval is None else {}
+
+    def one(pipeline_id: int) -> dict[str, Any]:
+        result = wait_for_pipeline(
+            client,
+            project,
+            pipeline_id,
+            timeout=timeout,
+            interval=interval,
+            fail_fast=fail_fast,
+            stop=stop,
+            history=history,
+            max_interval=max_interval,
+        )
+        if fail_fast and result["final_status"] in ("failed", "canceled"):
+            stop.set()
+        if on_result is not None:
+            with lock:
+                on_result(result)
+        return result
+
+    with executor(len(pipeline_ids) or 1, thread_name_prefix="qodev-gitlab-wait") as pool:
+        return list(pool.map(one, pipeline_ids))
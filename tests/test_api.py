@@ -0,0 +1,151 @@
+"""Tests for page-level API access."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from qodev_gitlab_api import APIError, AuthenticationError, NotFoundError
+
+from qodev_gitlab_cli.api import get_page, iter_pages, paginate, project_endpoint
+from qodev_gitlab_cli.context import Context
+
+
+def _response(items: list, **headers: str) -> httpx.Response:
+    return httpx.Response(200, json=items, headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+class TestProjectEndpoint:
+    def test_encodes_project_path(self) -> None:
+        assert (
+            project_endpoint("group/sub/proj", "merge_requests", 5) == "/projects/group%2Fsub%2Fproj/merge_requests/5"
+        )
+
+    def test_numeric_id(self) -> None:
+        assert project_endpoint("123") == "/projects/123"
+
+
+class TestGetPage:
+    def test_reads_pagination_headers(self) -> None:
+        client = MagicMock()
+        client.client.get.return_value = _response([{"id": 1}], X_Total="7", X_Total_Pages="4", X_Next_Page="3")
+
+        page = get_page(client, "/projects", {"owned": True}, page=2, per_page=2)
+
+        assert page.items == [{"id": 1}]
+        assert (page.page, page.per_page, page.total, page.total_pages, page.next_page) == (2, 2, 7, 4, 3)
+        client.client.get.assert_called_once_with("/projects", params={"owned": True, "page": 2, "per_page": 2})
+
+    def test_missing_headers(self) -> None:
+        client = MagicMock()
+        client.client.get.return_value = _response([], X_Next_Page="")
+
+        page = get_page(client, "/projects")
+
+        assert page.total is None
+        assert page.next_page is None
+
+    def test_per_page_clamped(self) -> None:
+        client = MagicMock()
+        client.client.get.return_value = _response([])
+
+        assert get_page(client, "/projects", per_page=500).per_page == 100
+
+    def test_fields_projected_on_decode(self) -> None:
+        client = MagicMock()
+        client.client.get.return_value = _response([{"iid": 1, "title": "T", "description": "long"}])
+
+        page = get_page(client, "/projects/1/merge_requests", fields=["iid", "title"])
+
+        assert page.items == [{"iid": 1, "title": "T"}]
+
+    @pytest.mark.parametrize(
+        ("status", "exc"),
+        [(401, AuthenticationError), (404, NotFoundError), (500, APIError)],
+    )
+    def test_errors_map_to_library_exceptions(self, status: int, exc: type[Exception]) -> None:
+        client = MagicMock()
+        client.client.get.return_value = httpx.Response(status, text="boom")
+
+        with pytest.raises(exc):
+            get_page(client, "/projects")
+
+
+class TestPaginate:
+    def test_follows_next_page(self) -> None:
+        client = MagicMock()
+        client.client.get.side_effect = [
+            _response([1, 2], X_Next_Page="2"),
+            _response([3], X_Next_Page=""),
+        ]
+
+        pages = list(iter_pages(client, "/projects"))
+
+        assert [p.items for p in pages] == [[1, 2], [3]]
+        assert client.client.get.call_args_list[1].kwargs["params"] == {"page": 2, "per_page": 100}
+
+    def test_parallel_pages_in_order(self) -> None:
+        client = MagicMock()
+
+        def fake_get(endpoint: str, params: dict) -> httpx.Response:
+            page = params["page"]
+            return _response([page], X_Total_Pages="6", X_Next_Page=str(page + 1) if page < 6 else "")
+
+        client.client.get.side_effect = fake_get
+
+        pages = list(iter_pages(client, "/projects", concurrency=3))
+
+        assert [p.items for p in pages] == [[1], [2], [3], [4], [5], [6]]
+        assert client.client.get.call_count == 6
+
+    def test_without_totals_falls_back_to_sequential(self) -> None:
+        client = MagicMock()
+        client.client.get.side_effect = [_response([1], X_Next_Page="2"), _response([2])]
+
+        pages = list(iter_pages(client, "/projects", concurrency=8))
+
+        assert [p.items for p in pages] == [[1], [2]]
+
+    def test_single_page_uses_ctx(self) -> None:
+        ctx = Context()
+        ctx.configure(json_mode=True, token=None, base_url=None, project=None, limit=10, page=3)
+        client = MagicMock()
+        client.client.get.return_value = _response([1], X_Next_Page="4")
+
+        pages = list(paginate(client, "/projects", ctx=ctx))
+
+        assert len(pages) == 1
+        client.client.get.assert_called_once_with("/projects", params={"page": 3, "per_page": 10})
+
+    @pytest.mark.parametrize(
+        ("fields", "params"),
+        [
+            ("path_with_namespace,namespace.full_path", {"simple": True}),
+            ("path_with_namespace,open_issues_count", {}),
+        ],
+    )
+    def test_fields_request_slim_view(self, fields: str, params: dict) -> None:
+        ctx = Context()
+        ctx.configure(
+            json_mode=True, token=None, base_url=None, project=None, limit=10, page=1, fields=tuple(fields.split(","))
+        )
+        client = MagicMock()
+        client.client.get.return_value = _response([{"id": 1, "path_with_namespace": "g/p", "open_issues_count": 2}])
+
+        (page,) = paginate(client, "/projects", {"membership": True}, ctx=ctx, keep=("id",))
+
+        client.client.get.assert_called_once_with(
+            "/projects", params={"membership": True, **params, "page": 1, "per_page": 10}
+        )
+        assert set(page.items[0]) == {*(f.split(".")[0] for f in fields.split(",")), "id"}
+
+    def test_all_pages(self) -> None:
+        ctx = Context()
+        ctx.configure(json_mode=True, token=None, base_url=None, project=None, limit=10, page=3, all_pages=True)
+        client = MagicMock()
+        client.client.get.side_effect = [_response([1], X_Next_Page="2"), _response([2])]
+
+        pages = list(paginate(client, "/projects", ctx=ctx))
+
+        assert [p.page for p in pages] == [1, 2]
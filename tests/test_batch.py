@@ -0,0 +1,124 @@
+"""Tests for batch execution."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from qodev_gitlab_api import NotFoundError
+
+from qodev_gitlab_cli.batch import InvalidRequest, parse_request, run_batch
+from qodev_gitlab_cli.context import Context
+
+
+@pytest.fixture
+def base() -> Context:
+    c = Context()
+    c.configure(json_mode=False, token=None, base_url=None, project="g/p", limit=25, page=1)
+    return c
+
+
+def _run(lines: list[str], client: MagicMock, base: Context, **kwargs: int) -> list[dict]:
+    records: list[dict] = []
+    with patch.object(Context, "client", return_value=client):
+        run_batch(lines, base=base, write=records.append, **kwargs)
+    return records
+
+
+class TestParseRequest:
+    def test_inherits_batch_options(self, base: Context) -> None:
+        request = parse_request('{"id": "a", "cmd": ["mrs", "get", "12"]}', 1, base=base)
+        assert request.id == "a"
+        assert request.argv[-3:] == ["mrs", "get", "12"]
+        assert request.argv[:2] == ["--project", "g/p"]
+        assert "--format" in request.argv
+        assert not request.exclusive
+
+    def test_request_options_win(self, base: Context) -> None:
+        request = parse_request('{"cmd": "--format ndjson mrs list", "project": "x/y"}', 3, base=base)
+        assert request.id == 3
+        assert request.argv[:2] == ["--project", "x/y"]
+        assert request.argv.count("--format") == 1
+
+    def test_writes_are_exclusive(self, base: Context) -> None:
+        assert parse_request('{"cmd": ["mrs", "merge", "1"]}', 1, base=base).exclusive
+
+    @pytest.mark.parametrize("line", ["nope", "[1]", '{"cmd": []}', '{"cmd": ["batch"]}'])
+    def test_invalid(self, line: str, base: Context) -> None:
+        with pytest.raises(InvalidRequest):
+            parse_request(line, 1, base=base)
+
+
+class TestRunBatch:
+    def test_results_and_errors(self, base: Context, sample_mr: dict) -> None:
+        client = MagicMock()
+        client.get_merge_request.side_effect = lambda project, iid: (
+            {**sample_mr, "iid": iid} if iid == 1 else (_ for _ in ()).throw(NotFoundError("Not found"))
+        )
+        lines = ['{"id": "a", "cmd": ["mrs", "get", "1"]}', "", "{bad", '{"id": "b", "cmd": ["mrs", "get", "2"]}']
+
+        records = _run(lines, client, base)
+
+        assert [r["id"] for r in records] == ["a", 3, "b"]
+        assert records[0]["code"] == 0
+        assert records[0]["result"]["iid"] == 1
+        assert records[1]["code"] == 83
+        assert records[1]["error_code"] == "validation"
+        assert records[2]["code"] == 81
+        assert records[2]["error_code"] == "not_found"
+
+    def test_output_is_captured_per_command(self, base: Context, sample_mr: dict, capsys) -> None:
+        client = MagicMock()
+        client.get_merge_request.return_value = sample_mr
+
+        records = _run(['{"cmd": ["--format", "markdown", "mrs", "get", "1"]}'], client, base)
+
+        assert "Add new feature" in records[0]["output"]
+        assert capsys.readouterr().out == ""
+
+    def test_read_commands_run_concurrently(self, base: Context, sample_mr: dict) -> None:
+        client = MagicMock()
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def get_mr(project: str, iid: int) -> dict:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return {**sample_mr, "iid": iid, "project": project}
+
+        client.get_merge_request.side_effect = get_mr
+        lines = [json.dumps({"id": i, "cmd": ["mrs", "get", str(i)], "project": f"g/p{i}"}) for i in range(4)]
+
+        records = _run(lines, client, base, parallel=4)
+
+        assert peak > 1
+        assert {r["id"]: r["result"]["project"] for r in records} == {i: f"g/p{i}" for i in range(4)}
+
+    def test_writes_wait_for_earlier_commands(self, base: Context, sample_mr: dict) -> None:
+        client = MagicMock()
+        events: list[str] = []
+
+        def get_mr(project: str, iid: int) -> dict:
+            time.sleep(0.05)
+            events.append(f"get {iid}")
+            return sample_mr
+
+        client.get_merge_request.side_effect = get_mr
+        client.merge_mr.side_effect = lambda *a, **k: events.append("merge") or sample_mr
+        lines = [
+            '{"cmd": ["mrs", "get", "1"]}',
+            '{"cmd": ["mrs", "get", "2"]}',
+            '{"cmd": ["mrs", "merge", "1"]}',
+        ]
+
+        _run(lines, client, base, parallel=4)
+
+        assert events[-1] == "merge"
@@ -0,0 +1,114 @@
+"""Tests for multi-ID get."""
+
+from __future__ import annotations
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from qodev_gitlab_api import NotFoundError
+
+from qodev_gitlab_cli.bulk import collect_ids, fetch_many, output_many
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.errors import EXIT_NOT_FOUND, EXIT_VALIDATION
+from qodev_gitlab_cli.formatters.mrs import format_mr_list
+
+
+def _fetch(iid: int) -> dict:
+    if iid == 404:
+        raise NotFoundError("Not found: merge request", status_code=404)
+    return {"iid": iid, "title": f"MR {iid}"}
+
+
+def _ctx(output_format: str = "json", fields: tuple[str, ...] = ()) -> Context:
+    ctx = Context()
+    ctx.configure(
+        json_mode=False,
+        token=None,
+        base_url=None,
+        project="g/p",
+        limit=25,
+        page=1,
+        output_format=output_format,
+        fields=fields,
+    )
+    return ctx
+
+
+class TestCollectIds:
+    def test_positional_and_file(self, tmp_path) -> None:
+        path = tmp_path / "ids.txt"
+        path.write_text("!12, #15\n19\n12\n")
+
+        assert collect_ids([3], str(path), ctx=_ctx()) == [3, 12, 15, 19]
+
+    def test_stdin(self) -> None:
+        with patch("sys.stdin", io.StringIO("4 5")):
+            assert collect_ids(None, "-", ctx=_ctx()) == [4, 5]
+
+    def test_invalid_token(self, tmp_path, capsys) -> None:
+        path = tmp_path / "ids.txt"
+        path.write_text("12 abc")
+
+        with pytest.raises(SystemExit) as exc_info:
+            collect_ids(None, str(path), ctx=_ctx())
+
+        assert exc_info.value.code == EXIT_VALIDATION
+        assert json.loads(capsys.readouterr().out)["code"] == "validation"
+
+    def test_empty(self) -> None:
+        with pytest.raises(SystemExit):
+            collect_ids([], None, ctx=_ctx())
+
+
+class TestFetchMany:
+    def test_order_and_inline_errors(self) -> None:
+        results = list(fetch_many(_fetch, [3, 404, 1], key="iid", concurrency=3))
+
+        assert [record for record, _ in results] == [
+            {"iid": 3, "title": "MR 3"},
+            {"iid": 404, "error": "Not found: merge request", "code": "not_found"},
+            {"iid": 1, "title": "MR 1"},
+        ]
+        assert isinstance(results[1][1], NotFoundError)
+
+
+class TestOutputMany:
+    def test_json_list_with_errors(self, capsys) -> None:
+        with pytest.raises(SystemExit) as exc_info:
+            output_many(_fetch, [1, 404], ctx=_ctx(), key="iid", format_fn=format_mr_list)
+
+        assert exc_info.value.code == EXIT_NOT_FOUND
+        data = json.loads(capsys.readouterr().out)
+        assert [item["iid"] for item in data] == [1, 404]
+        assert data[1]["code"] == "not_found"
+
+    def test_ndjson(self, capsys) -> None:
+        output_many(_fetch, [2, 1], ctx=_ctx("ndjson"), key="iid", format_fn=format_mr_list)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["iid"] for line in lines] == [2, 1]
+
+    def test_markdown_lists_errors(self, capsys) -> None:
+        with pytest.raises(SystemExit):
+            output_many(
+                _fetch, [1, 404], ctx=_ctx("markdown"), key="iid", format_fn=format_mr_list, label=lambda i: f"!{i}"
+            )
+
+        out = capsys.readouterr().out
+        assert "MR 1" in out
+        assert "!404: Not found" in out
+
+    def test_fields_project_json_only(self, capsys) -> None:
+        output_many(_fetch, [1], ctx=_ctx(fields=("iid",)), key="iid", format_fn=format_mr_list)
+        assert json.loads(capsys.readouterr().out) == [{"iid": 1}]
+
+        formatted: list[list[dict]] = []
+
+        def format_fn(items: list[dict], **_: object) -> str:
+            formatted.append(items)
+            return ""
+
+        output_many(_fetch, [1], ctx=_ctx("markdown", fields=("iid",)), key="iid", format_fn=format_fn)
+        assert formatted == [[{"iid": 1, "title": "MR 1"}]]
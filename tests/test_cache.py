@@ -0,0 +1,168 @@
+"""Tests for the HTTP response cache."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli.cache import CachingTransport, ResponseCache, scope_of
+from qodev_gitlab_cli.context import Context
+
+
+class FakeServer:
+    """httpx.MockTransport handler that honours If-None-Match."""
+
+    def __init__(self) -> None:
+        self.calls: list[httpx.Request] = []
+        self.body = b'{"iid": 1}'
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        if request.method != "GET":
+            return httpx.Response(200, json={})
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"', "X-Total": "1"}, content=self.body)
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+@pytest.fixture
+def cache_ctx() -> Context:
+    return Context()
+
+
+@pytest.fixture
+def http(tmp_path, server: FakeServer, cache_ctx: Context) -> httpx.Client:
+    transport = CachingTransport(httpx.MockTransport(server), ResponseCache(str(tmp_path)), cache_ctx)
+    return httpx.Client(base_url="https://gl.example.com/api/v4", transport=transport, headers={"PRIVATE-TOKEN": "t"})
+
+
+URL = "/projects/g%2Fp/merge_requests/1"
+
+
+class TestScope:
+    def test_project_resource(self) -> None:
+        assert scope_of("/api/v4/projects/g%2Fp/merge_requests/1/merge") == "projects/g%2Fp/merge_requests"
+
+    def test_top_level(self) -> None:
+        assert scope_of("/api/v4/projects") == "projects"
+
+
+class TestCachingTransport:
+    def test_revalidates_with_etag(self, http: httpx.Client, server: FakeServer) -> None:
+        assert http.get(URL).json() == {"iid": 1}
+        response = http.get(URL)
+        assert response.status_code == 200
+        assert response.json() == {"iid": 1}
+        assert response.headers["x-total"] == "1"
+        assert server.calls[1].headers["if-none-match"] == '"v1"'
+
+    def test_ttl_skips_network(self, http: httpx.Client, server: FakeServer, cache_ctx: Context) -> None:
+        cache_ctx.cache_ttl = 60
+        http.get(URL)
+        http.get(URL)
+        assert len(server.calls) == 1
+
+    def test_request_no_cache_revalidates_within_ttl(
+        self, http: httpx.Client, server: FakeServer, cache_ctx: Context
+    ) -> None:
+        cache_ctx.cache_ttl = 60
+        http.get(URL)
+        response = http.get(URL, headers={"Cache-Control": "no-cache"})
+        assert response.json() == {"iid": 1}
+        assert len(server.calls) == 2
+        assert server.calls[1].headers["if-none-match"] == '"v1"'
+
+    def test_no_cache_bypasses(self, http: httpx.Client, server: FakeServer, cache_ctx: Context) -> None:
+        http.get(URL)
+        cache_ctx.cache_mode = "off"
+        http.get(URL)
+        assert "if-none-match" not in server.calls[1].headers
+
+    def test_cache_only_hit_and_miss(self, http: httpx.Client, server: FakeServer, cache_ctx: Context) -> None:
+        http.get(URL)
+        cache_ctx.cache_mode = "only"
+        assert http.get(URL).json() == {"iid": 1}
+        assert http.get("/projects/g%2Fp/merge_requests/2").status_code == 504
+        assert len(server.calls) == 1
+
+    def test_mutation_invalidates_scope(self, http: httpx.Client, server: FakeServer, cache_ctx: Context) -> None:
+        cache_ctx.cache_ttl = 60
+        http.get(URL)
+        http.put(f"{URL}/merge", json={})
+        http.get(URL)
+        assert [r.method for r in server.calls] == ["GET", "PUT", "GET"]
+        assert "if-none-match" not in server.calls[2].headers
+
+    def test_mutation_keeps_other_resources_of_nested_project(
+        self, http: httpx.Client, server: FakeServer, cache_ctx: Context
+    ) -> None:
+        cache_ctx.cache_ttl = 60
+        http.get("/projects/g%2Fsub%2Fp/merge_requests")
+        http.put("/projects/g%2Fsub%2Fp/issues/1", json={})
+        http.get("/projects/g%2Fsub%2Fp/merge_requests")
+        assert [r.method for r in server.calls] == ["GET", "PUT"]
+
+    @pytest.mark.parametrize("cache_control", ["no-store", "max-age=0, private, must-revalidate"])
+    def test_not_stored_when_forbidden(self, tmp_path, cache_control: str) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"ETag": '"v1"', "Cache-Control": cache_control}, json={})
+
+        transport = CachingTransport(httpx.MockTransport(handler), ResponseCache(str(tmp_path)), Context())
+        with httpx.Client(base_url="https://gl.example.com/api/v4", transport=transport) as client:
+            client.get(URL)
+        assert not (tmp_path / "http").exists()
+
+    def test_no_store_request_bypasses_cache(self, tmp_path, http: httpx.Client, server: FakeServer) -> None:
+        http.get(URL, headers={"Cache-Control": "no-store"})
+        http.get(URL, headers={"Cache-Control": "no-store"})
+
+        assert not (tmp_path / "http").exists()
+        assert all("if-none-match" not in call.headers for call in server.calls)
+
+    def test_tree_is_private(self, tmp_path, http: httpx.Client) -> None:
+        http.get(URL)
+        directories = [tmp_path / "http", *(p for p in (tmp_path / "http").rglob("*") if p.is_dir())]
+        assert len(directories) == 3
+        assert {oct(d.stat().st_mode & 0o777) for d in directories} == {"0o700"}
+
+    def test_tokens_do_not_share_entries(self, http: httpx.Client, server: FakeServer, cache_ctx: Context) -> None:
+        cache_ctx.cache_ttl = 60
+        http.get(URL)
+        http.get(URL, headers={"PRIVATE-TOKEN": "other"})
+        assert len(server.calls) == 2
+
+    def test_trace_not_cached(self, http: httpx.Client, server: FakeServer, cache_ctx: Context) -> None:
+        cache_ctx.cache_ttl = 60
+        http.get("/projects/g%2Fp/jobs/1/trace")
+        http.get("/projects/g%2Fp/jobs/1/trace")
+        assert len(server.calls) == 2
+
+
+class TestEviction:
+    def test_lru_eviction(self, tmp_path) -> None:
+        cache = ResponseCache(str(tmp_path), max_bytes=2500)
+        for i in range(5):
+            request = httpx.Request("GET", f"https://gl.example.com/api/v4/projects/{i}")
+            cache.store(request, httpx.Response(200), b"x" * 1000)
+        assert cache.load(httpx.Request("GET", "https://gl.example.com/api/v4/projects/4")) is not None
+        assert cache.load(httpx.Request("GET", "https://gl.example.com/api/v4/projects/0")) is None
+
+    def test_scans_only_when_over_budget(self, tmp_path, monkeypatch) -> None:
+        from qodev_gitlab_cli import cache as cache_module
+
+        walks: list[str] = []
+        walk = cache_module.os.walk
+        monkeypatch.setattr(cache_module.os, "walk", lambda top: walks.append(top) or walk(top))
+        cache = ResponseCache(str(tmp_path), max_bytes=5000)
+        for i in range(8):
+            request = httpx.Request("GET", f"https://gl.example.com/api/v4/projects/{i % 4}")
+            cache.store(request, httpx.Response(200), b"x" * 1000)
+        # The first store scans; overwrites do not grow the running size.
+        assert len(walks) == 1
+        cache.store(httpx.Request("GET", "https://gl.example.com/api/v4/projects/9"), httpx.Response(200), b"x" * 1000)
+        assert len(walks) == 2
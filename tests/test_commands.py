@@ -5,6 +5,9 @@ from __future__ import annotations
 import json
 from unittest.mock import MagicMock, patch
 
+import httpx
+import pytest
+
 import qodev_gitlab_cli.context as _ctx
 
 
@@ -27,10 +30,11 @@ class TestProjectsCommand:
 
     def test_projects_list_json(self, capsys) -> None:
         mock_client = MagicMock()
-        mock_client.get_projects.return_value = [
-            {"id": 1, "name": "proj1"},
-            {"id": 2, "name": "proj2"},
-        ]
+        mock_client.client.get.return_value = httpx.Response(
+            200,
+            json=[{"id": 1, "name": "proj1"}, {"id": 2, "name": "proj2"}],
+            headers={"X-Total": "2", "X-Total-Pages": "1"},
+        )
 
         _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project=None, limit=25, page=1)
 
@@ -42,15 +46,20 @@ class TestProjectsCommand:
         captured = capsys.readouterr()
         data = json.loads(captured.out)
         assert len(data["items"]) == 2
-        mock_client.get_projects.assert_called_once_with(owned=False)
+        assert data["total"] == 2
+        mock_client.client.get.assert_called_once_with(
+            "/projects", params={"membership": True, "owned": False, "page": 1, "per_page": 25}
+        )
 
 
 class TestMrsCommand:
     def test_mrs_list_json(self, sample_mr: dict, capsys) -> None:
         mock_client = MagicMock()
-        mock_client.get_merge_requests.return_value = [sample_mr]
+        mock_client.client.get.return_value = httpx.Response(
+            200, json=[sample_mr], headers={"X-Total": "41", "X-Total-Pages": "3", "X-Next-Page": "3"}
+        )
 
-        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="group/project", limit=25, page=1)
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="group/project", limit=20, page=2)
 
         with patch.object(_ctx.ctx, "client", return_value=mock_client):
             from qodev_gitlab_cli.commands.mrs import list
@@ -61,6 +70,153 @@ class TestMrsCommand:
         data = json.loads(captured.out)
         assert len(data["items"]) == 1
         assert data["items"][0]["title"] == "Add new feature"
+        assert (data["total"], data["page"], data["limit"], data["total_pages"]) == (41, 2, 20, 3)
+        mock_client.client.get.assert_called_once_with(
+            "/projects/group%2Fproject/merge_requests", params={"state": "opened", "page": 2, "per_page": 20}
+        )
+
+    def test_mrs_list_enrich_json(self, sample_mr: dict, capsys) -> None:
+        mock_client = MagicMock()
+        mock_client.client.get.return_value = httpx.Response(200, json=[sample_mr], headers={"X-Total": "1"})
+        node = {"iid": "1", "conflicts": True, "approvedBy": {"count": 1}, "headPipeline": {"status": "FAILED"}}
+        mock_client.client.post.return_value = httpx.Response(
+            200, json={"data": {"p0": {"mergeRequests": {"nodes": [node]}}}}
+        )
+
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="group/project", limit=20, page=1)
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.mrs import list
+
+            list(state="opened", enrich=True)
+
+        item = json.loads(capsys.readouterr().out)["items"][0]
+        assert (item["head_pipeline_status"], item["approval_count"], item["has_conflicts"]) == ("failed", 1, True)
+        mock_client.client.post.assert_called_once()
+
+    def test_mrs_list_enrich_with_fields(self, sample_mr: dict, capsys) -> None:
+        mr = {**sample_mr, "references": {"full": "group/project!1"}}
+        mock_client = MagicMock()
+        mock_client.client.get.return_value = httpx.Response(200, json=[mr], headers={"X-Total": "1"})
+        node = {"iid": "1", "approvedBy": {"count": 2}}
+        mock_client.client.post.return_value = httpx.Response(
+            200, json={"data": {"p0": {"mergeRequests": {"nodes": [node]}}}}
+        )
+
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="42", limit=20, page=1, fields=("title",))
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.mrs import list
+
+            list(state="opened", enrich=True)
+
+        item = json.loads(capsys.readouterr().out)["items"][0]
+        assert (item["title"], item["approval_count"]) == (mr["title"], 2)
+        document = mock_client.client.post.call_args.kwargs["json"]["query"]
+        assert 'fullPath: "group/project"' in document
+
+    def test_mrs_list_fields_json(self, sample_mr: dict, capsys) -> None:
+        mock_client = MagicMock()
+        mock_client.client.get.return_value = httpx.Response(200, json=[sample_mr], headers={"X-Total": "1"})
+
+        _ctx.ctx.configure(
+            json_mode=True,
+            token=None,
+            base_url=None,
+            project="group/project",
+            limit=20,
+            page=1,
+            fields=("iid", "author.username"),
+        )
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.mrs import list
+
+            list(state="opened")
+
+        items = json.loads(capsys.readouterr().out)["items"]
+        assert items == [{"iid": sample_mr["iid"], "author": {"username": sample_mr["author"]["username"]}}]
+
+    def test_mrs_list_where_pushdown(self, sample_mr: dict, capsys) -> None:
+        mrs = [
+            {**sample_mr, "iid": iid, "state": state, "author": {"username": "a"}}
+            for iid, state in ((1, "merged"), (2, "opened"), (3, "merged"))
+        ]
+        mock_client = MagicMock()
+        mock_client.client.get.return_value = httpx.Response(200, json=mrs, headers={"X-Total": "3"})
+
+        from qodev_gitlab_cli.query import Query
+
+        _ctx.ctx.configure(
+            json_mode=True,
+            token=None,
+            base_url=None,
+            project="group/project",
+            limit=20,
+            page=1,
+            query=Query.parse('state == "merged" and author.username == "a"', sort="-iid"),
+        )
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.mrs import list
+
+            list()
+
+        data = json.loads(capsys.readouterr().out)
+        assert [item["iid"] for item in data["items"]] == [3, 1]
+        assert data["total"] == 2
+        params = mock_client.client.get.call_args.kwargs["params"]
+        # The `--where` equality replaces the defaulted `state=opened`.
+        assert (params["state"], params["author_username"]) == ("merged", "a")
+
+    def test_mrs_list_where_conflicts_with_state(self) -> None:
+        from qodev_gitlab_cli.errors import EXIT_VALIDATION, classify_error
+        from qodev_gitlab_cli.query import Query, QueryError
+
+        _ctx.ctx.configure(
+            json_mode=True,
+            token=None,
+            base_url=None,
+            project="group/project",
+            limit=20,
+            page=1,
+            query=Query.parse('state == "merged"'),
+        )
+        mock_client = MagicMock()
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.mrs import list
+
+            with pytest.raises(QueryError, match="state='opened'") as excinfo:
+                list(state="opened")
+
+        mock_client.client.get.assert_not_called()
+        assert classify_error(excinfo.value) == ("validation", EXIT_VALIDATION)
+
+    def test_mrs_list_where_fields_not_printed(self, sample_mr: dict, capsys) -> None:
+        mrs = [{**sample_mr, "iid": iid, "state": state} for iid, state in ((1, "merged"), (2, "opened"))]
+        mock_client = MagicMock()
+        mock_client.client.get.return_value = httpx.Response(200, json=mrs, headers={"X-Total": "2"})
+
+        from qodev_gitlab_cli.query import Query
+
+        _ctx.ctx.configure(
+            json_mode=True,
+            token=None,
+            base_url=None,
+            project="group/project",
+            limit=20,
+            page=1,
+            fields=("iid",),
+            query=Query.parse('state == "merged"', sort="-updated_at"),
+        )
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.mrs import list
+
+            list(state="all")
+
+        assert json.loads(capsys.readouterr().out)["items"] == [{"iid": 1}]
 
     def test_mrs_get_json(self, sample_mr: dict, capsys) -> None:
         mock_client = MagicMock()
@@ -71,7 +227,7 @@ class TestMrsCommand:
         with patch.object(_ctx.ctx, "client", return_value=mock_client):
             from qodev_gitlab_cli.commands.mrs import get
 
-            get(iid=1)
+            get(iid=[1])
 
         captured = capsys.readouterr()
         data = json.loads(captured.out)
@@ -108,3 +264,135 @@ class TestMrsCommand:
         captured = capsys.readouterr()
         data = json.loads(captured.out)
         assert data["body"] == "LGTM"
+
+
+class TestVariablesCommand:
+    def test_variables_list_hides_values(self, capsys) -> None:
+        mock_client = MagicMock()
+        variables = [{"key": "TOKEN", "value": "secret", "masked": True, "protected": False}]
+        mock_client.client.get.return_value = httpx.Response(200, json=variables, headers={"X-Total": "1"})
+
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="group/project", limit=20, page=1)
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.variables import list
+
+            list()
+
+        [item] = json.loads(capsys.readouterr().out)["items"]
+        assert (item["key"], item["masked"]) == ("TOKEN", True)
+        assert "value" not in item
+
+    def test_variables_list_fields(self, capsys) -> None:
+        mock_client = MagicMock()
+        variables = [{"key": "A", "value": "secret", "masked": True, "protected": False}]
+        mock_client.client.get.return_value = httpx.Response(200, json=variables, headers={"X-Total": "1"})
+
+        _ctx.ctx.configure(
+            json_mode=True,
+            token=None,
+            base_url=None,
+            project="group/project",
+            limit=20,
+            page=1,
+            fields=("key", "value"),
+        )
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.variables import list
+
+            list()
+
+        assert json.loads(capsys.readouterr().out)["items"] == [{"key": "A"}]
+
+    def test_variables_never_cached(self, tmp_path, capsys) -> None:
+        from qodev_gitlab_api import GitLabClient
+
+        from qodev_gitlab_cli.cache import CachingTransport, ResponseCache
+
+        variable = {"key": "TOKEN", "value": "supersecret", "masked": True}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = variable if request.url.path.endswith("/TOKEN") else [variable]
+            return httpx.Response(200, json=body, headers={"ETag": '"v1"', "X-Total": "1"})
+
+        _ctx.ctx.configure(
+            json_mode=True, token=None, base_url=None, project="group/project", limit=20, page=1, cache_ttl=60
+        )
+        client = GitLabClient(token="t", base_url="https://gl.example.com", validate=False)
+        transport = CachingTransport(httpx.MockTransport(handler), ResponseCache(str(tmp_path)), _ctx.ctx)
+        client.client = httpx.Client(base_url=client.api_url, transport=transport)
+
+        with patch.object(_ctx.ctx, "client", return_value=client):
+            from qodev_gitlab_cli.commands.variables import get, list
+
+            list()
+            get("TOKEN")
+
+        assert "supersecret" in capsys.readouterr().out
+        assert not any(path.is_file() for path in tmp_path.rglob("*"))
+
+
+class TestJobsLogCommand:
+    TRACE = 'Running "tests"\n\x1b[32mok\x1b[0m\n' * 3
+
+    def _client(self) -> MagicMock:
+        mock_client = MagicMock()
+        mock_client.client = httpx.Client(
+            base_url="https://gitlab.example.com/api/v4",
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text=self.TRACE)),
+        )
+        return mock_client
+
+    def _run(self, json_mode: bool, **kwargs: object) -> None:
+        _ctx.ctx.configure(json_mode=json_mode, token=None, base_url=None, project="group/project", limit=25, page=1)
+        with patch.object(_ctx.ctx, "client", return_value=self._client()):
+            from qodev_gitlab_cli.commands.jobs import log
+
+            log(id=7, **kwargs)
+
+    def test_json_streams_string(self, capsys) -> None:
+        self._run(True)
+
+        data = json.loads(capsys.readouterr().out)
+        assert data == {"job_id": 7, "log": self.TRACE}
+
+    def test_raw(self, capsysbinary) -> None:
+        self._run(False, raw=True)
+
+        assert capsysbinary.readouterr().out == self.TRACE.encode()
+
+    def test_output_file(self, tmp_path, capsys) -> None:
+        path = tmp_path / "job.log"
+
+        self._run(True, output_file=str(path))
+
+        assert path.read_text() == self.TRACE
+        assert json.loads(capsys.readouterr().out)["bytes"] == len(self.TRACE.encode())
+
+
+class TestLimitValidation:
+    def test_global_limit_above_page_size(self, capsys) -> None:
+        from qodev_gitlab_cli.app import app
+        from qodev_gitlab_cli.errors import EXIT_VALIDATION
+
+        with pytest.raises(SystemExit) as exc_info:
+            app.meta(["--json", "--limit", "500", "-p", "group/project", "mrs", "list"])
+
+        assert exc_info.value.code == EXIT_VALIDATION
+        assert "--limit must be between 1 and 100" in capsys.readouterr().out
+
+    def test_pipelines_limit_above_page_size(self) -> None:
+        from qodev_gitlab_cli.errors import EXIT_VALIDATION
+
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="group/project", limit=20, page=1)
+        mock_client = MagicMock()
+
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            from qodev_gitlab_cli.commands.pipelines import list
+
+            with pytest.raises(SystemExit) as exc_info:
+                list(limit=500)
+
+        assert exc_info.value.code == EXIT_VALIDATION
+        mock_client.client.get.assert_not_called()
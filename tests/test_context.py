@@ -50,19 +50,39 @@ class TestContext:
     def test_client_passes_token(self) -> None:
         ctx = Context()
         ctx.token = "my-token"
-        with patch("qodev_gitlab_cli.context.GitLabClient") as mock_cls:
+        with patch("qodev_gitlab_api.GitLabClient") as mock_cls:
             ctx.client()
             mock_cls.assert_called_once_with(token="my-token")
 
     def test_client_passes_base_url(self) -> None:
         ctx = Context()
         ctx.base_url = "https://gl.com"
-        with patch("qodev_gitlab_cli.context.GitLabClient") as mock_cls:
+        with patch("qodev_gitlab_api.GitLabClient") as mock_cls:
             ctx.client()
             mock_cls.assert_called_once_with(base_url="https://gl.com")
 
     def test_client_no_args(self) -> None:
         ctx = Context()
-        with patch("qodev_gitlab_cli.context.GitLabClient") as mock_cls:
+        with patch("qodev_gitlab_api.GitLabClient") as mock_cls:
             ctx.client()
             mock_cls.assert_called_once_with()
+
+
+class TestCurrentContext:
+    def test_proxy_follows_current_context(self) -> None:
+        from qodev_gitlab_cli import context
+
+        other = Context(project="other/project")
+        with context.using(other):
+            assert context.ctx.project == "other/project"
+            context.ctx.limit = 7
+        assert other.limit == 7
+        assert context.current() is context.root
+
+    def test_executor_workers_inherit_context(self) -> None:
+        from qodev_gitlab_cli import context
+
+        other = Context(project="other/project")
+        with context.using(other), context.executor(2) as pool:
+            projects = list(pool.map(lambda _: context.ctx.project, range(4)))
+        assert projects == ["other/project"] * 4
@@ -0,0 +1,206 @@
+"""Tests for the background daemon."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import qodev_gitlab_cli.context as _ctx
+from qodev_gitlab_cli import daemon
+
+
+@pytest.fixture
+def sock_path():
+    # AF_UNIX paths are length-limited, so avoid pytest's deep tmp_path.
+    with tempfile.TemporaryDirectory() as tmp:
+        yield os.path.join(tmp, "d.sock")
+
+
+class TestSocketPath:
+    def test_env_override(self) -> None:
+        with patch.dict(os.environ, {"QODEV_GITLAB_SOCKET": "/tmp/custom.sock"}):
+            assert daemon.socket_path() == "/tmp/custom.sock"
+
+    def test_per_user_default(self) -> None:
+        with patch.dict(os.environ, {"QODEV_GITLAB_SOCKET": "", "XDG_RUNTIME_DIR": "/"}):
+            assert daemon.socket_path() == f"/qodev-gitlab-{os.getuid()}.sock"
+
+    def test_private_dir_without_runtime_dir(self) -> None:
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.dict(os.environ, {"QODEV_GITLAB_SOCKET": "", "XDG_RUNTIME_DIR": ""}),
+            patch.object(daemon.tempfile, "gettempdir", return_value=tmp),
+        ):
+            path = daemon.socket_path()
+            assert path == os.path.join(tmp, f"qodev-gitlab-{os.getuid()}", "daemon.sock")
+            assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+
+
+class TestForward:
+    def test_no_daemon_returns_none(self, sock_path: str) -> None:
+        with patch.dict(os.environ, {"QODEV_GITLAB_SOCKET": sock_path}):
+            assert daemon.forward(["mrs", "list"]) is None
+
+    def test_ignores_non_socket_path(self, sock_path: str) -> None:
+        with open(sock_path, "w"):
+            pass
+        with patch.dict(os.environ, {"QODEV_GITLAB_SOCKET": sock_path}):
+            assert daemon.forward(["mrs", "list"]) is None
+
+    def test_ignores_socket_of_other_user(self, sock_path: str) -> None:
+        server = daemon.DaemonServer(sock_path, idle_timeout=5)
+        try:
+            with patch.object(daemon.os, "getuid", return_value=os.getuid() + 1):
+                assert daemon._connect(sock_path) is None
+        finally:
+            server.server_close()
+
+    @pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="needs SO_PEERCRED")
+    def test_peer_credentials(self) -> None:
+        left, right = socket.socketpair()
+        with left, right:
+            assert daemon._peer_is_current_user(left)
+            with patch.object(daemon.os, "getuid", return_value=os.getuid() + 1):
+                assert not daemon._peer_is_current_user(left)
+
+    def test_forwards_cli_settings(self) -> None:
+        env = {"GITLAB_TOKEN": "t", "QODEV_GITLAB_CACHE_DIR": "/c", "QODEV_GITLAB_JSON_BACKEND": "json", "HOME": "/h"}
+        with patch.dict(os.environ, env, clear=True):
+            assert daemon._forwarded_env() == {k: v for k, v in env.items() if k != "HOME"}
+
+    def test_disabled_returns_none(self) -> None:
+        with patch.dict(os.environ, {"QODEV_GITLAB_NO_DAEMON": "1"}):
+            assert daemon.forward(["mrs", "list"]) is None
+
+    def test_daemon_commands_run_in_process(self) -> None:
+        assert daemon.forward(["daemon", "status"]) is None
+
+    def test_daemon_as_argument_is_forwarded(self) -> None:
+        with patch.object(daemon, "request", return_value=None) as request:
+            daemon.forward(["issues", "create", "--title", "daemon"])
+        request.assert_called_once()
+
+
+class TestServer:
+    def test_roundtrip(self, sock_path: str, sample_mr: dict, capsysbinary) -> None:
+        server = daemon.DaemonServer(sock_path, idle_timeout=5)
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+
+        mock_client = MagicMock()
+        mock_client.get_merge_request.return_value = sample_mr
+        try:
+            with (
+                patch.dict(os.environ, {"QODEV_GITLAB_SOCKET": sock_path}),
+                patch.object(_ctx.ctx, "client", return_value=mock_client),
+            ):
+                code = daemon.forward(["--json", "-p", "group/project", "mrs", "get", "1"])
+                status = daemon.request({"op": "status"})
+        finally:
+            daemon.request({"op": "shutdown"}, sock_path)
+            thread.join(timeout=5)
+
+        assert code == 0
+        assert json.loads(capsysbinary.readouterr().out)["iid"] == 1
+        assert status is not None
+        assert status["requests_served"] == 1
+        assert not os.path.exists(sock_path)
+
+    def test_busy_daemon_falls_back_in_process(self, sock_path: str) -> None:
+        server = daemon.DaemonServer(sock_path, idle_timeout=5)
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        started, release = threading.Event(), threading.Event()
+        executed: list[list[str]] = []
+
+        def slow_execute(argv: list[str], **kwargs: object) -> tuple[int, bytes, bytes]:
+            executed.append(argv)
+            started.set()
+            release.wait(5)
+            return 0, b"", b""
+
+        try:
+            with patch.object(daemon, "execute", side_effect=slow_execute):
+                first = threading.Thread(target=daemon.request, args=({"op": "run", "argv": ["a"]}, sock_path))
+                first.start()
+                assert started.wait(5)
+                begin = time.monotonic()
+                assert daemon.request({"op": "run", "argv": ["b"]}, sock_path) is None
+                assert time.monotonic() - begin < 1
+                assert daemon.running(sock_path)
+                release.set()
+                first.join(timeout=5)
+                assert daemon.request({"op": "status"}, sock_path) is not None
+        finally:
+            release.set()
+            daemon.request({"op": "shutdown"}, sock_path, ready_timeout=None)
+            thread.join(timeout=5)
+
+        # The request that found the daemon busy was never run.
+        assert executed == [["a"]]
+
+    def test_long_running_commands_run_in_process(self) -> None:
+        with patch.object(daemon, "request") as request:
+            assert daemon.forward(["-p", "g/p", "pipelines", "wait", "1"]) is None
+            assert daemon.forward(["jobs", "log", "7", "--follow"]) is None
+        request.assert_not_called()
+
+    def test_execute_streams_stdout(self, sample_mr: dict) -> None:
+        chunks: list[bytes] = []
+        mock_client = MagicMock()
+        mock_client.get_merge_request.return_value = sample_mr
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            code, out, _ = daemon.execute(
+                ["--format", "ndjson", "-p", "group/project", "mrs", "get", "1"], env={}, on_chunk=chunks.append
+            )
+
+        assert code == 0
+        assert out == b""
+        assert json.loads(b"".join(chunks))["iid"] == 1
+
+    def test_execute_passes_stdin(self, sample_mr: dict) -> None:
+        mock_client = MagicMock()
+        mock_client.get_merge_request.return_value = sample_mr
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            code, out, _ = daemon.execute(
+                ["--json", "-p", "group/project", "mrs", "get", "--ids-from", "-"], env={}, stdin="1 2\n"
+            )
+
+        assert code == 0
+        assert len(json.loads(out)) == 2
+
+    def test_forward_reads_stdin_only_when_asked(self) -> None:
+        assert daemon._reads_stdin(["mrs", "get", "--ids-from", "-"])
+        assert daemon._reads_stdin(["mrs", "get", "--ids-from=-"])
+        assert not daemon._reads_stdin(["mrs", "get", "1"])
+        assert daemon._reads_stdin(["-p", "g/p", "batch", "--parallel", "4"])
+        assert not daemon._reads_stdin(["mrs", "create", "--title", "batch"])
+
+    @pytest.mark.parametrize("tty", [False, True])
+    def test_default_format_is_markdown(self, sample_mr: dict, tty: bool) -> None:
+        mock_client = MagicMock()
+        mock_client.get_merge_request.return_value = sample_mr
+        with patch.object(_ctx.ctx, "client", return_value=mock_client):
+            code, out, _ = daemon.execute(["-p", "group/project", "mrs", "get", "1"], env={}, tty=tty)
+        assert code == 0
+        assert "Merge Request !1" in out.decode()
+
+    def test_execute_captures_exit_code(self) -> None:
+        code, _, _ = daemon.execute(["--json", "mrs", "get", "not-an-int"], env={})
+        assert code != 0
+
+
+class TestContextPooling:
+    def test_client_reused_per_credentials(self) -> None:
+        ctx = _ctx.Context()
+        ctx.token = "tok"
+        with patch("qodev_gitlab_api.GitLabClient") as mock_cls:
+            assert ctx.client() is ctx.client()
+            mock_cls.assert_called_once_with(token="tok")
@@ -0,0 +1,69 @@
+"""Tests for the JSON encoder backends."""
+
+from __future__ import annotations
+
+import io
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from qodev_gitlab_cli import encoding
+
+DATA = {
+    "items": [
+        {"iid": 1, "title": "Fix ümlauts", "labels": ["a", "b"], "author": {"username": "x"}, "meta": {}},
+        {"iid": 2, "created_at": datetime(2024, 1, 15, 10, 0, tzinfo=UTC), "big": 2**70, "draft": None},
+    ],
+    "total": 2,
+    "nested": {"empty": [], "deep": [[1, [2, {"k": "v"}]]]},
+}
+
+
+def _reference(compact: bool) -> str:
+    def default(obj: object) -> str:
+        return obj.isoformat() if isinstance(obj, datetime) else str(obj)
+
+    if compact:
+        return json.dumps(DATA, separators=(",", ":"), ensure_ascii=False, default=default)
+    return json.dumps(DATA, indent=2, ensure_ascii=False, default=default)
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request, monkeypatch) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    monkeypatch.setenv(encoding.BACKEND_ENV, request.param)
+    monkeypatch.setattr(encoding, "_backend", None)
+    return request.param
+
+
+class TestWriteJson:
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_matches_json_dumps(self, backend: str, compact: bool) -> None:
+        stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        encoding.write_json(DATA, compact=compact, stream=stream)
+        assert encoding.backend().name == backend
+        assert stream.buffer.getvalue().decode() == _reference(compact) + "\n"
+
+    def test_writes_in_pieces(self, backend: str, monkeypatch) -> None:
+        monkeypatch.setattr(encoding, "WRITE_BUFFER_SIZE", 1)
+        writes: list[bytes] = []
+        stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        monkeypatch.setattr(stream.buffer, "write", writes.append)
+        encoding.write_json(DATA, stream=stream)
+        assert len(writes) > len(DATA["items"])
+        assert b"".join(writes).decode() == _reference(False) + "\n"
+
+    def test_text_stream_without_buffer(self, backend: str) -> None:
+        stream = io.StringIO()
+        encoding.write_json([1, "ü"], compact=True, stream=stream)
+        assert stream.getvalue() == '[1,"ü"]\n'
+
+
+class TestDumps:
+    def test_unknown_types_use_str(self, backend: str) -> None:
+        assert encoding.dumps({"v": frozenset()}, compact=True) == b'{"v":"frozenset()"}'
+
+    def test_non_string_keys(self, backend: str) -> None:
+        assert json.loads(encoding.dumps({1: "a"})) == {"1": "a"}
@@ -0,0 +1,127 @@
+"""Tests for multi-project fan-out."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli import fanout
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.errors import EXIT_NOT_FOUND
+from qodev_gitlab_cli.formatters.mrs import format_mr_list
+
+PROJECTS = ["acme/api", "acme/web", "acme/infra/tf", "other/x"]
+
+
+def _ctx(project: str, **kwargs: object) -> Context:
+    ctx = Context()
+    ctx.configure(json_mode=True, token=None, base_url=None, project=project, limit=25, page=1, **kwargs)
+    return ctx
+
+
+def _client(requests: list[str]) -> MagicMock:
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.raw_path.decode().split("?")[0].removeprefix("/api/v4")
+        requests.append(path)
+        if path == "/projects":
+            return httpx.Response(200, json=[{"path_with_namespace": p} for p in PROJECTS])
+        if path == "/groups/acme/merge_requests":
+            return httpx.Response(200, json=[{"iid": 1, "references": {"full": "acme/web!1"}}])
+        if path.startswith("/projects/other%2Fx/"):
+            return httpx.Response(404, json={"message": "404 Project Not Found"})
+        project = path.split("/")[2].replace("%2F", "/")
+        return httpx.Response(200, json=[{"iid": 7, "title": f"MR in {project}"}])
+
+    client = MagicMock()
+    client.client = httpx.Client(base_url="https://gitlab.example.com/api/v4", transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path):
+    with patch.dict("os.environ", {"QODEV_GITLAB_CACHE_DIR": str(tmp_path)}):
+        yield
+
+
+class TestSelection:
+    @pytest.mark.parametrize(
+        ("project", "expected"),
+        [("g/p", False), ("a/b,c/d", True), ("acme/*", True), (None, False)],
+    )
+    def test_is_multi(self, project: str | None, expected: bool) -> None:
+        assert fanout.is_multi(_ctx(project)) is expected
+
+    def test_is_multi_projects_from(self) -> None:
+        assert fanout.is_multi(_ctx(None, projects_from="projects.txt"))
+
+    def test_glob_segments(self) -> None:
+        assert fanout.glob_to_regex("acme/*").fullmatch("acme/api")
+        assert not fanout.glob_to_regex("acme/*").fullmatch("acme/infra/tf")
+        assert fanout.glob_to_regex("acme/**").fullmatch("acme/infra/tf")
+
+    def test_group_of(self) -> None:
+        assert fanout.group_of(_ctx("acme/**")) == "acme"
+        assert fanout.group_of(_ctx("acme/*")) is None
+        assert fanout.group_of(_ctx("acme/**,other/x")) is None
+
+    def test_glob_uses_cached_index(self) -> None:
+        requests: list[str] = []
+        client = _client(requests)
+
+        assert fanout.select_projects(client, _ctx("acme/*,other/x")) == ["acme/api", "acme/web", "other/x"]
+        assert fanout.select_projects(client, _ctx("acme/**")) == ["acme/api", "acme/web", "acme/infra/tf"]
+        assert requests.count("/projects") == 1
+
+    def test_projects_from_file(self, tmp_path) -> None:
+        path = tmp_path / "projects.txt"
+        path.write_text("# services\nacme/api\n\nacme/web\n")
+
+        assert fanout.select_projects(MagicMock(), _ctx(None, projects_from=str(path))) == ["acme/api", "acme/web"]
+
+
+class TestOutputFanout:
+    def test_merges_tagged_results_with_inline_errors(self, capsys) -> None:
+        client = _client([])
+
+        with pytest.raises(SystemExit) as exc_info:
+            fanout.output_fanout(client, "merge_requests", ctx=_ctx("acme/api,other/x"), format_fn=format_mr_list)
+
+        assert exc_info.value.code == EXIT_NOT_FOUND
+        items = json.loads(capsys.readouterr().out)["items"]
+        assert items[0] == {"project": "acme/api", "iid": 7, "title": "MR in acme/api"}
+        assert items[1]["project"] == "other/x"
+        assert items[1]["code"] == "not_found"
+
+    def test_where_fields_not_printed(self, capsys) -> None:
+        from qodev_gitlab_cli.query import Query
+
+        ctx = _ctx("acme/api,acme/web", fields=("iid",), query=Query.parse('title != "x"', sort="project"))
+        fanout.output_fanout(_client([]), "merge_requests", ctx=ctx, format_fn=format_mr_list)
+
+        items = json.loads(capsys.readouterr().out)["items"]
+        assert items == [{"project": "acme/api", "iid": 7}, {"project": "acme/web", "iid": 7}]
+
+    def test_group_endpoint_instead_of_fan_out(self, capsys) -> None:
+        requests: list[str] = []
+
+        fanout.output_fanout(_client(requests), "merge_requests", ctx=_ctx("acme/**"), format_fn=format_mr_list)
+
+        assert requests == ["/groups/acme/merge_requests"]
+        assert json.loads(capsys.readouterr().out)["items"][0]["project"] == "acme/web"
+
+    def test_no_group_endpoint_for_pipelines(self, capsys) -> None:
+        requests: list[str] = []
+
+        fanout.output_fanout(_client(requests), "pipelines", ctx=_ctx("acme/**"), format_fn=format_mr_list)
+
+        assert "/groups/acme/pipelines" not in requests
+        assert len(json.loads(capsys.readouterr().out)["items"]) == 3
+
+    def test_single_project_commands_reject_selection(self) -> None:
+        from qodev_gitlab_api.exceptions import ConfigurationError
+
+        with pytest.raises(ConfigurationError):
+            _ctx("acme/*").resolve_project()
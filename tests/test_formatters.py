@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from qodev_gitlab_cli.formatters.generic import _fmt, _get, detail_table, list_table
+from qodev_gitlab_cli.context import Context, using
+from qodev_gitlab_cli.formatters.generic import _fmt, _get, detail_table, list_table, select_fields
+from qodev_gitlab_cli.formatters.mrs import format_discussion_list
+from qodev_gitlab_cli.formatters.sync import format_sync_list
 
 
 class TestGet:
@@ -22,6 +25,30 @@ class TestGet:
         assert _get({"a": None}, "a.b") is None
 
 
+MR = {"iid": 1, "title": "T", "author": {"username": "dev", "name": "Dev"}, "labels": ["a"]}
+
+
+class TestSelectFields:
+    def test_nested_paths_keep_nesting(self) -> None:
+        result = select_fields(MR, ["iid", "author.username"])
+        assert result == {"iid": 1, "author": {"username": "dev"}}
+
+    def test_missing_becomes_none(self) -> None:
+        assert select_fields(MR, ["draft", "assignee.username"]) == {"draft": None, "assignee": {"username": None}}
+
+    def test_parent_selected_in_full(self) -> None:
+        assert select_fields(MR, ["author.username", "author"]) == {"author": MR["author"]}
+        assert select_fields(MR, ["author", "author.missing"]) == {"author": MR["author"]}
+        assert "missing" not in MR["author"]
+
+    def test_lists_and_error_records(self) -> None:
+        error = {"iid": 2, "error": "Not found", "code": "not_found"}
+        assert select_fields([MR, error], ["title"]) == [{"title": "T"}, error]
+
+    def test_no_fields_is_identity(self) -> None:
+        assert select_fields(MR, []) is MR
+
+
 class TestFmt:
     def test_none(self) -> None:
         assert _fmt(None) == ""
@@ -90,3 +117,33 @@ class TestListTable:
         result = list_table(items, [("ID", "id")], title="Items", total=50, page=2)
         assert "page 2" in result
         assert "50 total" in result
+
+    def test_plain_formats_skip_markdown(self) -> None:
+        items = [{"iid": 1, "project": "g/a"}, {"iid": 2, "project": "g/b"}]
+        with using(Context(output_format="tsv")):
+            result = list_table(items, [("IID", "iid")], title="Items")
+        assert result == "Project\tIID\ng/a\t1\ng/b\t2"
+
+    def test_project_column_not_repeated(self) -> None:
+        items = [{"project": "g/a", "issues": 3}]
+        with using(Context(output_format="tsv")):
+            result = format_sync_list(items)
+        assert result.splitlines()[0].split("\t")[:2] == ["Project", "Issues"]
+        assert result.splitlines()[0].count("Project") == 1
+
+    def test_fields_replace_columns(self) -> None:
+        items = [{"iid": 1, "title": "A", "author": {"username": "dev"}}]
+        with using(Context(output_format="tsv", fields=("iid", "author.username"))):
+            result = list_table(items, [("Title", "title")])
+        assert result == "iid\tauthor.username\n1\tdev"
+
+    def test_fields_with_derived_rows(self) -> None:
+        discussions = [{"id": "a", "individual_note": True, "notes": [{"body": "hi", "author": {"name": "Dev"}}]}]
+        with using(Context(output_format="tsv", fields=("id", "individual_note"))):
+            result = format_discussion_list(discussions)
+        assert result == "id\tindividual_note\na\tYes"
+
+    def test_plain_detail(self) -> None:
+        with using(Context(output_format="table")):
+            result = detail_table({"iid": 3, "title": ""}, [("IID", "iid"), ("Title", "title")], title="MR")
+        assert result.splitlines() == ["Field  Value", "-----  -----", "IID    3"]
@@ -0,0 +1,109 @@
+"""Tests for GraphQL enrichment."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli.api import Page
+from qodev_gitlab_cli.graphql import GraphQLError, enrich_mr_pages, enrich_mrs, query
+
+
+def _client(handler) -> MagicMock:
+    client = MagicMock()
+    client.client = httpx.Client(base_url="https://gitlab.example.com/api/v4", transport=httpx.MockTransport(handler))
+    return client
+
+
+def _node(iid: str, **fields: object) -> dict:
+    return {
+        "iid": iid,
+        "conflicts": False,
+        "resolvableDiscussionsCount": 3,
+        "resolvedDiscussionsCount": 1,
+        "approvedBy": {"count": 2},
+        "headPipeline": {"status": "RUNNING"},
+        **fields,
+    }
+
+
+class TestQuery:
+    def test_posts_to_graphql_endpoint(self) -> None:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"data": {"ok": True}})
+
+        assert query(_client(handler), "query { ok }") == {"ok": True}
+        assert seen[0].method == "POST"
+        assert seen[0].url.path == "/api/graphql"
+
+    def test_errors_without_data_raise(self) -> None:
+        client = _client(lambda request: httpx.Response(200, json={"errors": [{"message": "nope"}]}))
+        with pytest.raises(GraphQLError, match="nope"):
+            query(client, "query { x }")
+
+
+class TestEnrichMrs:
+    def test_one_query_for_all_projects(self) -> None:
+        documents: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            documents.append(json.loads(request.content)["query"])
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "p0": {"mergeRequests": {"nodes": [_node("1"), _node("2", conflicts=True, headPipeline=None)]}},
+                        "p1": {"mergeRequests": {"nodes": [_node("1", approvedBy={"count": 0})]}},
+                    }
+                },
+            )
+
+        items = [
+            {"iid": 1, "references": {"full": "g/a!1"}},
+            {"iid": 2, "references": {"full": "g/a!2"}},
+            {"iid": 1, "project": "g/b"},
+        ]
+
+        enriched = enrich_mrs(_client(handler), items)
+
+        assert len(documents) == 1
+        assert 'project(fullPath: "g/a")' in documents[0]
+        assert 'mergeRequests(iids: ["1", "2"]' in documents[0]
+        assert enriched[0] == {
+            **items[0],
+            "head_pipeline_status": "running",
+            "approval_count": 2,
+            "unresolved_discussions": 2,
+            "has_conflicts": False,
+        }
+        assert enriched[1]["has_conflicts"] is True
+        assert enriched[1]["head_pipeline_status"] is None
+        assert enriched[2]["approval_count"] == 0
+
+    def test_failure_leaves_items_unchanged(self, caplog) -> None:
+        client = _client(lambda request: httpx.Response(500, text="boom"))
+        items = [{"iid": 1, "references": {"full": "g/a!1"}}]
+
+        assert enrich_mrs(client, items) == items
+        assert "Could not enrich" in caplog.text
+
+    def test_pages_are_enriched_one_query_each(self) -> None:
+        calls: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(200, json={"data": {"p0": {"mergeRequests": {"nodes": [_node("5")]}}}})
+
+        pages = [Page(items=[{"iid": 5}], page=1, per_page=1), Page(items=[{"iid": 6}], page=2, per_page=1)]
+
+        result = list(enrich_mr_pages(_client(handler), pages, project="g/a"))
+
+        assert len(calls) == 2
+        assert result[0].items[0]["approval_count"] == 2
+        assert result[1].page == 2
@@ -0,0 +1,198 @@
+"""Tests for the local mirror (`sync` and `--offline`)."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli.api import paginate
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.mirror import OfflineTransport, sync
+from qodev_gitlab_cli.query import Query
+
+PROJECT = {"id": 7, "path_with_namespace": "g/p", "name": "p"}
+
+
+def _issuable(iid: int, updated_at: str, **extra: Any) -> dict[str, Any]:
+    return {
+        "id": 100 + iid,
+        "iid": iid,
+        "title": f"Item {iid}",
+        "state": "opened",
+        "labels": [],
+        "author": {"username": "a"},
+        "created_at": f"2024-01-0{iid}T00:00:00Z",
+        "updated_at": updated_at,
+        **extra,
+    }
+
+
+class FakeGitLab:
+    """httpx.MockTransport handler serving one project's lists with `updated_after` support."""
+
+    def __init__(self) -> None:
+        self.calls: list[httpx.Request] = []
+        self.data: dict[str, list[dict[str, Any]]] = {
+            "issues": [_issuable(1, "2024-02-01T00:00:00Z", labels=["bug"]), _issuable(2, "2024-02-02T00:00:00Z")],
+            "merge_requests": [_issuable(3, "2024-02-03T00:00:00Z", state="merged")],
+            "pipelines": [{"id": 9, "status": "success", "ref": "main", "updated_at": "2024-02-04T00:00:00Z"}],
+            "releases": [{"tag_name": "v1.0", "name": "One", "released_at": "2024-02-05T00:00:00Z"}],
+        }
+        self.notes: dict[int, list[dict[str, Any]]] = {1: [{"id": 50, "body": "hi", "created_at": "2024-02-01"}]}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        segments = request.url.raw_path.decode().split("?")[0].split("/api/v4/")[1].split("/")
+        if segments == ["projects", "g%2Fp"]:
+            return httpx.Response(200, json=PROJECT)
+        if segments[-1] == "notes":
+            return httpx.Response(200, json=self.notes.get(int(segments[3]), []), headers={"X-Total-Pages": "1"})
+        items = self.data[segments[2]]
+        after = request.url.params.get("updated_after")
+        if after:
+            items = [item for item in items if item["updated_at"] >= after]
+        return httpx.Response(200, json=items, headers={"X-Total": str(len(items)), "X-Total-Pages": "1"})
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("QODEV_GITLAB_CACHE_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def server() -> FakeGitLab:
+    return FakeGitLab()
+
+
+@pytest.fixture
+def mirror_ctx() -> Context:
+    return Context()
+
+
+@pytest.fixture
+def client(server: FakeGitLab, mirror_ctx: Context) -> SimpleNamespace:
+    transport = OfflineTransport(httpx.MockTransport(server), mirror_ctx)
+    return SimpleNamespace(
+        client=httpx.Client(
+            base_url="https://gl.example.com/api/v4", transport=transport, headers={"PRIVATE-TOKEN": "t"}
+        )
+    )
+
+
+def _offline(client: SimpleNamespace, mirror_ctx: Context, server: FakeGitLab) -> httpx.Client:
+    mirror_ctx.offline = True
+    server.calls.clear()
+    return client.client
+
+
+class TestSync:
+    def test_initial_sync(self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context) -> None:
+        result = sync(client, "g/p", ctx=mirror_ctx)
+
+        assert {k: result[k] for k in ("project", "issues", "merge_requests", "pipelines", "releases", "notes")} == {
+            "project": "g/p",
+            "issues": 2,
+            "merge_requests": 1,
+            "pipelines": 1,
+            "releases": 1,
+            "notes": 1,
+        }
+        assert all("updated_after" not in call.url.params for call in server.calls)
+
+    def test_incremental_sync_uses_cursor(
+        self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context
+    ) -> None:
+        sync(client, "g/p", ctx=mirror_ctx)
+        server.data["issues"][0] = _issuable(1, "2024-03-01T00:00:00Z", title="Renamed")
+        server.notes[1].append({"id": 51, "body": "again", "created_at": "2024-03-01"})
+        server.calls.clear()
+
+        result = sync(client, "g/p", ctx=mirror_ctx)
+
+        issues_call = next(call for call in server.calls if call.url.path.endswith("/issues"))
+        assert issues_call.url.params["updated_after"] == "2024-02-02T00:00:00Z"
+        # The boundary record is re-fetched (inclusive filter) along with the changed one.
+        assert (result["issues"], result["merge_requests"], result["notes"]) == (2, 1, 2)
+
+        http = _offline(client, mirror_ctx, server)
+        assert http.get("/projects/g%2Fp/issues/1").json()["title"] == "Renamed"
+        assert [note["id"] for note in http.get("/projects/g%2Fp/issues/1/notes").json()] == [51, 50]
+
+    def test_full_sync_drops_deleted(self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context) -> None:
+        sync(client, "g/p", ctx=mirror_ctx)
+        del server.data["issues"][1]
+        sync(client, "g/p", ctx=mirror_ctx, full=True)
+
+        http = _offline(client, mirror_ctx, server)
+        assert [item["iid"] for item in http.get("/projects/g%2Fp/issues").json()] == [1]
+
+    def test_bypass_cache(self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context) -> None:
+        sync(client, "g/p", ctx=mirror_ctx, bypass_cache=True)
+
+        lists = [call for call in server.calls if call.url.raw_path != b"/api/v4/projects/g%2Fp"]
+        assert lists
+        assert {call.headers.get("cache-control") for call in lists} == {"no-store"}
+
+
+class TestOffline:
+    @pytest.fixture(autouse=True)
+    def synced(self, client: SimpleNamespace, mirror_ctx: Context) -> None:
+        sync(client, "g/p", ctx=mirror_ctx)
+
+    def test_list_filters_and_pages(self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context) -> None:
+        http = _offline(client, mirror_ctx, server)
+
+        response = http.get("/projects/g%2Fp/issues", params={"state": "opened", "per_page": 1, "page": 1})
+        assert [item["iid"] for item in response.json()] == [2]
+        assert (response.headers["x-total"], response.headers["x-total-pages"], response.headers["x-next-page"]) == (
+            "2",
+            "2",
+            "2",
+        )
+        labelled = http.get("/projects/7/issues", params={"labels": "bug", "updated_after": "2024-01-15"})
+        assert [item["iid"] for item in labelled.json()] == [1]
+        assert http.get("/projects/g%2Fp/merge_requests", params={"state": "opened"}).json() == []
+        assert server.calls == []
+
+    def test_paginate_with_query(self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context) -> None:
+        _offline(client, mirror_ctx, server)
+        mirror_ctx.query = Query.parse('"bug" in labels')
+        mirror_ctx.fields = ("iid",)
+
+        pages = list(paginate(client, "/projects/g%2Fp/issues", {"state": "all"}, ctx=mirror_ctx))
+
+        assert pages[0].items == [{"iid": 1, "labels": ["bug"]}]
+        assert server.calls == []
+
+    def test_get_and_missing(self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context) -> None:
+        http = _offline(client, mirror_ctx, server)
+
+        assert http.get("/projects/g%2Fp/merge_requests/3").json()["state"] == "merged"
+        assert http.get("/projects/g%2Fp/releases/v1.0").json()["name"] == "One"
+        assert http.get("/projects/g%2Fp").json() == PROJECT
+        assert http.get("/projects/g%2Fp/merge_requests/99").status_code == 404
+        assert http.get("/projects/g%2Fp/merge_requests/3/discussions").status_code == 504
+        assert http.get("/projects/other%2Fp/issues").status_code == 504
+        assert http.post("/projects/g%2Fp/issues", json={"title": "x"}).status_code == 504
+        assert server.calls == []
+
+    def test_releases_list_command(
+        self, client: SimpleNamespace, server: FakeGitLab, mirror_ctx: Context, capsys
+    ) -> None:
+        import qodev_gitlab_cli.context as _ctx
+
+        _offline(client, mirror_ctx, server)
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="g/p", limit=20, page=1, offline=True)
+        with patch.object(_ctx.ctx, "client", return_value=client):
+            from qodev_gitlab_cli.commands.releases import list
+
+            list()
+
+        data = json.loads(capsys.readouterr().out)
+        assert ([item["tag_name"] for item in data["items"]], data["total"]) == (["v1.0"], 1)
+        assert server.calls == []
@@ -2,9 +2,22 @@
 
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator
 from datetime import datetime
 
-from qodev_gitlab_cli.output import generic_markdown, md_table, serialize
+from qodev_gitlab_cli.api import Page
+from qodev_gitlab_cli.context import Context, using
+from qodev_gitlab_cli.formatters.generic import list_table
+from qodev_gitlab_cli.output import (
+    PlainText,
+    generic_markdown,
+    md_table,
+    output_list,
+    output_pages,
+    plain_table,
+    serialize,
+)
 
 
 class TestSerialize:
@@ -65,3 +78,91 @@ class TestGenericMarkdown:
 
     def test_string(self) -> None:
         assert generic_markdown("hello") == "hello"
+
+
+class TestNdjson:
+    def _ctx(self, **kwargs: object) -> Context:
+        ctx = Context()
+        ctx.configure(
+            json_mode=False, token=None, base_url=None, project=None, limit=2, page=1, output_format="ndjson", **kwargs
+        )
+        return ctx
+
+    def test_format_implies_json_mode(self) -> None:
+        assert self._ctx().json_mode is True
+
+    def test_items_then_meta(self, capsys) -> None:
+        pages = [Page(items=[{"id": 1}, {"id": 2}], page=1, per_page=2, total=5, total_pages=3, next_page=2)]
+
+        output_pages(pages, ctx=self._ctx(), format_fn=None)
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert lines[:2] == [{"id": 1}, {"id": 2}]
+        meta = lines[2]["_meta"]
+        assert (meta["count"], meta["pages"], meta["total"], meta["next_page"]) == (2, 1, 5, 2)
+        assert "elapsed" in meta
+
+    def test_streams_each_page_before_the_next_is_fetched(self, capsys) -> None:
+        seen: list[str] = []
+
+        def pages() -> Iterator[Page]:
+            yield Page(items=[{"id": 1}], page=1, per_page=1, next_page=2)
+            seen.append(capsys.readouterr().out)
+            yield Page(items=[{"id": 2}], page=2, per_page=1)
+
+        output_pages(pages(), ctx=self._ctx(all_pages=True), format_fn=None, transform=lambda i: {"n": i["id"]})
+
+        assert seen == ['{"n":1}\n']
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == '{"n":2}'
+        assert json.loads(lines[1])["_meta"]["total"] == 2
+
+
+class TestJsonList:
+    def _ctx(self, compact: bool) -> Context:
+        ctx = Context()
+        ctx.configure(json_mode=True, token=None, base_url=None, project=None, limit=2, page=1, compact=compact)
+        return ctx
+
+    def test_indented(self, capsys) -> None:
+        output_list(items=[{"id": 1}], total=1, ctx=self._ctx(False), format_fn=None)
+        out = capsys.readouterr().out
+        assert out.startswith('{\n  "items": [\n    {\n      "id": 1\n    }\n  ],')
+        assert json.loads(out)["total"] == 1
+
+    def test_compact(self, capsys) -> None:
+        output_list(items=[{"id": 1}], total=1, ctx=self._ctx(True), format_fn=None)
+        assert capsys.readouterr().out == '{"items":[{"id":1}],"total":1,"page":1,"limit":25}\n'
+
+
+class TestPlainTable:
+    def test_aligned_columns(self) -> None:
+        text = plain_table([["1", "Fix bug"], ["22", "Add\nfeature"]], ["IID", "Title"])
+        assert isinstance(text, PlainText)
+        assert text.splitlines() == ["IID  Title", "---  -----------", "1    Fix bug", "22   Add feature"]
+
+    def test_long_cells_truncated(self) -> None:
+        row = plain_table([["x" * 100, "y" * 100]], ["Title", "URL"]).splitlines()[2]
+        title, url = row.split("  ")
+        assert len(title) == 60
+        assert title.endswith("…")
+        assert url == "y" * 100
+
+    def test_tsv(self) -> None:
+        text = plain_table([["1", "a\tb"]], ["IID", "Title"], tsv=True)
+        assert text == "IID\tTitle\n1\ta b"
+
+    def test_list_hint_goes_to_stderr(self, capsys) -> None:
+        ctx = Context(output_format="table")
+        with using(ctx):
+            output_list(
+                items=[{"iid": 1}],
+                total=5,
+                page=1,
+                limit=1,
+                ctx=ctx,
+                format_fn=lambda items, **_: list_table(items, [("IID", "iid")]),
+            )
+        captured = capsys.readouterr()
+        assert captured.out == "IID\n---\n1\n"
+        assert "--page 2" in captured.err
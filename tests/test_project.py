@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+import shutil
+import subprocess
 from unittest.mock import patch
 
-from qodev_gitlab_cli.project import _parse_project_path, detect_project_from_git
+import pytest
+
+from qodev_gitlab_cli.project import (
+    _get_remote_url,
+    _NeedsGit,
+    _parse_project_path,
+    _read_current_branch,
+    _read_remote_url,
+    detect_project_from_git,
+)
 
 
 class TestParseProjectPath:
@@ -37,20 +48,101 @@ class TestParseProjectPath:
 
 
 class TestDetectProjectFromGit:
-    def test_no_git_root(self) -> None:
-        with patch("qodev_gitlab_cli.project._find_git_root", return_value=None):
+    def test_fallback_no_git_root(self) -> None:
+        with (
+            patch("qodev_gitlab_cli.project._read_remote_url", side_effect=_NeedsGit("exotic")),
+            patch("qodev_gitlab_cli.project._find_git_root", return_value=None),
+        ):
             assert detect_project_from_git() is None
 
-    def test_no_remote(self) -> None:
+    def test_fallback_no_remote(self) -> None:
         with (
+            patch("qodev_gitlab_cli.project._read_remote_url", side_effect=_NeedsGit("exotic")),
             patch("qodev_gitlab_cli.project._find_git_root", return_value="/tmp/repo"),
             patch("qodev_gitlab_cli.project._get_remote_url", return_value=None),
         ):
             assert detect_project_from_git() is None
 
-    def test_full_detection(self) -> None:
+    def test_fallback_full_detection(self) -> None:
         with (
+            patch("qodev_gitlab_cli.project._read_remote_url", side_effect=_NeedsGit("exotic")),
             patch("qodev_gitlab_cli.project._find_git_root", return_value="/tmp/repo"),
             patch("qodev_gitlab_cli.project._get_remote_url", return_value="git@gitlab.com:ns/proj.git"),
         ):
             assert detect_project_from_git() == "ns/proj"
+
+    def test_pure_python_detection(self, git_repo, monkeypatch) -> None:
+        monkeypatch.chdir(git_repo / "src")
+        with patch("qodev_gitlab_cli.project._find_git_root") as find_root:
+            assert detect_project_from_git() == "ns/proj"
+            find_root.assert_not_called()
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    """Minimal on-disk repository layout with an origin remote."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    git_dir = tmp_path / "repo" / ".git"
+    git_dir.mkdir(parents=True)
+    (tmp_path / "repo" / "src").mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/feature/x\n")
+    (git_dir / "config").write_text(
+        "[core]\n\tbare = false\n"
+        '[remote "origin"]\n\turl = git@gitlab.com:ns/proj.git  # primary\n'
+        "\tfetch = +refs/heads/*:refs/remotes/origin/*\n"
+    )
+    return tmp_path / "repo"
+
+
+class TestPureResolver:
+    def test_remote_url(self, git_repo) -> None:
+        assert _read_remote_url(str(git_repo / "src"), "origin") == "git@gitlab.com:ns/proj.git"
+
+    def test_missing_remote(self, git_repo) -> None:
+        assert _read_remote_url(str(git_repo), "upstream") is None
+
+    def test_not_a_repo(self, tmp_path) -> None:
+        assert _read_remote_url(str(tmp_path), "origin") is None
+
+    def test_current_branch(self, git_repo) -> None:
+        assert _read_current_branch(str(git_repo)) == "feature/x"
+
+    def test_detached_head(self, git_repo) -> None:
+        (git_repo / ".git" / "HEAD").write_text("0123456789abcdef0123456789abcdef01234567\n")
+        assert _read_current_branch(str(git_repo)) == "HEAD"
+
+    def test_worktree_gitdir_file(self, git_repo, tmp_path) -> None:
+        wt_git = git_repo / ".git" / "worktrees" / "wt"
+        wt_git.mkdir(parents=True)
+        (wt_git / "commondir").write_text("../..\n")
+        (wt_git / "HEAD").write_text("ref: refs/heads/other\n")
+        worktree = tmp_path / "wt"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {wt_git}\n")
+        assert _read_remote_url(str(worktree), "origin") == "git@gitlab.com:ns/proj.git"
+        assert _read_current_branch(str(worktree)) == "other"
+
+    def test_config_reparsed_when_modified(self, git_repo) -> None:
+        assert _read_remote_url(str(git_repo), "origin") == "git@gitlab.com:ns/proj.git"
+        (git_repo / ".git" / "config").write_text('[remote "origin"]\n\turl = https://gitlab.com/other/repo.git\n')
+        assert _read_remote_url(str(git_repo), "origin") == "https://gitlab.com/other/repo.git"
+
+    def test_insteadof_needs_git(self, git_repo) -> None:
+        with (git_repo / ".git" / "config").open("a") as f:
+            f.write('[url "git@gitlab.com:"]\n\tinsteadOf = gl:\n')
+        with pytest.raises(_NeedsGit):
+            _read_remote_url(str(git_repo), "origin")
+
+    def test_git_dir_env_needs_git(self, git_repo, monkeypatch) -> None:
+        monkeypatch.setenv("GIT_DIR", str(git_repo / ".git"))
+        with pytest.raises(_NeedsGit):
+            _read_remote_url(str(git_repo), "origin")
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_matches_git_cli(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setenv("HOME", str(tmp_path))
+        repo = tmp_path / "real"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        subprocess.run(["git", "remote", "add", "origin", "https://gitlab.com/a/b.git"], cwd=repo, check=True)
+        assert _read_remote_url(str(repo), "origin") == _get_remote_url(str(repo)) == "https://gitlab.com/a/b.git"
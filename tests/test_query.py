@@ -0,0 +1,142 @@
+"""Tests for --where/--sort/--top."""
+
+from __future__ import annotations
+
+import pytest
+
+from qodev_gitlab_cli.api import Page
+from qodev_gitlab_cli.query import Query, QueryError
+
+MRS = [
+    {"iid": 1, "state": "opened", "author": {"username": "a"}, "labels": ["bug"], "updated_at": "2024-03-01"},
+    {"iid": 2, "state": "merged", "author": {"username": "b"}, "labels": [], "updated_at": "2024-01-01"},
+    {"iid": 3, "state": "opened", "author": {"username": "c"}, "labels": ["bug", "ui"], "updated_at": None},
+    {"iid": 4, "state": "opened", "author": None, "labels": ["ui"], "updated_at": "2024-02-01"},
+]
+
+
+def _iids(query: Query | None, items: list[dict] = MRS) -> list[int]:
+    assert query is not None
+    return [item["iid"] for item in query.apply(items)]
+
+
+class TestWhere:
+    @pytest.mark.parametrize(
+        ("expression", "expected"),
+        [
+            ('state == "opened" and author.username in ["a", "b", "c"]', [1, 3]),
+            ('"ui" in labels or iid == 2', [2, 3, 4]),
+            ('not state == "opened"', [2]),
+            ('updated_at >= "2024-02-01"', [1, 4]),
+            ("author == null", [4]),
+            ("labels and iid < 4", [1, 3]),
+            ('author.username not in ("a",)', [2, 3, 4]),
+            ("1 < iid <= 3", [2, 3]),
+        ],
+    )
+    def test_expressions(self, expression: str, expected: list[int]) -> None:
+        assert _iids(Query.parse(expression)) == expected
+
+    def test_fields_read(self) -> None:
+        query = Query.parse('state == "opened" and author.username == "a"', sort="-updated_at")
+        assert query is not None
+        assert query.fields == ("state", "author.username", "updated_at")
+
+    @pytest.mark.parametrize("expression", ["state ==", "__import__('os')", "labels[0] == 'x'", "iid + 1 > 2"])
+    def test_rejects_invalid(self, expression: str) -> None:
+        with pytest.raises(QueryError):
+            Query.parse(expression)
+
+    def test_error_records_pass(self) -> None:
+        error = {"project": "g/p", "error": "Not found", "code": "not_found"}
+        query = Query.parse('state == "merged"')
+        assert query is not None
+        assert query.apply([*MRS, error]) == [MRS[1], error]
+
+
+class TestSortTop:
+    def test_sort_descending_missing_last(self) -> None:
+        assert _iids(Query.parse(sort="-updated_at")) == [1, 4, 2, 3]
+
+    def test_multiple_keys(self) -> None:
+        assert _iids(Query.parse(sort="state,-iid")) == [2, 4, 3, 1]
+
+    def test_top(self) -> None:
+        assert _iids(Query.parse(sort="iid", top=2)) == [1, 2]
+
+    def test_top_without_sort_stops_fetching(self) -> None:
+        fetched: list[int] = []
+
+        def pages():
+            for number in (1, 2, 3):
+                fetched.append(number)
+                yield Page(items=MRS, page=number, per_page=4, total=12, next_page=number + 1)
+
+        query = Query.parse('state == "opened"', top=4)
+        assert query is not None
+        result = list(query.filter_pages(pages()))
+
+        assert [len(page.items) for page in result] == [3, 1]
+        assert fetched == [1, 2]
+        assert (result[-1].total, result[-1].next_page) == (None, None)
+
+    def test_top_must_be_positive(self) -> None:
+        with pytest.raises(QueryError):
+            Query.parse(top=0)
+
+
+class TestProject:
+    def test_drops_query_only_fields(self) -> None:
+        query = Query.parse('author.username == "a" and state == "opened"', sort="-updated_at")
+        assert query is not None
+        items = [
+            {"iid": 1, "author": {"name": "A", "username": "a"}, "state": "opened", "updated_at": "2024"},
+            {"project": "g/p", "error": "Not found", "code": "not_found"},
+        ]
+
+        assert query.project(items, ("iid", "author.name")) == [
+            {"iid": 1, "author": {"name": "A"}},
+            {"project": "g/p", "error": "Not found", "code": "not_found"},
+        ]
+        assert query.project(items, ("iid", "state")) == [{"iid": 1, "state": "opened"}, items[1]]
+        assert query.project(items, ()) == items
+
+
+class TestPushdown:
+    def test_issuable_params(self) -> None:
+        query = Query.parse(
+            'state == "merged" and "bug" in labels and author.username == "a" and updated_at > "2024-01-01" '
+            'and created_at <= "2024-06-01" and iid > 3'
+        )
+        assert query is not None
+        assert query.pushdown("/projects/g%2Fp/merge_requests", {"labels": "ui"}) == {
+            "state": "merged",
+            "labels": "ui,bug",
+            "author_username": "a",
+            "updated_after": "2024-01-01",
+            "created_before": "2024-06-01",
+        }
+
+    def test_overrides_unset_and_all(self) -> None:
+        query = Query.parse('state == "opened" and status == "failed"')
+        assert query is not None
+        assert query.pushdown("/projects/1/merge_requests", {"state": "all"}) == {"state": "opened"}
+        assert query.pushdown("/projects/1/merge_requests", {"state": "opened"}) == {"state": "opened"}
+        assert query.pushdown("/projects/1/pipelines", {"status": None}) == {"status": "failed"}
+
+    def test_conflicting_param_set_by_command(self) -> None:
+        query = Query.parse('state == "opened"')
+        assert query is not None
+        with pytest.raises(QueryError, match="contradicts"):
+            query.pushdown("/projects/1/merge_requests", {"state": "closed"})
+
+    def test_only_top_level_and(self) -> None:
+        query = Query.parse('state == "merged" or state == "closed"')
+        assert query is not None
+        assert query.pushdown("/projects/1/merge_requests") == {}
+
+    def test_unknown_resource(self) -> None:
+        query = Query.parse('status == "failed"')
+        assert query is not None
+        assert query.pushdown("/projects/1/pipelines") == {"status": "failed"}
+        assert query.pushdown("/projects/1/releases") == {}
@@ -0,0 +1,116 @@
+"""Tests for rate-limit pacing and 429/503 retries."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli import ratelimit
+from qodev_gitlab_cli.api import raise_for_status
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.errors import EXIT_RATE_LIMITED, classify_error
+from qodev_gitlab_cli.output import error
+from qodev_gitlab_cli.ratelimit import RateLimiter, RateLimitTransport
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch) -> list[float]:
+    monkeypatch.setattr(ratelimit, "_registry", {})
+    monkeypatch.setattr(ratelimit, "_last_updated", None)
+    recorded: list[float] = []
+    monkeypatch.setattr(ratelimit.time, "sleep", recorded.append)
+    return recorded
+
+
+def _client(responses: list[httpx.Response], calls: list[httpx.Request]) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    return httpx.Client(
+        base_url="https://gl.example.com/api/v4", transport=RateLimitTransport(httpx.MockTransport(handler))
+    )
+
+
+def _headers(remaining: int, reset_in: float = 30, limit: int = 100) -> dict[str, str]:
+    reset = str(int(time.time() + reset_in))
+    return {"RateLimit-Limit": str(limit), "RateLimit-Remaining": str(remaining), "RateLimit-Reset": reset}
+
+
+class TestRateLimiter:
+    def test_no_wait_with_budget(self, sleeps: list[float]) -> None:
+        limiter = RateLimiter("gl")
+        limiter.update(httpx.Response(200, headers=_headers(90)))
+        assert limiter.acquire() == 0
+        assert sleeps == []
+
+    def test_paces_low_budget_across_callers(self, sleeps: list[float]) -> None:
+        limiter = RateLimiter("gl")
+        limiter.update(httpx.Response(200, headers=_headers(10, reset_in=30)))
+
+        waits = [limiter.acquire() for _ in range(3)]
+
+        # Roughly 30s / 10 requests apart, and each caller gets a later slot.
+        assert waits[0] == 0
+        assert 2 < waits[1] < 4
+        assert waits[2] > waits[1]
+
+    def test_exhausted_budget_waits_for_reset(self) -> None:
+        limiter = RateLimiter("gl")
+        limiter.update(httpx.Response(200, headers=_headers(0, reset_in=5)))
+        assert 3 < limiter.acquire() <= 5
+
+    def test_budget(self) -> None:
+        limiter = RateLimiter("gl")
+        limiter.update(httpx.Response(200, headers=_headers(42)))
+        budget = limiter.budget()
+        assert (budget["limit"], budget["remaining"], budget["retry_after"]) == (100, 42, None)
+        assert 0 < budget["reset_in"] <= 30
+
+
+class TestRateLimitTransport:
+    def test_retries_429_after_retry_after(self, sleeps: list[float]) -> None:
+        calls: list[httpx.Request] = []
+        responses = [httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, json={"ok": True})]
+
+        response = _client(responses, calls).post("/projects/1/merge_requests", json={"title": "x"})
+
+        assert response.json() == {"ok": True}
+        assert len(calls) == 2
+        assert calls[1].content == calls[0].content
+        assert 6 < sleeps[0] <= 7
+
+    def test_503_retried_with_backoff_for_get_only(self, sleeps: list[float]) -> None:
+        calls: list[httpx.Request] = []
+        client = _client([httpx.Response(503), httpx.Response(503), httpx.Response(200)], calls)
+        assert client.get("/projects").status_code == 200
+        assert len(calls) == 3
+        assert sleeps[1] > sleeps[0]
+
+        for method, path in (("POST", "/projects/1/pipeline"), ("PUT", "/projects/1/merge_requests/2/merge")):
+            calls.clear()
+            client = _client([httpx.Response(503)], calls)
+            assert client.request(method, path).status_code == 503
+            assert len(calls) == 1
+
+    def test_gives_up_and_reports_rate_limited(self, capsys) -> None:
+        calls: list[httpx.Request] = []
+        response = _client([httpx.Response(429, headers={"Retry-After": "1", **_headers(0)})], calls).get("/projects")
+
+        assert len(calls) == ratelimit.MAX_RETRIES + 1
+        with pytest.raises(Exception) as excinfo:
+            raise_for_status(response)
+        assert classify_error(excinfo.value) == ("rate_limited", EXIT_RATE_LIMITED)
+
+        with pytest.raises(SystemExit):
+            error("rate limited", ctx=Context(json_mode=True), code="rate_limited", exit_code=EXIT_RATE_LIMITED)
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["rate_limit"]["host"] == "gl.example.com"
+        assert payload["rate_limit"]["remaining"] == 0
+
+    def test_hosts_have_separate_budgets(self) -> None:
+        assert ratelimit.limiter_for("a.example.com") is not ratelimit.limiter_for("b.example.com")
+        assert ratelimit.limiter_for("a.example.com") is ratelimit.limiter_for("a.example.com")
@@ -0,0 +1,158 @@
+"""Tests for retries of transient failures and hedged GETs."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli import ratelimit, retry
+from qodev_gitlab_cli.context import Context
+from qodev_gitlab_cli.retry import LatencyWindow, RetryTransport, backoff
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch) -> list[float]:
+    monkeypatch.setattr(retry, "_registry", {})
+    monkeypatch.setattr(ratelimit, "_registry", {})
+    recorded: list[float] = []
+    monkeypatch.setattr(retry.time, "sleep", recorded.append)
+    return recorded
+
+
+def _client(handler: Handler, *, retries: int = 3, hedge: bool = False) -> httpx.Client:
+    context = Context(retries=retries, hedge=hedge)
+    transport = RetryTransport(httpx.MockTransport(handler), context)
+    return httpx.Client(base_url="https://gl.example.com/api/v4", transport=transport)
+
+
+def _failing(failures: list[httpx.Response | Exception], calls: list[httpx.Request]) -> Handler:
+    """Fail with each of `failures` in turn, then answer 200."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return httpx.Response(200, json={"ok": True}, extensions={"qodev_retries": 1})
+
+    return handler
+
+
+class TestRetryTransport:
+    def test_retries_get_on_errors_and_5xx(self, sleeps: list[float]) -> None:
+        calls: list[httpx.Request] = []
+        failures: list[httpx.Response | Exception] = [
+            httpx.ReadError("connection reset"),
+            httpx.Response(502),
+            httpx.ReadTimeout("timed out"),
+        ]
+
+        response = _client(_failing(failures, calls)).get("/projects/1")
+
+        assert response.json() == {"ok": True}
+        assert len(calls) == 4
+        # Three retries here plus the one the rate limiter below reported.
+        assert response.extensions["qodev_retries"] == 4
+        assert len(sleeps) == 3
+        assert sleeps[0] <= 0.25 and sleeps[1] <= 0.5 and sleeps[2] <= 1.0
+
+    def test_gives_up_after_retries(self) -> None:
+        calls: list[httpx.Request] = []
+        failures: list[httpx.Response | Exception] = [httpx.Response(504)] * 5
+
+        response = _client(_failing(failures, calls), retries=2).get("/projects/1")
+
+        assert (response.status_code, len(calls), response.extensions["qodev_retries"]) == (504, 3, 2)
+
+    def test_disabled(self) -> None:
+        calls: list[httpx.Request] = []
+
+        with pytest.raises(httpx.ReadError):
+            _client(_failing([httpx.ReadError("reset")], calls), retries=0).get("/projects/1")
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize(
+        "failure", [httpx.Response(502), httpx.ReadTimeout("timed out"), httpx.RemoteProtocolError("closed")]
+    )
+    def test_never_resends_write(self, failure: httpx.Response | Exception) -> None:
+        calls: list[httpx.Request] = []
+        client = _client(_failing([failure], calls))
+
+        if isinstance(failure, Exception):
+            with pytest.raises(type(failure)):
+                client.put("/projects/1/merge_requests/2/merge")
+        else:
+            assert client.put("/projects/1/merge_requests/2/merge").status_code == 502
+        assert len(calls) == 1
+
+    def test_write_503_sent_once_through_rate_limiter(self) -> None:
+        calls: list[httpx.Request] = []
+        inner = ratelimit.RateLimitTransport(httpx.MockTransport(_failing([httpx.Response(503)], calls)))
+        transport = RetryTransport(inner, Context())
+
+        with httpx.Client(base_url="https://gl.example.com/api/v4", transport=transport) as client:
+            assert client.put("/projects/1/merge_requests/2/merge").status_code == 503
+        assert len(calls) == 1
+
+    def test_retries_write_that_was_not_sent(self) -> None:
+        calls: list[httpx.Request] = []
+
+        response = _client(_failing([httpx.ConnectError("refused")], calls)).post("/projects/1/issues", json={"a": 1})
+
+        assert response.status_code == 200
+        assert [call.content for call in calls] == [b'{"a":1}', b'{"a":1}']
+
+
+class TestHedging:
+    def test_latency_percentile(self) -> None:
+        window = LatencyWindow()
+        for ms in range(1, 20):
+            window.add(ms / 1000)
+        assert window.percentile(0.95) is None
+        window.add(0.02)
+        assert window.percentile(0.95) == 0.019
+
+    def test_slow_get_is_hedged(self, monkeypatch) -> None:
+        monkeypatch.setattr(retry, "HEDGE_MIN_DELAY", 0.0)
+        window = retry.latencies_for("gl.example.com")
+        for _ in range(20):
+            window.add(0.01)
+        release = threading.Event()
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                # The first request stalls until the test ends.
+                release.wait(5)
+                return httpx.Response(200, json={"attempt": 1})
+            return httpx.Response(200, json={"attempt": 2})
+
+        try:
+            response = _client(handler, hedge=True).get("/projects/1")
+        finally:
+            release.set()
+
+        assert response.json() == {"attempt": 2}
+        assert response.extensions["qodev_hedged"] is True
+        assert len(calls) == 2
+
+    def test_no_hedge_without_history(self) -> None:
+        calls: list[httpx.Request] = []
+
+        _client(_failing([], calls), hedge=True).get("/projects/1")
+
+        assert len(calls) == 1
+
+
+def test_backoff_is_capped_and_jittered() -> None:
+    delays = {backoff(attempt) for attempt in (10, 10, 10)}
+    assert all(retry.MAX_BACKOFF / 2 <= delay <= retry.MAX_BACKOFF for delay in delays)
+    assert 0.125 <= backoff(0) <= 0.25
@@ -0,0 +1,151 @@
+"""Tests for full-text search over the mirror."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli.mirror import Mirror, client_mirror_path
+from qodev_gitlab_cli.search import SearchError, match_expression, search
+
+
+def _item(iid: int, title: str, description: str = "", state: str = "opened") -> dict[str, Any]:
+    return {"iid": iid, "title": title, "description": description, "state": state, "updated_at": "2024-01-01"}
+
+
+@pytest.fixture
+def mirror(tmp_path) -> Iterator[Mirror]:
+    mirror = Mirror(str(tmp_path / "mirror.sqlite"))
+    issues = [
+        (_item(1, "Login fails behind proxy"), []),
+        (_item(2, "Update docs", "Mention the proxy settings"), []),
+        (_item(3, "Flaky test", state="closed"), [{"body": "The proxy timeout was the culprit"}]),
+        (_item(4, "Unrelated"), [{"body": "changed the description mentioning proxy", "system": True}]),
+        # Filler, so that "proxy" is a rare (and therefore meaningful) term for BM25.
+        *((_item(iid, f"Chore {iid}", "Routine maintenance"), []) for iid in range(10, 30)),
+    ]
+    with mirror.db:
+        for project_id in (1, 2):
+            mirror.upsert(project_id, "issues", [item for item, _ in issues])
+            for item, notes in issues:
+                mirror.index(project_id, "issues", item, notes)
+        mirror.upsert(1, "merge_requests", [_item(5, "Proxy support", state="merged")])
+        mirror.index(1, "merge_requests", _item(5, "Proxy support", state="merged"), [])
+    with mirror:
+        yield mirror
+
+
+def _iids(results: list[dict[str, Any]]) -> list[tuple[str, int]]:
+    return [(result["type"], result["iid"]) for result in results]
+
+
+class TestMatchExpression:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("proxy timeout", '"proxy" "timeout"'),
+            ('"exact phrase" logi*', '"exact phrase" "logi"*'),
+            ("a OR b OR", '"a" OR "b"'),
+            ("NEAR(x) -y:z", '"NEAR(x)" "-y:z"'),
+        ],
+    )
+    def test_quotes_terms(self, text: str, expected: str) -> None:
+        assert match_expression(text) == expected
+
+    def test_empty(self) -> None:
+        with pytest.raises(SearchError):
+            match_expression(' "" * ')
+
+
+class TestSearch:
+    def test_ranks_title_over_description_over_notes(self, mirror: Mirror) -> None:
+        results, total = search(mirror, "proxy", [1])
+
+        assert total == 4
+        assert _iids(results)[-2:] == [("issue", 2), ("issue", 3)]
+        assert {result["iid"] for result in results[:2]} == {1, 5}
+        assert results[0]["score"] > results[-1]["score"] > 0
+        assert "**proxy**" in results[-1]["snippet"]
+
+    def test_filters(self, mirror: Mirror) -> None:
+        assert _iids(search(mirror, "proxy", [1], kinds=("issues",), state="closed")[0]) == [("issue", 3)]
+        assert search(mirror, "proxy", [1, 2])[1] == 7
+        assert _iids(search(mirror, "prox*", [2], limit=1, offset=1)[0]) == [("issue", 2)]
+
+    def test_reindex_replaces_document(self, mirror: Mirror) -> None:
+        with mirror.db:
+            mirror.index(1, "issues", _item(1, "Login fails"), [])
+        assert 1 not in {result["iid"] for result in search(mirror, "proxy", [1])[0]}
+        assert search(mirror, "login", [1])[1] == 1
+
+    def test_reindex_missing(self, mirror: Mirror) -> None:
+        with mirror.db:
+            mirror.upsert(1, "issues", [_item(9, "Proxy crash")])
+            mirror.replace_notes(1, "issues", 9, [{"id": 1, "body": "stack trace attached"}])
+            assert mirror.reindex(1, "issues") == 1
+        assert _iids(search(mirror, "stack trace", [1])[0]) == [("issue", 9)]
+
+
+class TestSearchCommand:
+    def test_offline_json(self, tmp_path, monkeypatch, capsys) -> None:
+        monkeypatch.setenv("QODEV_GITLAB_CACHE_DIR", str(tmp_path))
+        client = SimpleNamespace(
+            client=httpx.Client(base_url="https://gl.example.com/api/v4", headers={"PRIVATE-TOKEN": "t"})
+        )
+        with Mirror(client_mirror_path(client)) as mirror:
+            mirror.save_project({"id": 7, "path_with_namespace": "g/p"})
+            with mirror.db:
+                mirror.upsert(7, "issues", [_item(1, "Proxy crash"), _item(2, "Other")])
+                mirror.reindex(7, "issues")
+
+        import qodev_gitlab_cli.context as _ctx
+
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="g/p", limit=20, page=1, offline=True)
+        with patch.object(_ctx.ctx, "client", return_value=client):
+            from qodev_gitlab_cli.commands.search import search as search_command
+
+            search_command("proxy")
+
+        data = json.loads(capsys.readouterr().out)
+        assert data["total"] == 1
+        assert (data["items"][0]["type"], data["items"][0]["iid"]) == ("issue", 1)
+
+    def test_searches_mirror_as_is(self, tmp_path, monkeypatch, capsys) -> None:
+        monkeypatch.setenv("QODEV_GITLAB_CACHE_DIR", str(tmp_path))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError(f"unexpected request to {request.url}")
+
+        client = SimpleNamespace(
+            client=httpx.Client(
+                base_url="https://gl.example.com/api/v4",
+                headers={"PRIVATE-TOKEN": "t"},
+                transport=httpx.MockTransport(handler),
+            )
+        )
+        with Mirror(client_mirror_path(client)) as mirror:
+            mirror.save_project({"id": 7, "path_with_namespace": "g/p"})
+            with mirror.db:
+                mirror.upsert(7, "issues", [_item(1, "Proxy crash")])
+                mirror.reindex(7, "issues")
+                mirror.db.execute("UPDATE projects SET synced_at = ?", (time.time() - 3 * 3600,))
+
+        import qodev_gitlab_cli.context as _ctx
+
+        _ctx.ctx.configure(json_mode=True, token=None, base_url=None, project="g/p", limit=20, page=1)
+        with patch.object(_ctx.ctx, "client", return_value=client):
+            from qodev_gitlab_cli.commands.search import search as search_command
+
+            search_command("proxy")
+
+        captured = capsys.readouterr()
+        assert json.loads(captured.out)["total"] == 1
+        assert "g/p was last synced 3 h ago; pass --sync" in captured.err
+        assert _ctx.ctx.cache_mode == "default"
@@ -0,0 +1,41 @@
+"""Startup-time regressions, measured with `python -X importtime`."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+
+def _imported_modules(code: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "imported package":
+                modules.add(name)
+    return modules
+
+
+class TestStartupImports:
+    def test_app_import_is_lazy(self) -> None:
+        modules = _imported_modules("import qodev_gitlab_cli.app")
+        assert "qodev_gitlab_cli.app" in modules
+        assert not {m for m in modules if m == "rich" or m.startswith("rich.")}
+        assert not {m for m in modules if m.startswith("qodev_gitlab_cli.commands.")}
+        assert not {m for m in modules if m.startswith("qodev_gitlab_api")}
+
+    def test_entry_point_import_is_minimal(self) -> None:
+        modules = _imported_modules("import qodev_gitlab_cli, qodev_gitlab_cli.daemon")
+        assert "cyclopts" not in modules
+        assert "rich" not in modules
+
+    def test_command_group_skips_rich_and_other_groups(self) -> None:
+        modules = _imported_modules("import qodev_gitlab_cli.commands.mrs")
+        assert "rich" not in modules
+        assert "qodev_gitlab_cli.commands.issues" not in modules
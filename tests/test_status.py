@@ -0,0 +1,117 @@
+"""Tests for the branch status report."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+import httpx
+
+from qodev_gitlab_cli.formatters.status import format_branch_status
+from qodev_gitlab_cli.status import branch_status
+
+LATENCY = 0.1
+MR = {"iid": 12, "title": "Feature", "state": "opened", "target_branch": "main", "author": {"username": "dev"}}
+
+
+def _client(routes: dict[str, object], requests: list[str]) -> MagicMock:
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.raw_path.decode().split("?")[0].removeprefix("/api/v4/projects/g%2Fp")
+        requests.append(path)
+        time.sleep(LATENCY)
+        if path not in routes:
+            return httpx.Response(404, json={"message": "404 Not Found"})
+        return httpx.Response(200, json=routes[path])
+
+    def approvals(project: str, iid: int) -> dict:
+        time.sleep(LATENCY)
+        return {"approved": False, "approvals_left": 1, "approved_by": [{"user": {"username": "rev"}}]}
+
+    client = MagicMock()
+    client.client = httpx.Client(base_url="https://gitlab.example.com/api/v4", transport=httpx.MockTransport(handler))
+    client.get_mr_approvals.side_effect = approvals
+    return client
+
+
+ROUTES: dict[str, object] = {
+    "/merge_requests": [{**MR, "state": "merged", "iid": 3}, MR],
+    "/pipelines": [{"id": 100, "status": "success", "ref": "feature"}],
+    "/pipelines/100/jobs": [{"id": 1, "status": "success"}],
+    "/merge_requests/12/pipelines": [{"id": 101, "status": "failed", "ref": "refs/merge-requests/12/head"}],
+    "/pipelines/101/jobs": [
+        {"id": 2, "name": "test", "stage": "test", "status": "failed"},
+        {"id": 3, "name": "lint", "stage": "test", "status": "success"},
+    ],
+    "/merge_requests/12/discussions": [
+        {
+            "id": "a",
+            "notes": [{"resolvable": True, "resolved": False, "body": "Fix this", "author": {"username": "r"}}],
+        },
+        {"id": "b", "notes": [{"resolvable": True, "resolved": True, "body": "ok"}]},
+        {"id": "c", "notes": [{"resolvable": False, "body": "note"}]},
+    ],
+}
+
+
+class TestBranchStatus:
+    def test_report(self) -> None:
+        requests: list[str] = []
+        report = branch_status(_client(ROUTES, requests), "g/p", "feature")
+
+        assert report["merge_request"]["iid"] == 12
+        assert report["merge_request"]["author"] == "dev"
+        # The MR pipeline is newer than the branch pipeline, so its jobs are reported.
+        assert report["pipeline"]["id"] == 101
+        assert report["jobs"]["by_status"] == {"failed": 1, "success": 1}
+        assert [j["name"] for j in report["jobs"]["failed"]] == ["test"]
+        assert "/pipelines/100/jobs" not in requests
+        assert report["approvals"] == {"approved": False, "approvals_left": 1, "approved_by": ["rev"]}
+        assert report["unresolved_discussions"]["count"] == 1
+        assert report["unresolved_discussions"]["items"][0]["body"] == "Fix this"
+        assert "errors" not in report
+
+    def test_sub_requests_run_concurrently(self) -> None:
+        routes = {**ROUTES, "/merge_requests/12/pipelines": []}
+        start = time.perf_counter()
+        branch_status(_client(routes, []), "g/p", "feature")
+        # MR lookup, approvals/discussions/MR pipelines in parallel, then jobs: three round trips, not six.
+        assert time.perf_counter() - start < LATENCY * 5
+
+    def test_no_merge_request(self) -> None:
+        requests: list[str] = []
+        report = branch_status(_client({**ROUTES, "/merge_requests": []}, requests), "g/p", "feature")
+
+        assert report["merge_request"] is None
+        assert report["approvals"] is None
+        assert report["pipeline"]["id"] == 100
+        assert report["jobs"]["total"] == 1
+        assert not any("/merge_requests/" in path for path in requests)
+
+    def test_failed_sub_request_is_reported(self) -> None:
+        routes = {key: value for key, value in ROUTES.items() if key != "/merge_requests/12/discussions"}
+        report = branch_status(_client(routes, []), "g/p", "feature")
+
+        assert report["unresolved_discussions"] is None
+        assert "Not found" in report["errors"]["discussions"]
+        assert report["approvals"] is not None
+
+    def test_failed_mr_lookup_is_reported(self) -> None:
+        routes = {key: value for key, value in ROUTES.items() if key not in ("/merge_requests", "/pipelines")}
+        report = branch_status(_client(routes, []), "g/p", "feature")
+
+        assert report["merge_request"] is None
+        assert "Not found" in report["errors"]["mr"]
+        assert "Not found" in report["errors"]["pipeline"]
+        # The jobs were never fetched, so the pipeline failure is not repeated for them.
+        assert "jobs" not in report["errors"]
+        assert report["jobs"] is None
+
+
+class TestFormat:
+    def test_markdown(self) -> None:
+        report = branch_status(_client(ROUTES, []), "g/p", "feature")
+        md = format_branch_status(report)
+        assert "!12 Feature" in md
+        assert "## Pipeline #101: failed" in md
+        assert "**test** failed in test" in md
+        assert "## Unresolved discussions: 1" in md
@@ -0,0 +1,102 @@
+"""Tests for job trace tail/follow."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import httpx
+
+from qodev_gitlab_cli import traces
+
+LOG = b"".join(f"line {i}\n".encode() for i in range(1, 101))
+
+
+def _range_server(log: bytes, *, honour_range: bool = True) -> MagicMock:
+    """Mock client answering Range requests against a (mutable) log."""
+    state = {"log": log}
+    client = MagicMock()
+
+    def fake_get(endpoint: str, headers: dict) -> httpx.Response:
+        data = state["log"]
+        if not honour_range:
+            return httpx.Response(200, content=data)
+        spec = headers["Range"].removeprefix("bytes=")
+        first, _, last = spec.partition("-")
+        start = max(0, len(data) - int(last)) if first == "" else int(first)
+        if start >= len(data):
+            return httpx.Response(416, headers={"Content-Range": f"bytes */{len(data)}"})
+        return httpx.Response(
+            206, content=data[start:], headers={"Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}"}
+        )
+
+    client.client.get.side_effect = fake_get
+    client.state = state
+    return client
+
+
+class TestLastLines:
+    def test_trailing_newline(self) -> None:
+        assert traces.last_lines(b"a\nb\nc\n", 2) == b"b\nc\n"
+
+    def test_fewer_lines_than_requested(self) -> None:
+        assert traces.last_lines(b"a\nb", 5) == b"a\nb"
+
+    def test_zero(self) -> None:
+        assert traces.last_lines(b"a\n", 0) == b""
+
+
+class TestTail:
+    def test_fetches_only_the_end(self) -> None:
+        client = _range_server(LOG)
+
+        data, end = traces.tail(client, "/trace", 3, chunk_size=32)
+
+        assert data == b"line 98\nline 99\nline 100\n"
+        assert end == len(LOG)
+        assert client.client.get.call_args_list[0].kwargs["headers"] == {"Range": "bytes=-32"}
+
+    def test_grows_range_until_enough_lines(self) -> None:
+        client = _range_server(LOG)
+
+        data, _ = traces.tail(client, "/trace", 20, chunk_size=16)
+
+        assert data.splitlines()[0] == b"line 81"
+        assert client.client.get.call_count > 1
+
+    def test_server_ignoring_range(self) -> None:
+        client = _range_server(LOG, honour_range=False)
+
+        data, end = traces.tail(client, "/trace", 1)
+
+        assert data == b"line 100\n"
+        assert end == len(LOG)
+
+
+class TestFollow:
+    def test_streams_new_bytes_until_finished(self) -> None:
+        client = _range_server(b"start\n")
+        written: list[bytes] = []
+        statuses = iter(["running", "running", "success"])
+
+        def sleep(_: float) -> None:
+            client.state["log"] += b"more\n"
+
+        offset = traces.follow(
+            client,
+            "/trace",
+            offset=0,
+            is_finished=lambda: next(statuses) in traces.TERMINAL_JOB_STATUSES,
+            write=written.append,
+            sleep=sleep,
+        )
+
+        assert written == [b"start\n", b"more\n", b"more\n"]
+        assert offset == len(client.state["log"])
+
+    def test_no_new_data(self) -> None:
+        client = _range_server(b"done\n")
+        written: list[bytes] = []
+
+        traces.follow(client, "/trace", offset=5, is_finished=lambda: True, write=written.append)
+
+        assert written == []
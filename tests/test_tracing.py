@@ -0,0 +1,121 @@
+"""Tests for `--trace` (spans, the tracing transport and the report)."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from qodev_gitlab_cli.context import Context, using
+from qodev_gitlab_cli.tracing import Tracer, path_template, report, span
+from qodev_gitlab_cli.transport import TracingTransport
+
+
+@pytest.fixture
+def traced() -> Context:
+    context = Context()
+    context.tracer = Tracer()
+    return context
+
+
+class TestPathTemplate:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("/api/v4/projects/g%2Fp/merge_requests/12", "/projects/:id/merge_requests/:id"),
+            ("/api/v4/projects/7/jobs/99/trace", "/projects/:id/jobs/:id/trace"),
+            ("/api/v4/projects/g%2Fp/releases/v1.0", "/projects/:id/releases/:id"),
+            ("/api/v4/user", "/user"),
+        ],
+    )
+    def test_templates(self, path: str, expected: str) -> None:
+        assert path_template(path) == expected
+
+
+class TestTracer:
+    def test_span_records_phase(self, traced: Context) -> None:
+        with using(traced), span("render.json") as args:
+            args["items"] = 3
+        with using(traced), span("render.json"):
+            pass
+
+        summary = traced.tracer.summary()
+        assert summary["phases"] == [{"phase": "render.json", "calls": 2, "ms": pytest.approx(0, abs=5)}]
+        trace = traced.tracer.chrome_trace()
+        assert [(e["name"], e["ph"], e["args"]) for e in trace["traceEvents"]] == [
+            ("render.json", "X", {"items": 3}),
+            ("render.json", "X", {}),
+        ]
+
+    def test_span_without_tracer(self) -> None:
+        with using(Context()), span("render.json") as args:
+            args["ignored"] = True
+
+
+class TestTracingTransport:
+    def test_request_span(self, traced: Context) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                content=b"[1, 2, 3]",
+                headers={"X-Runtime": "0.042"},
+                extensions={"qodev_cache": "revalidated", "qodev_retries": 1},
+            )
+
+        transport = TracingTransport(httpx.MockTransport(handler), traced)
+        with httpx.Client(base_url="https://gl.example.com/api/v4", transport=transport) as client:
+            assert client.get("/projects/g%2Fp/issues", params={"page": 2}).json() == [1, 2, 3]
+
+        (request,) = traced.tracer.summary()["requests"]
+        assert {k: v for k, v in request.items() if k != "ms"} == {
+            "method": "GET",
+            "path": "/projects/:id/issues",
+            "page": 2,
+            "status": 200,
+            "server_ms": 42.0,
+            "retries": 1,
+            "cache": "revalidated",
+            "bytes": 9,
+        }
+        assert traced.tracer.summary()["retries"] == 1
+
+    def test_transport_error(self, traced: Context) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        transport = TracingTransport(httpx.MockTransport(handler), traced)
+        client = httpx.Client(base_url="https://gl.example.com/api/v4", transport=transport)
+        with client, pytest.raises(httpx.ConnectError):
+            client.get("/user")
+
+        (request,) = traced.tracer.summary()["requests"]
+        assert (request["path"], request["error"]) == ("/user", "ConnectError")
+
+
+class TestReport:
+    def _tracer(self) -> Tracer:
+        tracer = Tracer()
+        tracer.add("client.init", "cli", tracer.started, 0.002, {})
+        tracer.add("http", "http", tracer.started, 0.01, {"method": "GET", "path": "/user", "status": 200})
+        return tracer
+
+    def test_table(self, capsys) -> None:
+        context = Context()
+        report(self._tracer(), ctx=context)
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "client.init" in captured.err
+        assert "/user" in captured.err
+
+    def test_json_and_file(self, tmp_path, capsys) -> None:
+        context = Context()
+        context.json_mode = True
+        path = tmp_path / "trace.json"
+        report(self._tracer(), ctx=context, trace_file=str(path))
+
+        summary = json.loads(capsys.readouterr().err)["trace"]
+        assert [phase["phase"] for phase in summary["phases"]] == ["client.init", "http"]
+        assert summary["requests"][0]["status"] == 200
+        assert len(json.loads(path.read_text())["traceEvents"]) == 2
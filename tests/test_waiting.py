@@ -0,0 +1,160 @@
+"""Tests for adaptive pipeline waiting."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+import httpx
+
+from qodev_gitlab_cli import waiting
+
+
+class FakePipelines:
+    """Mock GitLab whose pipelines advance one job state per poll."""
+
+    def __init__(self, timelines: dict[int, list[tuple[str, list[dict]]]]) -> None:
+        self.timelines = timelines
+        self.polls = dict.fromkeys(timelines, 0)
+        self.lock = threading.Lock()
+        self.headers: list[str | None] = []
+        self.job_lists = 0
+
+    def state(self, pid: int) -> tuple[str, list[dict]]:
+        timeline = self.timelines[pid]
+        return timeline[min(self.polls[pid], len(timeline) - 1)]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.raw_path.decode().split("?")[0].removeprefix("/api/v4/").split("/")
+        if parts[2] == "jobs" and parts[-1] == "trace":
+            return httpx.Response(206, content=b"boom\n", headers={"Content-Range": "bytes 0-4/5"})
+        if parts[2] == "jobs":
+            return httpx.Response(200, json=[{"name": "test", "duration": 30, "status": "success"}])
+        pid = int(parts[3])
+        self.headers.append(request.headers.get("cache-control"))
+        if parts[-1] == "jobs":
+            self.job_lists += 1
+            return httpx.Response(200, json=self.state(pid)[1])
+        with self.lock:
+            status, _ = self.state(pid)
+            self.polls[pid] += 1
+        return httpx.Response(200, json={"id": pid, "status": status, "web_url": f"https://gl/p/{pid}"})
+
+    def client(self) -> MagicMock:
+        client = MagicMock()
+        client.client = httpx.Client(base_url="https://gl/api/v4", transport=httpx.MockTransport(self.handler))
+        return client
+
+
+def _job(status: str, job_id: int = 1, **extra: object) -> dict:
+    return {"id": job_id, "name": "test", "status": status, **extra}
+
+
+class TestPollSchedule:
+    def test_backs_off_and_resets_on_change(self) -> None:
+        schedule = waiting.PollSchedule(min_interval=1, max_interval=10, factor=2)
+        delays = [schedule.next_delay(changed=False) for _ in range(6)]
+
+        assert all(1 <= d <= 10 for d in delays)
+        assert schedule.current == 10
+        schedule.next_delay(changed=True)
+        assert schedule.current == 1
+
+    def test_polls_when_job_should_finish(self) -> None:
+        schedule = waiting.PollSchedule(min_interval=1, max_interval=60)
+        schedule.current = 60
+
+        assert schedule.next_delay(changed=False, expected_remaining=3) == 3
+        assert schedule.next_delay(changed=False, expected_remaining=0.1) == 1
+
+    def test_expected_remaining_from_history(self) -> None:
+        jobs = [_job("running", duration=25), _job("pending", job_id=2)]
+
+        assert waiting._soonest_expected_finish(jobs, {"test": 30}) == 5
+        assert waiting._soonest_expected_finish([_job("running", duration=50)], {"test": 30}) is None
+
+
+class TestWaitForPipelines:
+    def test_multiple_pipelines(self) -> None:
+        fake = FakePipelines(
+            {
+                1: [("running", [_job("running")]), ("success", [_job("success")])],
+                2: [("running", [_job("running")]), ("running", [_job("running")]), ("failed", [_job("failed")])],
+            }
+        )
+
+        results = waiting.wait_for_pipelines(fake.client(), "g/p", [1, 2], interval=0)
+
+        assert [r["final_status"] for r in results] == ["success", "failed"]
+        assert results[1]["failed_jobs"][0]["last_log_lines"] == "boom"
+        assert results[0]["job_summary"] == {"total": 1, "success": 1, "failed": 0}
+        assert set(fake.headers) == {"no-cache"}
+
+    def test_fail_fast_stops_other_waits(self) -> None:
+        fake = FakePipelines(
+            {
+                1: [("running", [_job("running")])],
+                2: [("running", [_job("running")]), ("running", [_job("failed"), _job("running", job_id=2)])],
+            }
+        )
+        results = waiting.wait_for_pipelines(fake.client(), "g/p", [1, 2], interval=0.01, fail_fast=True)
+
+        assert results[1]["stopped"] == "fail_fast"
+        assert results[1]["failed_jobs"][0]["id"] == 1
+        assert results[0]["stopped"] == "fail_fast"
+        assert results[0]["final_status"] == "running"
+
+    def test_allowed_failures_do_not_trip_fail_fast(self) -> None:
+        fake = FakePipelines(
+            {1: [("running", [_job("failed", allow_failure=True)]), ("success", [_job("failed", allow_failure=True)])]}
+        )
+
+        [result] = waiting.wait_for_pipelines(fake.client(), "g/p", [1], interval=0, fail_fast=True)
+
+        assert result["final_status"] == "success"
+        assert "stopped" not in result
+
+    def test_jobs_fetched_once_finished(self) -> None:
+        fake = FakePipelines({1: [("running", []), ("running", []), ("success", [_job("success")])]})
+
+        [result] = waiting.wait_for_pipelines(fake.client(), "g/p", [1], interval=0)
+
+        assert (result["checks_performed"], fake.job_lists) == (3, 1)
+        assert result["job_summary"]["success"] == 1
+
+    def test_adaptive_polls_follow_jobs_without_fail_fast(self) -> None:
+        timeline = [("running", [_job("running", duration=27)])] * 8 + [("success", [_job("success")])]
+        fake = FakePipelines({1: timeline})
+        delays: list[float] = []
+
+        class RecordingStop(threading.Event):
+            def wait(self, timeout: float | None = None) -> bool:
+                delays.append(timeout or 0)
+                return False
+
+        result = waiting.wait_for_pipeline(
+            fake.client(), "g/p", 1, stop=RecordingStop(), history={"test": 30}, min_interval=1, max_interval=30
+        )
+
+        assert result["final_status"] == "success"
+        # The running job should finish within 3s, so backoff never goes past it.
+        assert len(delays) == 8
+        assert max(delays) <= 3
+        # Fetched on the first poll, every JOBS_REFRESH_POLLS polls after, and once finished.
+        assert fake.job_lists == 4
+
+    def test_allowed_failures_listed(self) -> None:
+        jobs = [_job("failed", allow_failure=True), _job("failed", job_id=2)]
+        fake = FakePipelines({1: [("failed", jobs)]})
+
+        [result] = waiting.wait_for_pipelines(fake.client(), "g/p", [1], interval=0)
+
+        assert [job["id"] for job in result["failed_jobs"]] == [1, 2]
+
+    def test_timeout(self) -> None:
+        fake = FakePipelines({1: [("running", [_job("running")])]})
+
+        [result] = waiting.wait_for_pipelines(fake.client(), "g/p", [1], interval=0.01, timeout=0.05)
+
+        assert result["final_status"] == "timeout"
+        assert "job_summary" not in result